@@ -0,0 +1,85 @@
+"""
+Compare decoding large /block responses with the standard library json
+module and with orjson, and building the models with and without validation.
+
+orjson only speeds up the raw decode. Building the models dominates, and
+end to end it isn't faster: on a 6.3 MB block (the defaults below), decode
++ model took 676 ms with orjson against 647 ms with the standard library,
+and decode + construct 317 ms against 289 ms. This is why the standard
+library stays the default codec and orjson is opt-in, see
+pyrosetta.utils.codec. Run it on your own payloads before switching.
+
+    $ python benchmarks/bench_codec.py --transactions 5000 --operations 4
+"""
+import argparse
+import json
+import timeit
+
+from pyrosetta.models import BlockResponse, construct_model
+from pyrosetta.utils.codec import OrjsonCodec, StdlibCodec, orjson
+
+def make_block_payload(transactions : int, operations : int) -> bytes:
+    """
+    Build the raw body of a /block response with the given number of
+    transactions, each with the given number of operations.
+    """
+    txs = []
+    for t in range(transactions):
+        ops = []
+        for o in range(operations):
+            ops.append({
+                'operation_identifier': {'index': o},
+                'type': 'TRANSFER',
+                'status': 'SUCCESS',
+                'account': {'address': '0x{:040x}'.format(t * operations + o)},
+                'amount': {'value': str(-1000 - o if o % 2 == 0 else 1000 + o), 'currency': {'symbol': 'ETH', 'decimals': 18}},
+                'metadata': {'gas_price': '0x3b9aca00', 'nonce': t}
+            })
+        txs.append({'transaction_identifier': {'hash': '0x{:064x}'.format(t)}, 'operations': ops})
+    body = {
+        'block': {
+            'block_identifier': {'index': 1000, 'hash': '0x{:064x}'.format(1000)},
+            'parent_block_identifier': {'index': 999, 'hash': '0x{:064x}'.format(999)},
+            'timestamp': 1600000000000,
+            'transactions': txs
+        }
+    }
+    return json.dumps(body).encode('utf-8')
+
+def requests_style_decode(content : bytes):
+    """
+    What `requests.Response.json()` does: decode the text, then parse it.
+    """
+    return json.loads(content.decode('utf-8'))
+
+def best_of(fn, repeat : int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=5000)
+    parser.add_argument('--operations', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_block_payload(args.transactions, args.operations)
+    print("Payload: {:.1f} MB, {} transactions x {} operations".format(len(content) / 1e6, args.transactions, args.operations))
+
+    decoders = [('resp.json()', requests_style_decode), ('json (bytes)', StdlibCodec().loads)]
+    if orjson is not None:
+        decoders.append(('orjson (bytes)', OrjsonCodec().loads))
+    else:
+        print("orjson is not installed, only the standard library is compared.")
+
+    baseline = None
+    print("{:<16}{:>12}{:>12}{:>22}{:>26}".format('decoder', 'decode ms', 'speedup', 'decode + model ms', 'decode + construct ms'))
+    for name, loads in decoders:
+        decode = best_of(lambda: loads(content), args.repeat)
+        full = best_of(lambda: BlockResponse(**loads(content)), args.repeat)
+        construct = best_of(lambda: construct_model(BlockResponse, loads(content)), args.repeat)
+        if baseline is None:
+            baseline = decode
+        print("{:<16}{:>12.1f}{:>11.1f}x{:>22.1f}{:>26.1f}".format(name, decode * 1e3, baseline / decode, full * 1e3, construct * 1e3))
+
+if __name__ == '__main__':
+    main()
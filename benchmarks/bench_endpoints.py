@@ -0,0 +1,280 @@
+"""
+Time the hot path of every endpoint the clients call, split into its steps:
+serializing the request, the HTTP round trip, decoding the json and building
+the response model, validated and with `construct_model`. The responses come
+from the stand-in node of pyrosetta.testing, over loopback, so the HTTP time
+is the client's overhead plus that of a node answering instantly.
+
+Results can be saved as json, and compared against saved ones: any step
+slower than the baseline by more than the threshold is a regression, and
+makes the run exit with status 1.
+
+    $ python benchmarks/bench_endpoints.py --transactions 2000 --json baseline.json
+    $ python benchmarks/bench_endpoints.py --transactions 2000 --compare baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import re
+import sys
+import timeit
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple, Type
+from urllib.parse import urljoin
+
+from pydantic import BaseModel
+
+from pyrosetta.models import (
+    AccountBalanceRequest,
+    AccountBalanceResponse,
+    AccountCoinsRequest,
+    AccountCoinsResponse,
+    AccountIdentifier,
+    BlockIdentifier,
+    BlockRequest,
+    BlockResponse,
+    BlockTransactionRequest,
+    BlockTransactionResponse,
+    ConstructionCombineRequest,
+    ConstructionCombineResponse,
+    ConstructionDeriveRequest,
+    ConstructionDeriveResponse,
+    ConstructionHashRequest,
+    ConstructionMetadataRequest,
+    ConstructionMetadataResponse,
+    ConstructionParseRequest,
+    ConstructionParseResponse,
+    ConstructionPayloadsRequest,
+    ConstructionPayloadsResponse,
+    ConstructionPreprocessRequest,
+    ConstructionPreprocessResponse,
+    ConstructionSubmitRequest,
+    EventsBlocksRequest,
+    EventsBlocksResponse,
+    MempoolResponse,
+    MempoolTransactionRequest,
+    MempoolTransactionResponse,
+    MetadataRequest,
+    NetworkIdentifier,
+    NetworkListResponse,
+    NetworkOptionsResponse,
+    NetworkRequest,
+    NetworkStatusResponse,
+    Operation,
+    PartialBlockIdentifier,
+    PublicKey,
+    SearchTransactionsRequest,
+    SearchTransactionsResponse,
+    Signature,
+    TransactionIdentifier,
+    TransactionIdentifierResponse,
+    construct_model
+)
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.codec import OrjsonCodec, StdlibCodec, encode_request, get_codec, orjson, set_codec
+from pyrosetta.utils.communication import make_session, post_request
+
+PHASES = ('serialize', 'http', 'decode', 'validate', 'construct')
+
+class Endpoint(NamedTuple):
+    name: str
+    path: str
+    request: BaseModel
+    response: Type[BaseModel]
+
+def make_endpoints(server : StandInServer, limit : int) -> List[Endpoint]:
+    """
+    One request per endpoint, of the sizes a client would make against the chain.
+    """
+    chain = server.chain
+    network_id = NetworkIdentifier(**chain.network_identifier)
+    block = chain.block(chain.height // 2)['block']
+    block_id = BlockIdentifier(**block['block_identifier'])
+    transaction = block['transactions'][0]
+    account_id = AccountIdentifier(address=chain.address(1))
+    mempool_hash = chain.mempool()['transaction_identifiers'][0]['hash']
+    operations = [Operation.parse_obj(operation) for operation in transaction['operations']]
+    public_key = PublicKey(hex_bytes='02' + 'ab' * 32, curve_type='secp256k1')
+
+    payloads = ConstructionPayloadsRequest(network_identifier=network_id, operations=operations, public_keys=[public_key])
+    _, body = server.handle('/construction/payloads', encode_request(payloads))
+    unsigned = ConstructionPayloadsResponse.parse_obj(get_codec().loads(body))
+    signatures = [Signature(signing_payload=payload, public_key=public_key, signature_type='ecdsa', hex_bytes='cd' * 64)
+                  for payload in unsigned.payloads]
+    combine = ConstructionCombineRequest(network_identifier=network_id, unsigned_transaction=unsigned.unsigned_transaction,
+                                         signatures=signatures)
+    _, body = server.handle('/construction/combine', encode_request(combine))
+    signed = get_codec().loads(body)['signed_transaction']
+
+    return [
+        Endpoint('network/list', 'network/list', MetadataRequest(), NetworkListResponse),
+        Endpoint('network/options', 'network/options', NetworkRequest(network_identifier=network_id), NetworkOptionsResponse),
+        Endpoint('network/status', 'network/status', NetworkRequest(network_identifier=network_id), NetworkStatusResponse),
+        Endpoint('account/balance', 'account/balance',
+                 AccountBalanceRequest(network_identifier=network_id, account_identifier=account_id), AccountBalanceResponse),
+        Endpoint('account/coins', 'account/coins',
+                 AccountCoinsRequest(network_identifier=network_id, account_identifier=account_id, include_mempool=False),
+                 AccountCoinsResponse),
+        Endpoint('block', 'block',
+                 BlockRequest(network_identifier=network_id, block_identifier=PartialBlockIdentifier(index=block_id.index)),
+                 BlockResponse),
+        Endpoint('block/transaction', 'block/transaction',
+                 BlockTransactionRequest(network_identifier=network_id, block_identifier=block_id,
+                                         transaction_identifier=TransactionIdentifier(**transaction['transaction_identifier'])),
+                 BlockTransactionResponse),
+        Endpoint('mempool', 'mempool', NetworkRequest(network_identifier=network_id), MempoolResponse),
+        Endpoint('mempool/transaction', 'mempool/transaction',
+                 MempoolTransactionRequest(network_identifier=network_id, transaction_identifier=TransactionIdentifier(hash=mempool_hash)),
+                 MempoolTransactionResponse),
+        Endpoint('events/blocks', 'events/blocks',
+                 EventsBlocksRequest(network_identifier=network_id, offset=0, limit=limit), EventsBlocksResponse),
+        Endpoint('search/transactions', 'search/transactions',
+                 SearchTransactionsRequest(network_identifier=network_id, limit=limit), SearchTransactionsResponse),
+        Endpoint('construction/preprocess', 'construction/preprocess',
+                 ConstructionPreprocessRequest(network_identifier=network_id, operations=operations), ConstructionPreprocessResponse),
+        Endpoint('construction/metadata', 'construction/metadata',
+                 ConstructionMetadataRequest(network_identifier=network_id, options={'operations': len(operations)}),
+                 ConstructionMetadataResponse),
+        Endpoint('construction/payloads', 'construction/payloads', payloads, ConstructionPayloadsResponse),
+        Endpoint('construction/combine', 'construction/combine', combine, ConstructionCombineResponse),
+        Endpoint('construction/parse', 'construction/parse',
+                 ConstructionParseRequest(network_identifier=network_id, signed=True, transaction=signed), ConstructionParseResponse),
+        Endpoint('construction/derive', 'construction/derive',
+                 ConstructionDeriveRequest(network_identifier=network_id, public_key=public_key), ConstructionDeriveResponse),
+        Endpoint('construction/hash', 'construction/hash',
+                 ConstructionHashRequest(network_identifier=network_id, signed_transaction=signed), TransactionIdentifierResponse),
+        Endpoint('construction/submit', 'construction/submit',
+                 ConstructionSubmitRequest(network_identifier=network_id, signed_transaction=signed), TransactionIdentifierResponse)
+    ]
+
+def best_of(fn : Callable[[], Any], repeat : int, min_time : float) -> float:
+    """
+    The best time of one call out of `repeat` samples, each calling
+    `fn` enough times to run for at least `min_time` seconds.
+    """
+    timer = timeit.Timer(fn)
+    number = max(1, int(min_time / max(timer.timeit(1), 1e-7)))
+    return min(timer.repeat(repeat, number)) / number
+
+def measure(endpoint : Endpoint, api_url : str, session, repeat : int, min_time : float) -> Dict[str, float]:
+    codec = get_codec()
+    url = urljoin(api_url, endpoint.path)
+    body = encode_request(endpoint.request)
+    resp = post_request(url, body, session)
+    if resp.status_code != 200:
+        raise RuntimeError("{} answered {}: {}".format(endpoint.name, resp.status_code, resp.text))
+    content = resp.content
+    data = codec.loads(content)
+    return {
+        'bytes': len(content),
+        'serialize': best_of(lambda: encode_request(endpoint.request), repeat, min_time),
+        'http': best_of(lambda: post_request(url, body, session).content, repeat, min_time),
+        'decode': best_of(lambda: codec.loads(content), repeat, min_time),
+        'validate': best_of(lambda: endpoint.response.parse_obj(data), repeat, min_time),
+        'construct': best_of(lambda: construct_model(endpoint.response, data), repeat, min_time)
+    }
+
+def compare(results : Dict[str, Any], baseline : Dict[str, Any], thresholds : Dict[str, float],
+            min_delta : float) -> List[Tuple[str, str, float, float]]:
+    """
+    The (endpoint, step, baseline time, time) of the steps slower than in the baseline
+    by more than their threshold, as a fraction of the baseline time, and by more
+    than `min_delta` seconds.
+    """
+    regressions = []
+    for name, timings in results['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        for phase in PHASES:
+            old, new = before.get(phase), timings[phase]
+            if old is not None and new - old > min_delta and new > old * (1 + thresholds[phase]):
+                regressions.append((name, phase, old, new))
+    return regressions
+
+def print_row(name : str, timings : Dict[str, float]) -> None:
+    print("{:<26}{:>10.1f}{:>14.1f}{:>12.1f}{:>12.1f}{:>14.1f}{:>14.1f}".format(
+        name, timings['bytes'] / 1e3, *(timings[phase] * 1e6 for phase in PHASES)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--height', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=1000, help="per block")
+    parser.add_argument('--operations', type=int, default=4, help="per transaction")
+    parser.add_argument('--padding', type=int, default=0, help="bytes of metadata per transaction")
+    parser.add_argument('--limit', type=int, default=100, help="of the /events/blocks and /search/transactions pages")
+    parser.add_argument('--codec', choices=['default', 'stdlib', 'orjson'], default='default')
+    parser.add_argument('--only', default=None, help="a regex the endpoints to run must match")
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--min-time', type=float, default=0.05, help="seconds per sample")
+    parser.add_argument('--json', default=None, help="save the results to that file")
+    parser.add_argument('--compare', default=None, help="a file of saved results to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2, help="the slowdown that counts as a regression")
+    parser.add_argument('--http-threshold', type=float, default=0.5,
+                        help="the same for the HTTP round trips, which vary much more from run to run")
+    parser.add_argument('--min-delta', type=float, default=5e-6, help="seconds below which slowdowns are ignored")
+    parser.add_argument('--confirm', type=int, default=2,
+                        help="how many times the endpoints with regressions are measured again, keeping the best times")
+    args = parser.parse_args()
+
+    if args.codec == 'stdlib':
+        set_codec(StdlibCodec())
+    elif args.codec == 'orjson':
+        if orjson is None:
+            parser.error("orjson is not installed")
+        set_codec(OrjsonCodec())
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    thresholds = {phase: args.threshold for phase in PHASES}
+    thresholds['http'] = args.http_threshold
+
+    parameters = {'height': args.height, 'transactions': args.transactions, 'operations': args.operations,
+                  'padding': args.padding, 'limit': args.limit}
+    chain = SyntheticChain(height=args.height, transactions=args.transactions, operations=args.operations, padding=args.padding)
+    results = {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                 'codec': type(get_codec()).__name__, 'parameters': parameters},
+        'results': {}
+    }
+    print("{:<26}{:>10}{:>14}{:>12}{:>12}{:>14}{:>14}".format('endpoint', 'KB', 'serialize us', 'http us', 'decode us', 'validate us', 'construct us'))
+    with StandInServer(chain) as server:
+        session = make_session(pool_connections=1, pool_maxsize=1)
+        endpoints = {endpoint.name: endpoint for endpoint in make_endpoints(server, args.limit)
+                     if args.only is None or re.search(args.only, endpoint.name)}
+        for name, endpoint in endpoints.items():
+            results['results'][name] = measure(endpoint, server.url, session, args.repeat, args.min_time)
+            print_row(name, results['results'][name])
+
+        regressions = []
+        if baseline is not None:
+            regressions = compare(results, baseline, thresholds, args.min_delta)
+            # A slow sample is more often a busy machine than a slow client:
+            # only report the steps that stay slow when measured again.
+            for _ in range(args.confirm):
+                if not regressions:
+                    break
+                for name in sorted({name for name, _, _, _ in regressions}):
+                    again = measure(endpoints[name], server.url, session, args.repeat, args.min_time)
+                    timings = results['results'][name]
+                    for phase in PHASES:
+                        timings[phase] = min(timings[phase], again[phase])
+                regressions = compare(results, baseline, thresholds, args.min_delta)
+
+    if args.json is not None:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if baseline is not None:
+        if baseline['meta']['parameters'] != parameters:
+            print("Warning: the baseline was run with {}".format(baseline['meta']['parameters']))
+        if regressions:
+            print("Regressions:")
+            for name, phase, old, new in regressions:
+                print("  {} {}: {:.1f} us -> {:.1f} us (+{:.0%})".format(name, phase, old * 1e6, new * 1e6, new / old - 1))
+            sys.exit(1)
+        print("No regressions over {:.0%}, {:.0%} for HTTP.".format(args.threshold, args.http_threshold))
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,6 @@
-from .api import RosettaAPI
+from .api import RosettaAPI, RosettaAPIExt
+from .async_api import AsyncRosettaAPI, AsyncRosettaAPIExt
+from .multinode import MultiNodeRosettaAPI, AsyncMultiNodeRosettaAPI
+from .exceptions import DeadlineExceeded, RosettaError
+from .utils.retry import RetryPolicy
+from .utils.deadline import deadline
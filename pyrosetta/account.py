@@ -1,8 +1,8 @@
 """
 State of accounts.
 """
-
-from typing import List, Optional
+import json
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 import requests
 
@@ -12,6 +12,7 @@ from .models import (
     AccountCoinsRequest,
     AccountCoinsResponse,
     AccountIdentifier,
+    Coin,
     Currency,
     NetworkIdentifier,
     PartialBlockIdentifier
@@ -21,6 +22,112 @@ from .endpoints.data import (
     get_account_balance,
     get_account_unspent_coins
 )
+from .network import status as network_status
+from .utils.concurrency import ordered_map
+
+CurrencyKey = Tuple[str, int, Optional[str]]
+
+def currency_key(currency : Currency) -> CurrencyKey:
+    """
+    The key of a currency in `AccountBalance.balances`: its symbol, its decimals
+    and its metadata in a canonical json form, None if it has none, so tokens
+    told apart only by their metadata, ex: a contract address, get their own keys.
+
+    Parameters
+    ----------
+    currency: Currency
+
+    Returns
+    -------
+    tuple[str, int, str | None]
+        Ex: ('ETH', 18, None) or ('USDC', 6, '{"contract":"0xa0b8"}').
+    """
+    metadata = json.dumps(currency.metadata, sort_keys=True, separators=(',', ':'), default=str) if currency.metadata else None
+    return (currency.symbol, currency.decimals, metadata)
+
+class AccountBalance(NamedTuple):
+    """
+    The balance of an account at a block, in a compact form for
+    bulk lookups, see `balances`.
+
+    Attributes
+    ----------
+    account: AccountIdentifier
+    block_index: int
+        The index of the block the balance was computed at.
+    block_hash: str
+        The hash of the block the balance was computed at.
+    balances: dict[tuple[str, int, str | None], int]
+        The value of every currency of the account in atomic units, keyed
+        by the `currency_key` of the currency, ex: ('ETH', 18, None).
+    metadata: dict[str, Any], optional
+        The metadata of the response, ex: a sequence number.
+    """
+    account : AccountIdentifier
+    block_index : int
+    block_hash : str
+    balances : Dict[CurrencyKey, int]
+    metadata : Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_response(cls, account_id : AccountIdentifier, resp : AccountBalanceResponse) -> 'AccountBalance':
+        balances = {currency_key(amount.currency): int(amount.value) for amount in resp.balances}
+        return cls(account_id, resp.block_identifier.index, resp.block_identifier.hash_, balances, resp.metadata)
+
+class CoinSet(NamedTuple):
+    """
+    The unspent coins of many accounts merged into a single set,
+    deduplicated by coin identifier, see `unspent_coins_of_accounts`.
+
+    Attributes
+    ----------
+    coins: dict[str, Coin]
+        The coins keyed by the `identifier` of their CoinIdentifier,
+        ex: 'transaction_hash:index' on Bitcoin.
+    owners: dict[str, AccountIdentifier]
+        The account each coin was returned for, keyed the same way.
+    block_index: int, optional
+        The lowest block index the responses were computed at, every coin
+        spent or created up to it is accounted for. None if there were no accounts.
+    """
+    coins : Dict[str, Coin]
+    owners : Dict[str, AccountIdentifier]
+    block_index : Optional[int]
+
+    @classmethod
+    def from_responses(cls, responses : Iterable[Tuple[AccountIdentifier, AccountCoinsResponse]]) -> 'CoinSet':
+        coins = {}
+        owners = {}
+        block_index = None
+        for account_id, resp in responses:
+            for coin in resp.coins:
+                key = coin.coin_identifier.identifier
+                if key not in coins:
+                    coins[key] = coin
+                    owners[key] = account_id
+            if block_index is None or resp.block_identifier.index < block_index:
+                block_index = resp.block_identifier.index
+        return cls(coins, owners, block_index)
+
+def pinned_tip(api_url : str, network_id : NetworkIdentifier, session : Optional[requests.Session] = None) -> PartialBlockIdentifier:
+    """
+    The current tip of the network as a PartialBlockIdentifier with both
+    its index and hash, so that every request pinned to it is answered at
+    the very same block, even if the tip moves or is reorganized meanwhile.
+
+    Parameters
+    ----------
+    api_url : str
+        The url to the node's api.
+    network_id : NetworkIdentifier
+    session : requests.Session, optional
+
+    Returns
+    -------
+    PartialBlockIdentifier
+    """
+    tip = network_status(api_url, network_id, session).current_block_identifier
+    return PartialBlockIdentifier(index=tip.index, hash=tip.hash_)
 
 def balance(api_url : str, network_id: NetworkIdentifier, account_id : AccountIdentifier, block_id : Optional[PartialBlockIdentifier] = None, currencies : Optional[List[Currency]] = None, session : Optional[requests.Session] = None) -> AccountBalanceResponse:
     """
@@ -39,8 +146,8 @@ def balance(api_url : str, network_id: NetworkIdentifier, account_id : AccountId
         available currencies will be returned. 
     session : requests.Session, optional
         The persistent requests session to use. If none is
-        provided, a new session will be created for the single
-        request.
+        provided, a pooled session shared by the whole process
+        is used.
 
 
     Returns
@@ -67,8 +174,8 @@ def unspent_coins(api_url : str, network_id : NetworkIdentifier, account_id : Ac
         available currencies will be returned.
     session : requests.Session, optional
         The persistent requests session to use. If none is
-        provided, a new session will be created for the single
-        request.
+        provided, a pooled session shared by the whole process
+        is used.
 
     Returns 
     --------
@@ -76,3 +183,81 @@ def unspent_coins(api_url : str, network_id : NetworkIdentifier, account_id : Ac
     """
     req = AccountCoinsRequest(network_identifier=network_id, account_identifier=account_id, include_mempool=include_mempool, currencies=currencies)
     return get_account_unspent_coins(api_url, req, session)
+
+def balances(api_url : str, network_id : NetworkIdentifier, account_ids : Iterable[AccountIdentifier], block_id : Optional[PartialBlockIdentifier] = None,
+             currencies : Optional[List[Currency]] = None, session : Optional[requests.Session] = None, concurrency : int = 8) -> Iterator[AccountBalance]:
+    """
+    Stream the balances of many accounts at the same block, keeping up to
+    `concurrency` requests in flight at once. The balances are yielded in
+    the order of the accounts, which are only pulled as room frees up, so
+    this is safe to use with very long iterables.
+
+    Parameters
+    ----------
+    api_url : str
+        The url to the node's api.
+    network_id : NetworkIdentifier
+    account_ids : Iterable[AccountIdentifier]
+    block_id : PartialBlockIdentifier, optional
+        The block to get every balance at. If None is specified, the current
+        tip is resolved once, see `pinned_tip`, and used for every account.
+    currencies: list[Currency], optional
+        Only balance of type Currency is returned. If none are specified, all 
+        available currencies will be returned.
+    session : requests.Session, optional
+        The persistent requests session to use. If none is
+        provided, a pooled session shared by the whole process
+        is used. Its connection pool should fit `concurrency`.
+    concurrency: int
+        The maximum number of requests in flight. Defaults to 8.
+
+    Yields
+    ------
+    AccountBalance
+        With the balances keyed by the `currency_key` of the currency.
+    """
+    if block_id is None:
+        block_id = pinned_tip(api_url, network_id, session)
+
+    def _balance(account_id):
+        return AccountBalance.from_response(account_id, balance(api_url, network_id, account_id, block_id, currencies, session))
+
+    return ordered_map(_balance, account_ids, concurrency)
+
+def unspent_coins_of_accounts(api_url : str, network_id : NetworkIdentifier, account_ids : Iterable[AccountIdentifier], include_mempool : bool = False,
+                              currencies : Optional[List[Currency]] = None, session : Optional[requests.Session] = None, concurrency : int = 8) -> CoinSet:
+    """
+    Get the unspent coins of many accounts, keeping up to `concurrency`
+    /account/coins requests in flight at once, merged into a single set
+    deduplicated by coin identifier.
+
+    Parameters
+    ----------
+    api_url : str
+        The url to the node's api.
+    network_id : NetworkIdentifier
+    account_ids : Iterable[AccountIdentifier]
+    include_mempool: bool
+        Include the state from the mempool when looking up the unspent coins. Note,
+        using this functionality breaks any guarantee of idempotency.
+    currencies: list[Currency], optional
+        Only coins of type Currency are returned. If none are specified, all 
+        available currencies will be returned.
+    session : requests.Session, optional
+        The persistent requests session to use. If none is
+        provided, a pooled session shared by the whole process
+        is used. Its connection pool should fit `concurrency`.
+    concurrency: int
+        The maximum number of requests in flight. Defaults to 8.
+
+    Returns
+    -------
+    CoinSet
+        coins: dict[str, Coin]
+        owners: dict[str, AccountIdentifier]
+        block_index: int, optional
+    """
+    def _coins(account_id):
+        return account_id, unspent_coins(api_url, network_id, account_id, include_mempool, currencies, session)
+
+    return CoinSet.from_responses(ordered_map(_coins, account_ids, concurrency))
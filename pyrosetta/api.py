@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Iterable, Optional, Union
+import time
+from typing import Any, Callable, Dict, List, Iterable, Iterator, Optional, Union
 
 import requests
 
@@ -6,25 +7,40 @@ from .models import (
     AccountBalanceResponse,
     AccountCoinsResponse,
     AccountIdentifier,
+    Block,
+    BlockEvent,
+    BlockEventType,
     BlockIdentifier,
     BlockResponse,
+    BlockTransaction,
     BlockTransactionResponse,
+    CoinIdentifier,
     Currency,
     NetworkIdentifier,
     NetworkOptionsResponse,
     NetworkStatusResponse,
     MempoolTransactionResponse,
+    Operator,
     PartialBlockIdentifier,
     Transaction,
     TransactionIdentifier
 )
 
+from .chain import Chain, ChainEvent, PollInterval
 from .utils import (
     make_AccountIdentifier,
     make_Currencies,
     make_NetworkIdentifier,
     make_PartialBlockIdentifier
 )
+from .utils.cache import BlockCache, TransactionIndex, index_transactions
+from .utils.concurrency import ordered_map
+from .utils.deadline import DEFAULT_TIMEOUT, Timeout
+from .utils.hedging import HedgePolicy
+from .utils.retry import DEFAULT_RETRY, RetryPolicy
+from .utils.store import BlockStore
+from .utils.throttle import Throttle
+from .utils import communication as comm
 
 from . import network as net
 from . import account as acnt
@@ -36,7 +52,13 @@ from . import search as srch
 
 class RosettaAPI(object):
 
-    def __init__(self, api_url: str, session : Optional[requests.Session] = None) -> None:
+    def __init__(self, api_url: str, session : Optional[requests.Session] = None,
+                 pool_connections : int = 10, pool_maxsize : int = 10, keep_alive : bool = True,
+                 prewarm : int = 0, validate : bool = True, lazy_blocks : bool = False,
+                 retry : Optional[RetryPolicy] = DEFAULT_RETRY, hedge : Optional[HedgePolicy] = None,
+                 coalesce : bool = False, throttle : Optional[Throttle] = None,
+                 timeout : Optional[Timeout] = DEFAULT_TIMEOUT, block_cache : Optional[BlockCache] = None,
+                 block_store : Optional[BlockStore] = None, indexed_blocks : int = 16) -> None:
         """
         Parameters
         ----------
@@ -45,12 +67,79 @@ class RosettaAPI(object):
         session: requests.Session, optional
             An already existing requests sesion. If none is passed
             a session will be created for this object.
+        pool_connections: int
+            The number of hosts the created session keeps a connection pool for.
+            Defaults to 10. Ignored when a session is passed.
+        pool_maxsize: int
+            The maximum number of connections the created session keeps open
+            to a single host. Raise this to at least the number of requests
+            kept in flight, ex: the `concurrency` of `fetch_blocks`. Defaults
+            to 10. Ignored when a session is passed.
+        keep_alive: bool
+            Whether the created session reuses its connections across requests.
+            Defaults to True. Ignored when a session is passed.
+        prewarm: int
+            The number of connections to open to the node up front.
+            Defaults to 0. See `prewarm`.
+        validate: bool
+            Whether responses are validated into their models. Setting this to
+            False builds the models without any validation, which is much faster
+            for large blocks but should only be used against a trusted node.
+            Defaults to True. Ignored when a session is passed, see
+            `utils.communication.make_session` for making one with this option.
+        lazy_blocks: bool
+            Whether the blocks returned are LazyBlocks, whose transactions are only
+            built when they are accessed. Useful when mostly the block headers are
+            needed. Defaults to False. Ignored when a session is passed.
+        retry: RetryPolicy, optional
+            When and how failed requests are retried, by default retriable node
+            errors and overloaded node statuses are retried up to 3 times with
+            jittered exponential backoff. None disables retries. Ignored when a
+            session is passed.
+        hedge: HedgePolicy, optional
+            Opt-in hedging of read-only requests (/block, /block/transaction,
+            /account/balance and /network/status): when one of them is slower than
+            a percentile of its recent latencies, it is sent again on another
+            connection and the first answer wins. Defaults to None, no hedging.
+            Ignored when a session is passed.
+        coalesce: bool
+            Whether identical read requests made concurrently, ex: from many threads
+            asking for the same /network/status, share one call and one parsed
+            result. The shared result is the same object for every caller and
+            should be treated as read-only. Defaults to False. Ignored when a
+            session is passed.
+        throttle: Throttle, optional
+            Limits the rate of the requests with a token bucket, and the number in
+            flight with an AIMD limit that settles near what the node can handle,
+            see `utils.throttle`. Defaults to None, no limits. Ignored when a
+            session is passed.
+        timeout: float | tuple[float, float], optional
+            The (connect, read) timeout of every request, in seconds. None waits
+            forever. Defaults to (10, 60). Ignored when a session is passed. To
+            bound a whole series of calls, including their retries, wrap them in
+            `pyrosetta.deadline`.
+        block_cache: BlockCache, optional
+            Keeps recent /block responses in process, so repeated reads of the same
+            block make no request, see `utils.cache`. Cached responses are shared
+            and should be treated as read-only. Defaults to None, no caching.
+        block_store: BlockStore, optional
+            Persists final blocks on disk, so later runs over the same range read them
+            back rather than requesting them again, see `utils.store`. Defaults to None.
+            Ignored when a session is passed, see `utils.communication.make_session`.
+        indexed_blocks: int
+            How many of the blocks fetched last have their transactions indexed, so
+            looking one of them up with `block_transaction_on_current_network` and
+            friends makes no request. 0 disables the index. Defaults to 16.
         """
         self._api_url = api_url
         if session is None:
-            session = requests.Session()
+            session = comm.make_session(pool_connections, pool_maxsize, keep_alive, validate, lazy_blocks, retry, hedge, coalesce, throttle, timeout, block_store)
         self._session = session
+        self._block_cache = block_cache
+        self._transactions = TransactionIndex(indexed_blocks)
         self._network_identifier = None
+        if prewarm > 0:
+            self.prewarm(prewarm)
 
     @property
     def session(self) -> requests.Session:
@@ -60,6 +149,21 @@ class RosettaAPI(object):
     def url(self) -> str:
         return self._api_url
 
+    def prewarm(self, connections : int) -> None:
+        """
+        Open connections to the node ahead of time, so the first requests
+        made concurrently don't each pay for a TCP/TLS handshake.
+        This is best effort, failures are left to surface on the first
+        real request.
+
+        Parameters
+        ----------
+        connections: int
+            The number of connections to open. Anything above the
+            `pool_maxsize` of the session won't be kept.
+        """
+        comm.prewarm(self.url, connections, self.session)
+
     
     def list_supported_networks(self, **kwargs) -> List[NetworkIdentifier]:
         """
@@ -116,8 +220,10 @@ class RosettaAPI(object):
         Private method for `network_status` to proivde an interface that
         supports calls with existing objects.
         """
-        
-        return net.status(self.url, network_id, self.session, **kwargs)
+        status = net.status(self.url, network_id, self.session, **kwargs)
+        if self._block_cache is not None:
+            self._block_cache.observe_tip(network_id, status.current_block_identifier.index)
+        return status
     
     def current_network_status(self, **kwargs) -> NetworkStatusResponse:
         """
@@ -257,7 +363,7 @@ class RosettaAPI(object):
         Private method for the account balance method to proivde an interface that
         supports calls with existing objects.
         """
-        return acnt.balance(self.url, self.current_network, account_id, block_id, currencies, self.session)
+        return acnt.balance(self.url, network_id, account_id, block_id, currencies, self.session)
     
     def current_network_balance_of_account(self, account_address : str, account_metadata : Optional[Dict[str, Any]] = None, 
                                            subaccount_address : Optional[str] = None, subaccount_metadata : Optional[Dict[str, Any]] = None, 
@@ -425,6 +531,55 @@ class RosettaAPI(object):
 
         return self._balance(network_id, account_id, block_id, currencies)
 
+    def balances_of_accounts(self, accounts : Iterable[Union[str, AccountIdentifier]], block_identifier : Optional[PartialBlockIdentifier] = None,
+                             currencies : Optional[List[Currency]] = None, concurrency : int = 8) -> Iterator[acnt.AccountBalance]:
+        """
+        Stream the balances of many accounts on the current network, all at
+        the same block, keeping up to `concurrency` requests in flight at once.
+        The balances are yielded in the order of the accounts, which are only
+        pulled as room frees up, so this is safe to use with very long iterables.
+
+        Parameters
+        ----------
+        accounts: Iterable[str | AccountIdentifier]
+            The addresses, or the full identifiers, of the accounts.
+        block_identifier: PartialBlockIdentifier, optional
+            The block to get every balance at. If None is specified, the current
+            tip is resolved once, and every request is pinned to its index and hash.
+        currencies: list[Currency], optional
+            Only balance of type Currency is returned. If none are specified, all
+            available currencies will be returned.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Returns
+        -------
+        Iterator[AccountBalance]
+            account: AccountIdentifier
+            block_index: int
+            block_hash: str
+            balances: dict[tuple[str, int, str | None], int]
+                Keyed by the symbol, decimals and canonical metadata
+                of the currency, see `account.currency_key`.
+            metadata: dict[str, Any], optional
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        if block_identifier is None:
+            tip = self._network_status(network_id).current_block_identifier
+            block_identifier = PartialBlockIdentifier(index=tip.index, hash=tip.hash_)
+        account_ids = (make_AccountIdentifier(account) if isinstance(account, str) else account for account in accounts)
+
+        def _balance(account_id):
+            return acnt.AccountBalance.from_response(account_id, self._balance(network_id, account_id, block_identifier, currencies))
+
+        return ordered_map(_balance, account_ids, concurrency)
+
     def _unspent_coins(self, network_id : NetworkIdentifier, account_id : AccountIdentifier, include_mempool : Optional[bool] = False, currencies : Optional[List[Currency]] = None) -> AccountCoinsResponse:
         """
         Private method for the account uspent coins method to proivde an interface that
@@ -485,11 +640,6 @@ class RosettaAPI(object):
             account_metadata = {}
         
         account_id = make_AccountIdentifier(account_address, subaccount_address, subaccount_metadata, **account_metadata)
-        try:
-            block_id = make_PartialBlockIdentifier(block_height, block_hash)
-        except ValueError:
-            block_id = None
-        
         if selected_currency_symbols is None:
             if not selected_currency_decimals is None:
                 raise ValueError("Both `selected_curerency_symbols` and `selected_currency_decimals` must be provided if either is.")
@@ -590,12 +740,68 @@ class RosettaAPI(object):
 
         return self._unspent_coins(network_id, account_id, include_mempool, currencies)
 
+    def unspent_coins_of_accounts(self, accounts : Iterable[Union[str, AccountIdentifier]], include_mempool : bool = False,
+                                  currencies : Optional[List[Currency]] = None, concurrency : int = 8) -> acnt.CoinSet:
+        """
+        Get the unspent coins of many accounts on the current network, keeping up to
+        `concurrency` requests in flight at once, merged into a single set
+        deduplicated by coin identifier.
+
+        Parameters
+        ----------
+        accounts: Iterable[str | AccountIdentifier]
+            The addresses, or the full identifiers, of the accounts.
+        include_mempool: bool
+            Include the state from the mempool when looking up the unspent coins. NOTE:
+            using this functionality breaks any guarantee of idempotency.
+        currencies: list[Currency], optional
+            Only coins of type Currency are returned. If none are specified, all
+            available currencies will be returned.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Returns
+        -------
+        CoinSet
+            coins: dict[str, Coin]
+                Keyed by the `identifier` of their CoinIdentifier.
+            owners: dict[str, AccountIdentifier]
+            block_index: int, optional
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        account_ids = (make_AccountIdentifier(account) if isinstance(account, str) else account for account in accounts)
+
+        def _coins(account_id):
+            return account_id, self._unspent_coins(network_id, account_id, include_mempool, currencies)
+
+        return acnt.CoinSet.from_responses(ordered_map(_coins, account_ids, concurrency))
+
     def _block(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> BlockResponse:
         """
         Private method for the get block method to proivde an interface that
         supports calls with existing objects.
         """
-        return blk.block(self.url, network_id, block_id, self.session)
+        return self._cached_block(network_id, block_id, lambda: blk.block(self.url, network_id, block_id, self.session))
+
+    def _cached_block(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier, fetch : Callable[[], BlockResponse]) -> BlockResponse:
+        """
+        Get the block from the block cache, if any, or fetch and cache it,
+        indexing its transactions.
+        """
+        cache = self._block_cache
+        resp = None if cache is None else cache.get(network_id, block_id)
+        if resp is None:
+            resp = fetch()
+            if cache is not None:
+                cache.put(network_id, resp)
+        self._transactions.add(network_id, resp)
+        return resp
 
     def block_on_current_network(self, block_height : Optional[int] = None, block_hash : Optional[str] = None) -> BlockResponse:
         """
@@ -664,12 +870,129 @@ class RosettaAPI(object):
             raise ValueError("Either the `block_height` or the `block_hash` must be specified.")
         return self._block(network_id, block_id)
 
-    def _block_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier) -> BlockTransactionResponse:
+    def _iter_block_transactions(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> Iterator[Transaction]:
+        """
+        Private method for the iter block transactions method to proivde an interface
+        that supports calls with existing objects.
+        """
+        return blk.iter_transactions(self.url, network_id, block_id, self.session)
+
+    def iter_block_transactions(self, block_height : Optional[int] = None, block_hash : Optional[str] = None) -> Iterator[Transaction]:
+        """
+        Stream the transactions of a block on the current network, by either block
+        height or its hash. The response is parsed as it downloads and only one
+        transaction is held in memory at a time, which keeps the memory use of very
+        large blocks bounded.
+
+        NOTE: At least the `block_height` or `block_hash` needs to be specified.
+        NOTE: Only the `transactions` of the block are yielded, its header and
+        `other_transactions` are skipped. See `block_on_current_network` for those.
+
+        Parameters
+        ----------
+        block_height: int, optional
+            The index of the block
+        block_hash: str, optional
+            The hash of the block.
+
+        Yields
+        ------
+        Transaction
+
+        Raises
+        ------
+        ValueError: if neither `block_height` or `block_hash` are specified.
+        """
+        try:
+            block_id = make_PartialBlockIdentifier(block_height, block_hash)
+        except ValueError:
+            raise ValueError("Either the `block_height` or the `block_hash` must be specified.")
+        return self._iter_block_transactions(self.current_network, block_id)
+
+    def iter_blocks(self, start_height : int, end_height : int, concurrency : int = 8) -> Iterator[BlockResponse]:
+        """
+        Stream the blocks of a height range on the current network, keeping up to
+        `concurrency` /block requests in flight at once. The blocks are still
+        yielded in height order.
+
+        Parameters
+        ----------
+        start_height: int
+            The index of the first block.
+        end_height: int
+            The index of the last block, inclusive.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Yields
+        ------
+        BlockResponse
+            block: Block
+            other_transactions: list[TransactionIdentifier], optional
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        ValueError: If `end_height` is lower than `start_height`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        if end_height < start_height:
+            raise ValueError("`end_height` can't be lower than `start_height`.")
+        network_id = self.current_network
+        block_ids = (PartialBlockIdentifier(index=height) for height in range(start_height, end_height + 1))
+        return ordered_map(lambda block_id: self._block(network_id, block_id), block_ids, concurrency)
+
+    def fetch_blocks(self, start_height : int, end_height : int, concurrency : int = 8) -> List[BlockResponse]:
+        """
+        Get all the blocks of a height range on the current network, keeping up to
+        `concurrency` /block requests in flight at once.
+
+        Parameters
+        ----------
+        start_height: int
+            The index of the first block.
+        end_height: int
+            The index of the last block, inclusive.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Returns
+        -------
+        list[BlockResponse]
+            In height order.
+
+        See Also
+        --------
+        iter_blocks: For streaming the blocks as they arrive.
+        """
+        return list(self.iter_blocks(start_height, end_height, concurrency))
+
+    def _block_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier) -> Transaction:
         """
         Private method for the get block transaction method to proivde an interface that
         supports calls with existing objects.
         """
-        return blk.transaction(self.url, network_id, block_id, transaction_id, self.session)
+        return self._indexed_transaction(network_id, block_id, transaction_id,
+                                         lambda: blk.transaction(self.url, network_id, block_id, transaction_id, self.session))
+
+    def _indexed_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier,
+                             fetch : Callable[[], Transaction]) -> Transaction:
+        """
+        Get the transaction from the blocks fetched last or the block cache, if
+        any holds it, or fetch it, ex: when it's one of `other_transactions`.
+        """
+        transaction = self._known_transaction(network_id, block_id, transaction_id)
+        return fetch() if transaction is None else transaction
+
+    def _known_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier) -> Optional[Transaction]:
+        transaction = self._transactions.get(network_id, block_id, transaction_id)
+        if transaction is None and self._block_cache is not None:
+            resp = self._block_cache.get(network_id, PartialBlockIdentifier(index=block_id.index, hash=block_id.hash_))
+            if resp is not None:
+                self._transactions.add(network_id, resp)
+                transaction = self._transactions.get(network_id, block_id, transaction_id)
+        return transaction
 
     def block_transaction_on_current_network(self, block_height : int, block_hash : str, transaction_hash : str) -> Transaction:
         """
@@ -734,6 +1057,244 @@ class RosettaAPI(object):
         transaction_id = TransactionIdentifier(hash=transaction_hash)
         return self._block_transaction(network_id, block_id, transaction_id)
 
+    def resolve_block(self, block : BlockResponse, concurrency : int = 8) -> Block:
+        """
+        Get the block of a /block response of the current network with its
+        `other_transactions` fetched, keeping up to `concurrency` /block/transaction
+        requests in flight at once. For implementations that only return the
+        identifiers of some transactions in the block.
+
+        Parameters
+        ----------
+        block: BlockResponse
+            The response of `block_on_current_network` or `iter_blocks`, ex.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Returns
+        -------
+        Block
+            A copy of the block, its transactions followed by the other
+            transactions in the order they were listed.
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        ValueError: If the response has no block.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        if block.block is None:
+            raise ValueError("The response has no block to resolve.")
+        network_id = self.current_network
+        block_id = block.block.block_identifier
+        transaction_ids = _unresolved(block)
+        transactions = ordered_map(lambda transaction_id: self._block_transaction(network_id, block_id, transaction_id),
+                                   transaction_ids, concurrency)
+        return _resolved(block.block, transactions)
+
+    def follow_chain(self, start : Optional[int] = None, confirmations : int = 0, concurrency : int = 8,
+                     poll_interval : float = 1.0, max_poll_interval : float = 15.0, max_reorg_depth : int = 100) -> Iterator[ChainEvent]:
+        """
+        Follow the current network from a height on, forever, yielding an event
+        for every block added to the chain and every block reorganized away.
+
+        Blocks are linked by hash, so a block whose parent isn't the last block
+        added means a reorg: the blocks of the old fork are removed, newest first,
+        before the blocks of the new fork are added, oldest first. While behind
+        the tip, up to `concurrency` blocks are prefetched at once. Once caught up,
+        the tip is polled every `poll_interval` seconds after a new block, backing
+        off up to `max_poll_interval` while none shows up.
+
+        Parameters
+        ----------
+        start: int, optional
+            The height of the first block to add. Defaults to the current tip,
+            less the confirmations.
+        confirmations: int
+            How many blocks have to be built on top of a block before it's
+            added. Defaults to 0, adding blocks as soon as they're the tip.
+        concurrency: int
+            The maximum number of /block requests in flight. Defaults to 8.
+        poll_interval: float
+            The shortest time, in seconds, between two polls of the tip. Defaults to 1.
+        max_poll_interval: float
+            The longest time, in seconds, between two polls of the tip. Defaults to 15.
+        max_reorg_depth: int
+            The number of blocks kept to detect reorgs. Defaults to 100.
+
+        Yields
+        ------
+        ChainEvent
+            type_: BlockEventType
+            block: Block
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        ReorgTooDeep: If the chain reorganized deeper than `max_reorg_depth`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        chain = Chain(max_reorg_depth)
+        poll = PollInterval(poll_interval, max_poll_interval)
+        height = start
+        while True:
+            tip = self._network_status(network_id).current_block_identifier
+            target = tip.index - confirmations
+            if height is None:
+                height = max(target, 0)
+            if height > target:
+                if confirmations == 0 and chain.holds(tip) is False:
+                    # The node moved to a fork no longer than the one followed.
+                    yield from self._link(network_id, chain, self._block(network_id, PartialBlockIdentifier(index=tip.index, hash=tip.hash_)).block)
+                    height = chain.tip.block_identifier.index + 1
+                time.sleep(poll.next())
+                continue
+            block_ids = (PartialBlockIdentifier(index=index) for index in range(height, target + 1))
+            for resp in ordered_map(lambda block_id: self._block(network_id, block_id), block_ids, concurrency):
+                if resp.block is None:
+                    # The node reports a tip it can't serve yet, ex: behind a load
+                    # balancer, back off before polling it again.
+                    time.sleep(poll.next())
+                    break
+                poll.reset()
+                events = self._link(network_id, chain, resp.block)
+                yield from events
+                height = chain.tip.block_identifier.index + 1
+                if not events[0].added:
+                    # The blocks prefetched after a reorg may be from either fork.
+                    break
+
+    def _link(self, network_id : NetworkIdentifier, chain : Chain, block : Block) -> List[ChainEvent]:
+        """
+        Add the block to the chain, along with its ancestors on a new fork, if any.
+        """
+        removed = []
+        added = [block]
+        while not chain.links(added[0]):
+            removed.append(chain.pop())
+            if chain.missing(removed[-1], added[0]):
+                added.insert(0, self._block(network_id, chain.parent_of(added[0])).block)
+        return chain.events(removed, added)
+
+    def iter_block_events(self, from_offset : int = 0, limit : int = 100, concurrency : int = 8, checkpoint = None,
+                          poll_interval : Optional[float] = None) -> Iterator[evnt.ResolvedBlockEvent]:
+        """
+        Stream the /events/blocks of the current network from an offset on, along
+        with the blocks they added. Pages of events are requested ahead of the
+        consumer, and the blocks of each page are fetched concurrently.
+
+        With a checkpoint, the sequence of the last event the consumer moved past,
+        ie. asked for the next one after, is saved once per page of events and when
+        the stream stops, and a later call resumes right after the last sequence
+        saved, whatever `from_offset` says. After a crash, up to a page of events
+        can be yielded again.
+
+        Parameters
+        ----------
+        from_offset: int
+            The sequence of the first event. Defaults to 0, the beginning.
+        limit: int
+            The number of events asked for per page. Defaults to 100.
+        concurrency: int
+            The maximum number of pages, and of blocks, in flight. Defaults to 8.
+        checkpoint: FileCheckpoint, optional
+            Where the last sequence processed is saved and loaded from, see
+            `utils.checkpoint`. Defaults to None.
+        poll_interval: float, optional
+            Once every event has been read, how long to wait, in seconds, before
+            looking for new ones. Defaults to None, stopping instead.
+
+        Yields
+        ------
+        ResolvedBlockEvent
+            event: BlockEvent
+            block: Block, optional
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        if checkpoint is not None:
+            saved = checkpoint.load()
+            if saved is not None:
+                from_offset = saved + 1
+        # The sequences are specific to the indexer of a node, so every
+        # page is requested from the same one.
+        pages = evnt.iter_pages(self.url, network_id, from_offset, limit, concurrency, poll_interval, self.session)
+        for events in pages:
+            done = None
+            try:
+                for resolved in ordered_map(lambda event: self._resolve_event(network_id, event), events, concurrency):
+                    yield resolved
+                    done = resolved.event.sequence
+            finally:
+                if checkpoint is not None and done is not None:
+                    checkpoint.save(done)
+
+    def _resolve_event(self, network_id : NetworkIdentifier, event : BlockEvent) -> evnt.ResolvedBlockEvent:
+        if event.type_ != BlockEventType.block_added:
+            return evnt.ResolvedBlockEvent(event, None)
+        block_id = PartialBlockIdentifier(index=event.block_identifier.index, hash=event.block_identifier.hash_)
+        return evnt.ResolvedBlockEvent(event, self._block(network_id, block_id).block)
+
+    def iter_search_transactions(self, operator : Optional[Operator] = "and", max_block : Optional[int] = None,
+                                 limit : Optional[int] = None, transaction_id : Optional[TransactionIdentifier] = None,
+                                 account_id : Optional[AccountIdentifier] = None, coin_id : Optional[CoinIdentifier] = None,
+                                 currency : Optional[Currency] = None, status : Optional[str] = None, type_ : Optional[str] = None,
+                                 address : Optional[str] = None, success : Optional[bool] = None,
+                                 concurrency : int = 4) -> Iterator[BlockTransaction]:
+        """
+        Stream every transaction of the current network that matches the conditions,
+        across all the pages of /search/transactions, requesting up to `concurrency`
+        pages ahead when their offsets are predictable. See `search.iter_transactions`.
+
+        Parameters
+        ----------
+        operator: Operator, optional
+            Either "and" or "or", how multiple conditions are applied. Defaults to "and".
+        max_block: int, optional
+            The newest block to consider. Defaults to the current tip, looked up once
+            so that every page is answered over the same blocks.
+        limit: int, optional
+            The maximum number of transactions per page.
+        transaction_id: TransactionIdentifier, optional
+        account_id: AccountIdentifier, optional
+        coin_id: CoinIdentifier, optional
+        currency: Currency, optional
+        status: str, optional
+            The network-specific operation status.
+        type_: str, optional
+            The network-specific operation type.
+        address: str, optional
+            Every transaction related to the address, whatever the subaccount.
+        success: bool, optional
+        concurrency: int
+            The maximum number of pages in flight. Defaults to 4.
+
+        Yields
+        ------
+        BlockTransaction
+            block_identifier: BlockIdentifier
+            transaction: Transaction
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        if max_block is None:
+            max_block = self._network_status(network_id).current_block_identifier.index
+        return srch.iter_transactions(self.url, network_id, operator, max_block, None, limit, transaction_id, account_id,
+                                      coin_id, currency, status, type_, address, success, concurrency, self.session)
+
     def _all_mempool_transactions(self, network_id : NetworkIdentifier, **kwargs) -> List[TransactionIdentifier]:
         """
         Private method for the get all mempool transaction method to proivde an interface that
@@ -847,9 +1408,10 @@ class RosettaAPIExt(RosettaAPI):
     in most cases.
     """
 
-    def discover_networks(self, network_metadata : Optional[Dict[str, Any]] = None, **kwargs) -> List[net.NetworkOverview]:
+    def discover_networks(self, network_metadata : Optional[Dict[str, Any]] = None, concurrency : int = 8, **kwargs) -> List[net.NetworkOverview]:
         """
         Discover available networks and get the supported options and status for each.
+        The /network/options and /network/status requests are made concurrently.
 
         Parameters
         ----------
@@ -857,6 +1419,8 @@ class RosettaAPIExt(RosettaAPI):
             Any additional metadata to be passed along to the /network/options
             and /network/status routes. See the individual node implementation
             to verify if additional metadata is needed.
+        concurrency: int
+            The maximum number of requests in flight at once. Defaults to 8.
         **kwargs
             Any additional metadata to be passed along to the /network/list request. 
             See the individual node implementation to verify if additional
@@ -874,4 +1438,21 @@ class RosettaAPIExt(RosettaAPI):
         The /network/options and /network/status endpoints need additional, but 
         different metadata. 
         """
-        return net.discover(self.url, self.session, network_metadata, **kwargs)
+        return net.discover(self.url, self.session, network_metadata, concurrency, **kwargs)
+
+def _unresolved(block : BlockResponse) -> List[TransactionIdentifier]:
+    """
+    The other transactions of the response that its block doesn't already hold.
+    """
+    inlined = index_transactions(block.block.transactions)
+    return [transaction_id for transaction_id in block.other_transactions or () if transaction_id.hash_ not in inlined]
+
+def _resolved(block : Block, transactions : Iterable[Transaction]) -> Block:
+    """
+    A copy of the block with the transactions appended, leaving the
+    original, which may be shared through the block cache, untouched.
+    """
+    resolved = block.copy()
+    resolved.transactions = block.transactions.copy()
+    resolved.transactions.extend(transactions)
+    return resolved
@@ -0,0 +1,674 @@
+"""
+An asyncio flavor of the RosettaAPI client.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Type, TypeVar, Union
+from urllib.parse import urljoin
+
+from pydantic import BaseModel
+
+from .models import (
+    AccountBalanceRequest,
+    AccountBalanceResponse,
+    AccountCoinsRequest,
+    AccountCoinsResponse,
+    AccountIdentifier,
+    Block,
+    BlockEvent,
+    BlockEventType,
+    BlockIdentifier,
+    BlockRequest,
+    BlockResponse,
+    BlockTransaction,
+    BlockTransactionRequest,
+    BlockTransactionResponse,
+    CoinIdentifier,
+    Currency,
+    EventsBlocksRequest,
+    EventsBlocksResponse,
+    MempoolResponse,
+    MempoolTransactionRequest,
+    MempoolTransactionResponse,
+    MetadataRequest,
+    NetworkIdentifier,
+    NetworkListResponse,
+    NetworkOptionsResponse,
+    NetworkRequest,
+    NetworkStatusResponse,
+    Operator,
+    PartialBlockIdentifier,
+    SearchTransactionsRequest,
+    SearchTransactionsResponse,
+    Transaction,
+    TransactionIdentifier,
+    construct_model,
+    lazy_block_response
+)
+
+from .account import AccountBalance, CoinSet
+from .api import RosettaAPI, _resolved, _unresolved
+from .chain import Chain, ChainEvent, PollInterval
+from .events import EventCursor, ResolvedBlockEvent
+from .search import planned_offsets
+from .network import NetworkOverview
+from .utils import make_AccountIdentifier
+from .utils.cache import BlockCache, TransactionIndex
+from .utils.coalescing import request_key
+from .utils.codec import encode_request, get_codec
+from .utils.deadline import DEFAULT_TIMEOUT, Timeout
+from .utils.hedging import HedgePolicy
+from .utils.retry import DEFAULT_RETRY, NO_RETRY, RetryPolicy
+from .utils.store import BlockStore
+from .utils.throttle import Throttle
+from .utils._async import SingleFlight, hedged, make_session, ordered_map, post_request, prewarm, stream_json_array
+
+M = TypeVar('M', bound=BaseModel)
+R = TypeVar('R')
+
+class AsyncRosettaAPI(RosettaAPI):
+    """
+    Every public method of RosettaAPI is available here with the same
+    parameters, but returns an awaitable instead of the result. All the
+    requests share a single aiohttp.ClientSession, so any number of calls
+    can be in flight at once, ex:
+
+        async with AsyncRosettaAPI(url) as api:
+            api.select_network('bitcoin', 'mainnet')
+            blocks = await asyncio.gather(*[api.block_on_current_network(i) for i in range(100)])
+    """
+
+    def __init__(self, api_url : str, session = None, max_connections : int = 100,
+                 max_connections_per_host : int = 0, keep_alive : bool = True, prewarm : int = 0,
+                 validate : bool = True, lazy_blocks : bool = False, retry : Optional[RetryPolicy] = DEFAULT_RETRY,
+                 hedge : Optional[HedgePolicy] = None, coalesce : bool = False, throttle : Optional[Throttle] = None,
+                 timeout : Optional[Timeout] = DEFAULT_TIMEOUT, block_cache : Optional[BlockCache] = None,
+                 block_store : Optional[BlockStore] = None, indexed_blocks : int = 16) -> None:
+        """
+        Parameters
+        ----------
+        api_url: str
+            The url where the node is located.
+        session: aiohttp.ClientSession, optional
+            An already existing aiohttp session. If none is passed
+            a session will be created for this object on the first request.
+        max_connections: int
+            The maximum number of simultaneous connections of the created session.
+            0 means no limit. Ignored when a session is passed.
+        max_connections_per_host: int
+            The maximum number of simultaneous connections of the created session
+            to a single host. 0 means no limit other than `max_connections`.
+            Ignored when a session is passed.
+        keep_alive: bool
+            Whether the created session reuses its connections across requests.
+            Defaults to True. Ignored when a session is passed.
+        prewarm: int
+            The number of connections to open to the node when the session
+            is created. Defaults to 0. See `prewarm`.
+        validate: bool
+            Whether responses are validated into their models. Setting this to
+            False builds the models without any validation, which is much faster
+            for large blocks but should only be used against a trusted node.
+            Defaults to True.
+        lazy_blocks: bool
+            Whether the blocks returned are LazyBlocks, whose transactions are only
+            built when they are accessed. Defaults to False.
+        retry: RetryPolicy, optional
+            When and how failed requests are retried. None disables retries.
+            Defaults to `RetryPolicy()`.
+        hedge: HedgePolicy, optional
+            Opt-in hedging of slow read-only requests, the slower request is
+            cancelled as soon as the other answers. Defaults to None, no hedging.
+        coalesce: bool
+            Whether identical read requests made concurrently share one call
+            and one parsed result. Defaults to False.
+        throttle: Throttle, optional
+            Limits the rate and the concurrency of the requests, see
+            `utils.throttle`. Defaults to None, no limits.
+        timeout: float | tuple[float, float], optional
+            The (connect, read) timeout of every request, in seconds. None waits
+            forever. Defaults to (10, 60). To bound a whole series of calls, wrap
+            them in `pyrosetta.deadline`.
+        block_cache: BlockCache, optional
+            Keeps recent /block responses in process, see `utils.cache`.
+            Defaults to None, no caching.
+        block_store: BlockStore, optional
+            Persists final blocks on disk, see `utils.store`. Defaults to None.
+        indexed_blocks: int
+            How many of the blocks fetched last have their transactions indexed,
+            see `RosettaAPI`. Defaults to 16.
+        """
+        self._api_url = api_url
+        self._session = session
+        self._owns_session = session is None
+        self._session_options = (max_connections, max_connections_per_host, keep_alive)
+        self._prewarm_connections = prewarm
+        self._validate = validate
+        self._lazy_blocks = lazy_blocks
+        self._retry = retry or NO_RETRY
+        self._hedge = hedge
+        self._single_flight = SingleFlight() if coalesce else None
+        self._throttle = throttle
+        self._timeout = timeout
+        self._block_cache = block_cache
+        self._block_store = block_store
+        self._transactions = TransactionIndex(indexed_blocks)
+        self._network_identifier = None
+
+    @property
+    def session(self):
+        """
+        The aiohttp.ClientSession used by this object, or None if
+        no request has been made yet.
+        """
+        return self._session
+
+    async def _get_session(self):
+        if self._session is None:
+            self._session = make_session(*self._session_options)
+            if self._prewarm_connections > 0:
+                await prewarm(self.url, self._prewarm_connections, self._session)
+        return self._session
+
+    async def prewarm(self, connections : int) -> None:
+        """
+        Open connections to the node ahead of time, so the first requests
+        made concurrently don't each pay for a TCP/TLS handshake.
+        This is best effort, failures are left to surface on the first
+        real request.
+
+        Parameters
+        ----------
+        connections: int
+            The number of connections to open.
+        """
+        await prewarm(self.url, connections, await self._get_session())
+
+    async def close(self) -> None:
+        """
+        Close the underlying session if it was created by this object.
+        """
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> 'AsyncRosettaAPI':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _post_json(self, path : str, req : BaseModel) -> Dict[str, Any]:
+        """
+        Post the request to the given path of the node and return
+        the decoded response.
+        """
+        url = urljoin(self.url, path)
+        session = await self._get_session()
+        data = encode_request(req)
+        endpoint = None if self._hedge is None else self._hedge.endpoint(url)
+        if endpoint is None:
+            return await post_request(url, data, session, self._retry, self._throttle, self._timeout)
+        return await hedged(lambda: post_request(url, data, session, self._retry, self._throttle, self._timeout), 1 + self._hedge.max_hedges,
+                            self._hedge.delay(endpoint), lambda latency: self._hedge.observe(endpoint, latency))
+
+    async def _post(self, path : str, req : BaseModel, response_model : Type[M]) -> M:
+        """
+        Post the request to the given path of the node and parse
+        the response as the response_model.
+        """
+        async def _parse():
+            resp = await self._post_json(path, req)
+            if self._validate:
+                return response_model(**resp)
+            return construct_model(response_model, resp)
+
+        return await self._coalesce(path, req, _parse)
+
+    async def _coalesce(self, path : str, req : BaseModel, call : Callable[[], Awaitable[R]]) -> R:
+        """
+        Await the call, sharing it with any identical request in
+        flight when coalescing.
+        """
+        if self._single_flight is None:
+            return await call()
+        return await self._single_flight.do((path, request_key(req)), call)
+
+    async def list_supported_networks(self, **kwargs) -> List[NetworkIdentifier]:
+        """
+        Get a list of supported networks.
+
+        Parameters
+        ----------
+        **kwargs
+            Any additional metadata to be passed along to the /network/list request. 
+            See the individual node implementation to verify if additional
+            metadata is needed.
+
+        Returns
+        -------
+        list[NetworkIdentifier]
+        """
+        req = MetadataRequest(metadata=kwargs)
+        resp = await self._post('network/list', req, NetworkListResponse)
+        return resp.network_identifiers
+
+    async def _network_status(self, network_id : NetworkIdentifier, **kwargs) -> NetworkStatusResponse:
+        req = NetworkRequest(network_identifier=network_id, metadata=kwargs)
+        status = await self._post('network/status', req, NetworkStatusResponse)
+        for tips in (self._block_cache, self._block_store):
+            if tips is not None:
+                tips.observe_tip(network_id, status.current_block_identifier.index)
+        return status
+
+    async def _network_supported_options(self, network_id : NetworkIdentifier, **kwargs) -> NetworkOptionsResponse:
+        req = NetworkRequest(network_identifier=network_id, metadata=kwargs)
+        return await self._post('network/options', req, NetworkOptionsResponse)
+
+    async def _balance(self, network_id : NetworkIdentifier, account_id : AccountIdentifier,
+                       block_id : Optional[PartialBlockIdentifier] = None, currencies : Optional[List[Currency]] = None) -> AccountBalanceResponse:
+        req = AccountBalanceRequest(network_identifier=network_id, account_identifier=account_id, block_identifier=block_id, currencies=currencies)
+        return await self._post('account/balance', req, AccountBalanceResponse)
+
+    async def balances_of_accounts(self, accounts : Iterable[Union[str, AccountIdentifier]], block_identifier : Optional[PartialBlockIdentifier] = None,
+                                   currencies : Optional[List[Currency]] = None, concurrency : int = 8) -> AsyncIterator[AccountBalance]:
+        """
+        Stream the balances of many accounts on the current network, all at the
+        same block, keeping up to `concurrency` requests in flight at once. See
+        `RosettaAPI.balances_of_accounts`.
+
+        Yields
+        ------
+        AccountBalance
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        if block_identifier is None:
+            tip = (await self._network_status(network_id)).current_block_identifier
+            block_identifier = PartialBlockIdentifier(index=tip.index, hash=tip.hash_)
+        account_ids = (make_AccountIdentifier(account) if isinstance(account, str) else account for account in accounts)
+
+        async def _balance(account_id):
+            return AccountBalance.from_response(account_id, await self._balance(network_id, account_id, block_identifier, currencies))
+
+        async for balance in ordered_map(_balance, account_ids, concurrency):
+            yield balance
+
+    async def _unspent_coins(self, network_id : NetworkIdentifier, account_id : AccountIdentifier, include_mempool : Optional[bool] = False, currencies : Optional[List[Currency]] = None) -> AccountCoinsResponse:
+        req = AccountCoinsRequest(network_identifier=network_id, account_identifier=account_id, include_mempool=include_mempool, currencies=currencies)
+        return await self._post('account/coins', req, AccountCoinsResponse)
+
+    async def unspent_coins_of_accounts(self, accounts : Iterable[Union[str, AccountIdentifier]], include_mempool : bool = False,
+                                        currencies : Optional[List[Currency]] = None, concurrency : int = 8) -> CoinSet:
+        """
+        Get the unspent coins of many accounts on the current network, keeping up to
+        `concurrency` requests in flight at once, merged into a single set deduplicated
+        by coin identifier. See `RosettaAPI.unspent_coins_of_accounts`.
+
+        Returns
+        -------
+        CoinSet
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        account_ids = (make_AccountIdentifier(account) if isinstance(account, str) else account for account in accounts)
+
+        async def _coins(account_id):
+            return account_id, await self._unspent_coins(network_id, account_id, include_mempool, currencies)
+
+        return CoinSet.from_responses([response async for response in ordered_map(_coins, account_ids, concurrency)])
+
+    async def _block(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> BlockResponse:
+        cache = self._block_cache
+        resp = None if cache is None else cache.get(network_id, block_id)
+        if resp is None:
+            resp = await self._fetch_block(network_id, block_id)
+            if cache is not None:
+                cache.put(network_id, resp)
+        self._transactions.add(network_id, resp)
+        return resp
+
+    async def _fetch_block(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> BlockResponse:
+        store = self._block_store
+        data = None if store is None else store.get_block(network_id, block_id)
+        if data is not None:
+            return self._load_block(data)
+        req = BlockRequest(network_identifier=network_id, block_identifier=block_id)
+
+        async def _fetch():
+            data = await self._post_json('block', req)
+            if store is not None and data.get('block') is not None:
+                if not store.has_tip(network_id):
+                    await self._network_status(network_id)
+                store.put_block(network_id, BlockIdentifier(**data['block']['block_identifier']), get_codec().dumps(data),
+                                canonical=block_id.hash_ is None)
+            return self._load_block(data)
+
+        return await self._coalesce('block', req, _fetch)
+
+    def _load_block(self, data : Dict[str, Any]) -> BlockResponse:
+        if self._lazy_blocks:
+            return lazy_block_response(data, self._validate)
+        if self._validate:
+            return BlockResponse(**data)
+        return construct_model(BlockResponse, data)
+
+    async def _iter_block_transactions(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> AsyncIterator[Transaction]:
+        stored = None if self._block_store is None else self._block_store.get_block(network_id, block_id)
+        if stored is not None:
+            for data in (stored.get('block') or {}).get('transactions') or ():
+                yield Transaction(**data) if self._validate else construct_model(Transaction, data)
+            return
+        req = BlockRequest(network_identifier=network_id, block_identifier=block_id)
+        url = urljoin(self.url, 'block')
+        session = await self._get_session()
+        async for data in stream_json_array(url, encode_request(req), session, ('block', 'transactions'), self._retry, self._throttle, timeout=self._timeout):
+            if self._validate:
+                yield Transaction(**data)
+            else:
+                yield construct_model(Transaction, data)
+
+    async def iter_blocks(self, start_height : int, end_height : int, concurrency : int = 8) -> AsyncIterator[BlockResponse]:
+        """
+        Stream the blocks of a height range on the current network, keeping up to
+        `concurrency` /block requests in flight at once. The blocks are still
+        yielded in height order.
+
+        Parameters
+        ----------
+        start_height: int
+            The index of the first block.
+        end_height: int
+            The index of the last block, inclusive.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Yields
+        ------
+        BlockResponse
+
+        Raises
+        ------
+        RuntimeError: If not current network has been selected.
+        ValueError: If `end_height` is lower than `start_height`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        if end_height < start_height:
+            raise ValueError("`end_height` can't be lower than `start_height`.")
+        network_id = self.current_network
+        block_ids = (PartialBlockIdentifier(index=height) for height in range(start_height, end_height + 1))
+        async for block in ordered_map(lambda block_id: self._block(network_id, block_id), block_ids, concurrency):
+            yield block
+
+    async def fetch_blocks(self, start_height : int, end_height : int, concurrency : int = 8) -> List[BlockResponse]:
+        """
+        Get all the blocks of a height range on the current network, keeping up to
+        `concurrency` /block requests in flight at once.
+
+        Parameters
+        ----------
+        start_height: int
+            The index of the first block.
+        end_height: int
+            The index of the last block, inclusive.
+        concurrency: int
+            The maximum number of requests in flight. Defaults to 8.
+
+        Returns
+        -------
+        list[BlockResponse]
+            In height order.
+        """
+        return [block async for block in self.iter_blocks(start_height, end_height, concurrency)]
+
+    async def _block_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier) -> Transaction:
+        transaction = self._known_transaction(network_id, block_id, transaction_id)
+        if transaction is not None:
+            return transaction
+        store = self._block_store
+        data = None if store is None else store.get_transaction(network_id, block_id, transaction_id)
+        if data is None:
+            req = BlockTransactionRequest(network_identifier=network_id, block_identifier=block_id, transaction_identifier=transaction_id)
+
+            async def _fetch():
+                data = await self._post_json('block/transaction', req)
+                if store is not None:
+                    if not store.has_tip(network_id):
+                        await self._network_status(network_id)
+                    store.put_transaction(network_id, block_id, transaction_id, get_codec().dumps(data))
+                return data
+
+            data = await self._coalesce('block/transaction', req, _fetch)
+        if self._validate:
+            return BlockTransactionResponse(**data).transaction
+        return construct_model(BlockTransactionResponse, data).transaction
+
+    async def resolve_block(self, block : BlockResponse, concurrency : int = 8) -> Block:
+        """
+        Get the block of a /block response of the current network with its
+        `other_transactions` fetched concurrently. See `RosettaAPI.resolve_block`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        if block.block is None:
+            raise ValueError("The response has no block to resolve.")
+        network_id = self.current_network
+        block_id = block.block.block_identifier
+        transactions = [transaction async for transaction in ordered_map(
+            lambda transaction_id: self._block_transaction(network_id, block_id, transaction_id), _unresolved(block), concurrency)]
+        return _resolved(block.block, transactions)
+
+    async def follow_chain(self, start : Optional[int] = None, confirmations : int = 0, concurrency : int = 8,
+                           poll_interval : float = 1.0, max_poll_interval : float = 15.0,
+                           max_reorg_depth : int = 100) -> AsyncIterator[ChainEvent]:
+        """
+        Follow the current network from a height on, forever, yielding an event
+        for every block added and every block reorganized away.
+        See `RosettaAPI.follow_chain`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        chain = Chain(max_reorg_depth)
+        poll = PollInterval(poll_interval, max_poll_interval)
+        height = start
+        while True:
+            tip = (await self._network_status(network_id)).current_block_identifier
+            target = tip.index - confirmations
+            if height is None:
+                height = max(target, 0)
+            if height > target:
+                if confirmations == 0 and chain.holds(tip) is False:
+                    # The node moved to a fork no longer than the one followed.
+                    resp = await self._block(network_id, PartialBlockIdentifier(index=tip.index, hash=tip.hash_))
+                    for event in await self._link(network_id, chain, resp.block):
+                        yield event
+                    height = chain.tip.block_identifier.index + 1
+                await asyncio.sleep(poll.next())
+                continue
+            block_ids = (PartialBlockIdentifier(index=index) for index in range(height, target + 1))
+            blocks = ordered_map(lambda block_id: self._block(network_id, block_id), block_ids, concurrency)
+            try:
+                async for resp in blocks:
+                    if resp.block is None:
+                        # The node reports a tip it can't serve yet, ex: behind a load
+                        # balancer, back off before polling it again.
+                        await asyncio.sleep(poll.next())
+                        break
+                    poll.reset()
+                    events = await self._link(network_id, chain, resp.block)
+                    for event in events:
+                        yield event
+                    height = chain.tip.block_identifier.index + 1
+                    if not events[0].added:
+                        # The blocks prefetched after a reorg may be from either fork.
+                        break
+            finally:
+                await blocks.aclose()
+
+    async def _link(self, network_id : NetworkIdentifier, chain : Chain, block : Block) -> List[ChainEvent]:
+        removed = []
+        added = [block]
+        while not chain.links(added[0]):
+            removed.append(chain.pop())
+            if chain.missing(removed[-1], added[0]):
+                added.insert(0, (await self._block(network_id, chain.parent_of(added[0]))).block)
+        return chain.events(removed, added)
+
+    async def iter_block_events(self, from_offset : int = 0, limit : int = 100, concurrency : int = 8, checkpoint = None,
+                                poll_interval : Optional[float] = None) -> AsyncIterator[ResolvedBlockEvent]:
+        """
+        Stream the /events/blocks of the current network from an offset on, along
+        with the blocks they added. See `RosettaAPI.iter_block_events`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        if checkpoint is not None:
+            saved = checkpoint.load()
+            if saved is not None:
+                from_offset = saved + 1
+        async for events in self._iter_event_pages(network_id, from_offset, limit, concurrency, poll_interval):
+            done = None
+            resolved_events = ordered_map(lambda event: self._resolve_event(network_id, event), events, concurrency)
+            try:
+                async for resolved in resolved_events:
+                    yield resolved
+                    done = resolved.event.sequence
+            finally:
+                await resolved_events.aclose()
+                if checkpoint is not None and done is not None:
+                    checkpoint.save(done)
+
+    async def _iter_event_pages(self, network_id : NetworkIdentifier, offset : int, limit : int, concurrency : int,
+                                poll_interval : Optional[float]) -> AsyncIterator[List[BlockEvent]]:
+        cursor = EventCursor(offset, limit)
+
+        async def _page(page_offset):
+            req = EventsBlocksRequest(network_identifier=network_id, offset=page_offset, limit=limit)
+            return page_offset, await self._post('events/blocks', req, EventsBlocksResponse)
+
+        while True:
+            probing = cursor.caught_up
+            limit = cursor.limit
+            pages = ordered_map(_page, cursor.offsets(), concurrency)
+            try:
+                async for page_offset, resp in pages:
+                    events, planned = cursor.take(page_offset, resp)
+                    if events:
+                        yield events
+                    if not planned:
+                        break
+            finally:
+                await pages.aclose()
+            if probing and cursor.caught_up:
+                if poll_interval is None:
+                    return
+                await asyncio.sleep(poll_interval)
+
+    async def _resolve_event(self, network_id : NetworkIdentifier, event : BlockEvent) -> ResolvedBlockEvent:
+        if event.type_ != BlockEventType.block_added:
+            return ResolvedBlockEvent(event, None)
+        block_id = PartialBlockIdentifier(index=event.block_identifier.index, hash=event.block_identifier.hash_)
+        return ResolvedBlockEvent(event, (await self._block(network_id, block_id)).block)
+
+    async def iter_search_transactions(self, operator : Optional[Operator] = "and", max_block : Optional[int] = None,
+                                       limit : Optional[int] = None, transaction_id : Optional[TransactionIdentifier] = None,
+                                       account_id : Optional[AccountIdentifier] = None, coin_id : Optional[CoinIdentifier] = None,
+                                       currency : Optional[Currency] = None, status : Optional[str] = None, type_ : Optional[str] = None,
+                                       address : Optional[str] = None, success : Optional[bool] = None,
+                                       concurrency : int = 4) -> AsyncIterator[BlockTransaction]:
+        """
+        Stream every transaction of the current network that matches the conditions,
+        across all the pages of /search/transactions. See `RosettaAPI.iter_search_transactions`.
+        """
+        if self.current_network is None:
+            raise RuntimeError("No `current_network` has been selected. See `select_network` for selecting a current network.")
+        network_id = self.current_network
+        if max_block is None:
+            max_block = (await self._network_status(network_id)).current_block_identifier.index
+        req = SearchTransactionsRequest(network_identifier=network_id, operator=operator, max_block=max_block, limit=limit,
+                                        transaction_identifier=transaction_id, account_identifier=account_id,
+                                        coin_identifier=coin_id, currency=currency, status=status, type=type_,
+                                        address=address, success=success)
+
+        async def _page(page_offset):
+            return page_offset, await self._post('search/transactions', req.copy(update={'offset': page_offset}), SearchTransactionsResponse)
+
+        page_offset, resp = await _page(0)
+        while True:
+            offsets = planned_offsets(page_offset, resp)
+            for transaction in resp.transactions:
+                yield transaction
+            if resp.next_offset is None:
+                return
+            if offsets is None or concurrency <= 1:
+                page_offset, resp = await _page(resp.next_offset)
+                continue
+            pages = ordered_map(_page, offsets, concurrency)
+            try:
+                async for page_offset, resp in pages:
+                    if page_offset == offsets[-1] or resp.next_offset != page_offset + offsets.step:
+                        break
+                    for transaction in resp.transactions:
+                        yield transaction
+            finally:
+                await pages.aclose()
+
+    async def _all_mempool_transactions(self, network_id : NetworkIdentifier, **kwargs) -> List[TransactionIdentifier]:
+        req = NetworkRequest(network_identifier=network_id, metadata=kwargs)
+        resp = await self._post('mempool', req, MempoolResponse)
+        return resp.transaction_identifiers
+
+    async def _mempool_transaction(self, network_id : NetworkIdentifier, transaction_id : TransactionIdentifier) -> MempoolTransactionResponse:
+        req = MempoolTransactionRequest(network_identifier=network_id, transaction_identifier=transaction_id)
+        return await self._post('mempool/transaction', req, MempoolTransactionResponse)
+
+
+class AsyncRosettaAPIExt(AsyncRosettaAPI):
+    """
+    The asyncio flavor of RosettaAPIExt.
+    """
+
+    async def discover_networks(self, network_metadata : Optional[Dict[str, Any]] = None, concurrency : int = 8, **kwargs) -> List[NetworkOverview]:
+        """
+        Discover available networks and get the supported options and status for each.
+        All the /network/options and /network/status requests are made concurrently.
+
+        Parameters
+        ----------
+        network_metadata: dict[str, Any], optional:
+            Any additional metadata to be passed along to the /network/options
+            and /network/status routes. See the individual node implementation
+            to verify if additional metadata is needed.
+        concurrency: int
+            The maximum number of requests in flight at once. Defaults to 8,
+            0 or less means no limit.
+        **kwargs
+            Any additional metadata to be passed along to the /network/list request. 
+            See the individual node implementation to verify if additional
+            metadata is needed.
+
+        Returns
+        -------
+        list[NetworkOverview]
+            network: NetworkIdentifier
+            options: NetworkOptionsResponse
+            status: NetworkStatusResponse
+        """
+        if network_metadata is None:
+            network_metadata = {}
+        network_ids = await self.list_supported_networks(**kwargs)
+        calls = [(call, network_id) for network_id in network_ids for call in (self._network_supported_options, self._network_status)]
+        results = iter([result async for result in ordered_map(lambda c: c[0](c[1], **network_metadata), calls, concurrency)])
+        return [NetworkOverview(network_id, opts, status) for network_id, opts, status in zip(network_ids, results, results)]
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Iterator, Optional
 
 import requests
 
@@ -10,12 +10,15 @@ from .models import (
     BlockTransactionResponse,
     NetworkIdentifier,
     PartialBlockIdentifier,
+    Transaction,
     TransactionIdentifier
 )
 
 from .endpoints.data import (
     get_block,
-    get_block_transaction
+    get_block_transaction,
+    get_stored_block,
+    iter_block_transactions
 )
 
 def block(api_url : str, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier, session : Optional[requests.Session] = None) -> BlockResponse:
@@ -34,6 +37,43 @@ def block(api_url : str, network_id : NetworkIdentifier, block_id : PartialBlock
     req = BlockRequest(network_identifier=network_id, block_identifier=block_id)
     return get_block(api_url, req, session)
 
+def stored_block(network_id : NetworkIdentifier, block_id : PartialBlockIdentifier, session : Optional[requests.Session] = None) -> Optional[BlockResponse]:
+    """
+    Get a block from the block store of the session, without making any request.
+
+    Parameters
+    ----------
+    network_id: NetworkIdentifier
+    block_id: PartialBlockIdentifier
+    session: requests.Session, optional
+
+    Returns
+    -------
+    BlockResponse, optional
+        None if the session has no block store or the block isn't in it.
+    """
+    req = BlockRequest(network_identifier=network_id, block_identifier=block_id)
+    return get_stored_block(req, session)
+
+def iter_transactions(api_url : str, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier, session : Optional[requests.Session] = None) -> Iterator[Transaction]:
+    """
+    Stream the transactions of a block as its response downloads,
+    rather than holding the whole block in memory.
+
+    Parameters
+    ----------
+    api_url: str
+    network_id: NetworkIdentifier
+    block_id: PartialBlockIdentifier
+    session: requests.Session, optional
+
+    Yields
+    ------
+    Transaction
+    """
+    req = BlockRequest(network_identifier=network_id, block_identifier=block_id)
+    return iter_block_transactions(api_url, req, session)
+
 def transaction(api_url : str, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier, session : Optional[requests.Session] = None) -> BlockTransactionResponse:
     """
     Parameters
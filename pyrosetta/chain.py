@@ -0,0 +1,153 @@
+"""
+Following the tip of a chain, detecting reorgs by hash linkage.
+"""
+from collections import deque
+from typing import List, NamedTuple, Optional
+
+from .exceptions import ReorgTooDeep
+from .models import Block, BlockEventType, BlockIdentifier, PartialBlockIdentifier
+
+class ChainEvent(NamedTuple):
+    """
+    A block joining or leaving the chain being followed, see
+    `RosettaAPI.follow_chain`.
+
+    Attributes
+    ----------
+    type_: BlockEventType
+        block_added or block_removed.
+    block: Block
+        The block added, or the block removed, as it was when added.
+    """
+    type_ : BlockEventType
+    block : Block
+
+    @property
+    def added(self) -> bool:
+        return self.type_ == BlockEventType.block_added
+
+class Chain(object):
+    """
+    The last blocks added to the chain being followed, newest last, to tell
+    whether the next block builds on them and, when it doesn't, which ones
+    were reorganized away.
+
+    A reorg is handled by popping the blocks that the new block's ancestry
+    doesn't link to, fetching its missing ancestors by hash:
+
+        while not chain.links(added[0]):
+            removed.append(chain.pop())
+            if chain.missing(removed[-1], added[0]):
+                added.insert(0, fetch(chain.parent_of(added[0])))
+    """
+
+    def __init__(self, max_depth : int = 100) -> None:
+        """
+        Parameters
+        ----------
+        max_depth: int
+            The number of blocks kept, the deepest reorg that can be followed.
+            Defaults to 100.
+        """
+        self.max_depth = max_depth
+        self._blocks = deque()
+        self._trimmed = False
+
+    @property
+    def tip(self) -> Optional[Block]:
+        """
+        The last block added, if any.
+        """
+        return self._blocks[-1] if self._blocks else None
+
+    def links(self, block : Block) -> bool:
+        """
+        Whether the block is the child of the tip, or the chain is empty.
+        """
+        tip = self.tip
+        return tip is None or block.parent_block_identifier.hash_ == tip.block_identifier.hash_
+
+    def append(self, block : Block) -> None:
+        self._blocks.append(block)
+        while len(self._blocks) > self.max_depth:
+            self._blocks.popleft()
+            self._trimmed = True
+
+    def pop(self) -> Block:
+        """
+        Remove the tip, reorganized away.
+
+        Raises
+        ------
+        ReorgTooDeep: If every block kept has been removed while older ones
+            were already dropped, so the fork point can't be found.
+        """
+        block = self._blocks.pop()
+        if not self._blocks and self._trimmed:
+            raise ReorgTooDeep("The chain reorganized below height {}, deeper than the {} blocks kept.".format(
+                block.block_identifier.index, self.max_depth))
+        return block
+
+    def holds(self, block_id : BlockIdentifier) -> Optional[bool]:
+        """
+        Whether the block is part of the chain, or None if it's
+        older than the blocks kept or newer than the tip.
+        """
+        if not self._blocks:
+            return None
+        offset = block_id.index - self._blocks[0].block_identifier.index
+        if offset < 0 or offset >= len(self._blocks):
+            return None
+        return self._blocks[offset].block_identifier.hash_ == block_id.hash_
+
+    @staticmethod
+    def missing(removed : Block, oldest : Block) -> bool:
+        """
+        Whether, after removing a block, the parent of the oldest block to add
+        has to be fetched, because it's on the new fork at the removed height.
+        """
+        return removed.block_identifier.index < oldest.block_identifier.index
+
+    @staticmethod
+    def parent_of(block : Block) -> PartialBlockIdentifier:
+        """
+        The identifier to fetch the parent of the block with, by hash
+        since the parent by height may be on another fork.
+        """
+        parent = block.parent_block_identifier
+        return PartialBlockIdentifier(index=parent.index, hash=parent.hash_)
+
+    def events(self, removed : List[Block], added : List[Block]) -> List[ChainEvent]:
+        """
+        Add the blocks, and return the events of a step of the chain: the
+        blocks removed, newest first, then the blocks added, oldest first.
+        """
+        for block in added:
+            self.append(block)
+        return ([ChainEvent(BlockEventType.block_removed, block) for block in removed]
+                + [ChainEvent(BlockEventType.block_added, block) for block in added])
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+class PollInterval(object):
+    """
+    How long to wait before polling the tip again: `minimum` after new blocks
+    showed up, doubling up to `maximum` while none do.
+    """
+
+    def __init__(self, minimum : float = 1.0, maximum : float = 15.0) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.current = minimum
+
+    def reset(self) -> None:
+        self.current = self.minimum
+
+    def next(self) -> float:
+        """
+        The time to wait, in seconds, before the next poll.
+        """
+        interval = self.current
+        self.current = min(self.current * 2, self.maximum)
+        return interval
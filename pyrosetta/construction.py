@@ -81,7 +81,7 @@ def derive(api_url : str, network_id : NetworkIdentifier, public_key : PublicKey
     req = ConstructionDeriveRequest(network_identifier=network_id, public_key=public_key, metadata=kwargs)
     return derive_account_id_from_pubkey(api_url, req, session)
 
-def signed_transaction_hash(api_url : str, network_id : NetworkIdentifier, signed_transaction : str, sesison : Optional[requests.Session] = None) -> TransactionIdentifierResponse:
+def signed_transaction_hash(api_url : str, network_id : NetworkIdentifier, signed_transaction : str, session : Optional[requests.Session] = None) -> TransactionIdentifierResponse:
     """
     Get the network-specific hash of the signed transaction.
 
@@ -21,7 +21,8 @@ from ..models import (
     TransactionIdentifierResponse
 )
 
-from ..utils.communication import post_request
+from ..utils.codec import encode_request
+from ..utils.communication import parse_response, post_request
 
 
 def create_network_transaction_from_signatures(api_url : str, req : ConstructionCombineRequest, session : Optional[requests.Session] = None) -> ConstructionCombineResponse:
@@ -31,8 +32,8 @@ def create_network_transaction_from_signatures(api_url : str, req : Construction
     ref: /construction/combine
     """
     url = urljoin(api_url, 'construction/combine')
-    resp = post_request(url, req.json(), session)
-    return ConstructionCombineResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(ConstructionCombineResponse, resp, session)
 
 def derive_account_id_from_pubkey(api_url : str, req : ConstructionDeriveRequest, session : Optional[requests.Session] = None) -> ConstructionDeriveResponse:
     """
@@ -41,8 +42,8 @@ def derive_account_id_from_pubkey(api_url : str, req : ConstructionDeriveRequest
     ref: /construction/derive
     """
     url = urljoin(api_url, 'construction/derive')
-    resp = post_request(url, req.json(), session)
-    return ConstructionDeriveResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(ConstructionDeriveResponse, resp, session)
 
 def get_hash_of_signed_transaction(api_url : str, req : ConstructionHashRequest, session : Optional[requests.Session] = None) -> TransactionIdentifierResponse:
     """
@@ -51,8 +52,8 @@ def get_hash_of_signed_transaction(api_url : str, req : ConstructionHashRequest,
     ref: /construction/hash
     """
     url = urljoin(api_url, 'construction/hash')
-    resp = post_request(url, req.json(), session)
-    return TransactionIdentifierResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(TransactionIdentifierResponse, resp, session)
 
 def get_metadata_for_transaction_construction(api_url : str, req : ConstructionMetadataRequest, session : Optional[requests.Session] = None) -> ConstructionMetadataResponse:
     """
@@ -61,8 +62,8 @@ def get_metadata_for_transaction_construction(api_url : str, req : ConstructionM
     ref: /construction/metadata
     """
     url = urljoin(api_url, 'construction/metadata')
-    resp = post_request(url, req.json(), session)
-    return ConstructionMetadataResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(ConstructionMetadataResponse, resp, session)
 
 def parse_transaction(api_url : str, req : ConstructionParseRequest, session : Optional[requests.Session] = None) -> ConstructionParseResponse:
     """
@@ -71,8 +72,8 @@ def parse_transaction(api_url : str, req : ConstructionParseRequest, session : O
     ref: /construction/parse
     """
     url = urljoin(api_url, 'construction/parse')
-    resp = post_request(url, req.json(), session)
-    return ConstructionParseResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(ConstructionParseResponse, resp, session)
 
 def generate_unsigned_transaction_and_signing_payloads(api_url : str, req : ConstructionPayloadsRequest, session : Optional[requests.Session] = None) -> ConstructionPayloadsResponse:
     """
@@ -81,8 +82,8 @@ def generate_unsigned_transaction_and_signing_payloads(api_url : str, req : Cons
     ref: /construction/payloads
     """
     url = urljoin(api_url, 'construction/payloads')
-    resp = post_request(url, req.json(), session)
-    return ConstructionPayloadsResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(ConstructionPayloadsResponse, resp, session)
 
 def create_request_to_fetch_metadata(api_url : str, req : ConstructionPreprocessRequest, session : Optional[requests.Session] = None) -> ConstructionPreprocessResponse:
     """
@@ -91,8 +92,8 @@ def create_request_to_fetch_metadata(api_url : str, req : ConstructionPreprocess
     ref: /construction/preprocess
     """
     url = urljoin(api_url, 'construction/preprocess')
-    resp = post_request(url, req.json(), session)
-    return ConstructionPreprocessResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(ConstructionPreprocessResponse, resp, session)
 
 def submit_signed_transaction(api_url : str, req : ConstructionSubmitRequest, session : Optional[requests.Session] = None) -> TransactionIdentifierResponse:
     """
@@ -101,5 +102,5 @@ def submit_signed_transaction(api_url : str, req : ConstructionSubmitRequest, se
     ref: /construction/submit
     """
     url = urljoin(api_url, 'construction/submit')
-    resp = post_request(url, req.json(), session)
-    return TransactionIdentifierResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(TransactionIdentifierResponse, resp, session)
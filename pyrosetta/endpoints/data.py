@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
 from urllib.parse import urljoin
 
 import requests
@@ -8,6 +8,7 @@ from ..models import (
     AccountBalanceResponse,
     AccountCoinsRequest,
     AccountCoinsResponse,
+    BlockIdentifier,
     BlockRequest,
     BlockResponse,
     BlockTransactionRequest,
@@ -16,14 +17,25 @@ from ..models import (
     MempoolTransactionRequest,
     MempoolTransactionResponse,
     MetadataRequest,
+    NetworkIdentifier,
     NetworkRequest,
     NetworkListResponse,
     NetworkOptionsResponse,
-    NetworkStatusResponse
+    NetworkStatusResponse,
+    Transaction,
+    lazy_block_response
 )
 
-from ..utils.communication import post_request
+from ..utils.coalescing import coalesced
+from ..utils.codec import decode_response, encode_request
+from ..utils.communication import load_model, parse_response, post_request, session_option
+from ..utils.deadline import bounded
+from ..utils.store import BlockStore
+from ..utils.streaming import iter_json_array
 
+STREAM_CHUNK_SIZE = 1 << 16
+
+@coalesced
 def get_available_networks(api_url : str, req : MetadataRequest, session : Optional[requests.Session] = None) -> NetworkListResponse:
     """
     req: MetadataRequest
@@ -31,9 +43,10 @@ def get_available_networks(api_url : str, req : MetadataRequest, session : Optio
     ref: /network/list
     """
     url = urljoin(api_url, 'network/list')
-    resp = post_request(url, req.json(), session)
-    return NetworkListResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(NetworkListResponse, resp, session)
 
+@coalesced
 def get_network_options(api_url : str, req: NetworkRequest, session : Optional[requests.Session] = None) -> NetworkOptionsResponse:
     """
     req: NetworkRequest
@@ -41,9 +54,10 @@ def get_network_options(api_url : str, req: NetworkRequest, session : Optional[r
     ref: /network/options
     """
     url = urljoin(api_url, 'network/options')
-    resp = post_request(url, req.json(), session)
-    return NetworkOptionsResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(NetworkOptionsResponse, resp, session)
 
+@coalesced
 def get_network_status(api_url : str, req: NetworkRequest, session : Optional[requests.Session] = None) -> NetworkStatusResponse:
     """
     req: NetworkRequest
@@ -51,9 +65,14 @@ def get_network_status(api_url : str, req: NetworkRequest, session : Optional[re
     ref: /network/status
     """
     url = urljoin(api_url, 'network/status')
-    resp = post_request(url, req.json(), session)
-    return NetworkStatusResponse(**resp.json())
-
+    resp = post_request(url, encode_request(req), session)
+    status = parse_response(NetworkStatusResponse, resp, session)
+    store = session_option(session, 'block_store')
+    if store is not None:
+        store.observe_tip(req.network_identifier, status.current_block_identifier.index)
+    return status
+
+@coalesced
 def get_account_balance(api_url : str, req : AccountBalanceRequest, session : Optional[requests.Session] = None) -> AccountBalanceResponse:
     """
     req: AccountBalanceRequest
@@ -61,9 +80,10 @@ def get_account_balance(api_url : str, req : AccountBalanceRequest, session : Op
     ref: /account/balance
     """
     url = urljoin(api_url, 'account/balance')
-    resp = post_request(url, req.json(), session)
-    return AccountBalanceResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(AccountBalanceResponse, resp, session)
 
+@coalesced
 def get_account_unspent_coins(api_url : str, req : AccountCoinsRequest, session : Optional[requests.Session] = None) -> AccountCoinsResponse:
     """
     req: AccountCoinsRequest
@@ -71,34 +91,95 @@ def get_account_unspent_coins(api_url : str, req : AccountCoinsRequest, session
     ref: /account/coins
     """
     url = urljoin(api_url, 'account/coins')
-    resp = post_request(url, req.json(), session)
-    return AccountCoinsResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(AccountCoinsResponse, resp, session)
 
 
+@coalesced
 def get_block(api_url : str, req : BlockRequest, session : Optional[requests.Session] = None) -> BlockResponse:
     """
     req: BlockRequest
     resp: BlockResponse
     ref: /block
     """
+    stored = get_stored_block(req, session)
+    if stored is not None:
+        return stored
+    url = urljoin(api_url, 'block')
+    resp = post_request(url, encode_request(req), session)
+    data = decode_response(resp)
+    store = session_option(session, 'block_store')
+    if store is not None and data.get('block') is not None:
+        _learn_tip(api_url, req.network_identifier, store, session)
+        store.put_block(req.network_identifier, BlockIdentifier(**data['block']['block_identifier']), resp.content,
+                        canonical=req.block_identifier.hash_ is None)
+    return _load_block(data, session)
+
+def get_stored_block(req : BlockRequest, session : Optional[requests.Session] = None) -> Optional[BlockResponse]:
+    """
+    req: BlockRequest
+    resp: BlockResponse, if the block is in the session's block store
+
+    No request is made.
+    """
+    store = session_option(session, 'block_store')
+    data = None if store is None else store.get_block(req.network_identifier, req.block_identifier)
+    return None if data is None else _load_block(data, session)
+
+def _load_block(data : Dict[str, Any], session : Optional[requests.Session] = None) -> BlockResponse:
+    if session_option(session, 'lazy_blocks'):
+        return lazy_block_response(data, session_option(session, 'validate'))
+    return load_model(BlockResponse, data, session)
+
+def _learn_tip(api_url : str, network_id : NetworkIdentifier, store : BlockStore, session : Optional[requests.Session] = None) -> None:
+    """
+    Look up the tip of the network once, so the store can tell which blocks are final.
+    """
+    if not store.has_tip(network_id):
+        get_network_status(api_url, NetworkRequest(network_identifier=network_id), session)
+
+def iter_block_transactions(api_url : str, req : BlockRequest, session : Optional[requests.Session] = None) -> Iterator[Transaction]:
+    """
+    req: BlockRequest
+    resp: Transaction, one at a time
+    ref: /block
+
+    The body is parsed as it downloads, and only one transaction
+    is held in memory at a time. A block in the session's block
+    store is read from it instead.
+    """
+    store = session_option(session, 'block_store')
+    stored = None if store is None else store.get_block(req.network_identifier, req.block_identifier)
+    if stored is not None:
+        for data in (stored.get('block') or {}).get('transactions') or ():
+            yield load_model(Transaction, data, session)
+        return
     url = urljoin(api_url, 'block')
-    resp = post_request(url, req.json(by_alias=True), session)
-    resp.raise_for_status()
-    return BlockResponse(**resp.json())
+    with post_request(url, encode_request(req), session, stream=True) as resp:
+        for data in iter_json_array(bounded(resp.iter_content(STREAM_CHUNK_SIZE)), ('block', 'transactions')):
+            yield load_model(Transaction, data, session)
 
+@coalesced
 def get_block_transaction(api_url : str, req : BlockTransactionRequest, session : Optional[requests.Session] = None) -> BlockTransactionResponse:
     """
     req: BlockTransactionRequest
     resp: BlockTransactionResponse
     ref: /block/transaction
     """
+    store = session_option(session, 'block_store')
+    data = None if store is None else store.get_transaction(req.network_identifier, req.block_identifier, req.transaction_identifier)
+    if data is not None:
+        return load_model(BlockTransactionResponse, data, session)
     url = urljoin(api_url, 'block/transaction')
-    resp = post_request(url, req.json(by_alias=True), session)
-    resp.raise_for_status()
-    return BlockTransactionResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    if store is not None:
+        _learn_tip(api_url, req.network_identifier, store, session)
+        store.put_transaction(req.network_identifier, req.block_identifier, req.transaction_identifier, resp.content)
+    return parse_response(BlockTransactionResponse, resp, session)
 
 
 
+@coalesced
 def get_mempool_transaction_ids(api_url : str, req : NetworkRequest, session : Optional[requests.Session] = None) -> MempoolResponse:
     """
     req: NetworkRequest
@@ -106,10 +187,11 @@ def get_mempool_transaction_ids(api_url : str, req : NetworkRequest, session : O
     ref: /mempool
     """
     url = urljoin(api_url, 'mempool')
-    resp = post_request(url, req.json(), session)
-    return MempoolResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(MempoolResponse, resp, session)
 
 
+@coalesced
 def get_mempool_transaction(api_url : str, req : MempoolTransactionRequest, session : Optional[requests.Session] = None) -> MempoolTransactionResponse:
     """
     req: MempoolTransactionRequest
@@ -117,5 +199,5 @@ def get_mempool_transaction(api_url : str, req : MempoolTransactionRequest, sess
     ref: /mempool/transaction
     """
     url = urljoin(api_url, 'mempool/transaction')
-    resp = post_request(url, req.json(), session)
-    return MempoolTransactionResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(MempoolTransactionResponse, resp, session)
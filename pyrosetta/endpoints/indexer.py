@@ -10,8 +10,11 @@ from ..models import (
     SearchTransactionsResponse
 )
 
-from ..utils.communication import post_request
+from ..utils.coalescing import coalesced
+from ..utils.codec import encode_request
+from ..utils.communication import parse_response, post_request
 
+@coalesced
 def get_range_of_block_events(api_url : str, req : EventsBlocksRequest, session : Optional[requests.Session] = None) -> EventsBlocksResponse:
     """
     req: EventsBlocksRequest
@@ -19,9 +22,10 @@ def get_range_of_block_events(api_url : str, req : EventsBlocksRequest, session
     ref: /events/blocks
     """
     url = urljoin(api_url, 'events/blocks')
-    resp = post_request(url, req.json(), session)
-    return EventsBlocksResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(EventsBlocksResponse, resp, session)
 
+@coalesced
 def search_for_transactions(api_url : str, req : SearchTransactionsRequest, session : Optional[requests.Session] = None) -> EventsBlocksResponse:
     """
     req: SearchTransactionsRequest
@@ -29,5 +33,5 @@ def search_for_transactions(api_url : str, req : SearchTransactionsRequest, sess
     ref: /search/transactions
     """
     url = urljoin(api_url, 'search/transactions')
-    resp = post_request(url, req.json(), session)
-    return SearchTransactionsResponse(**resp.json())
+    resp = post_request(url, encode_request(req), session)
+    return parse_response(SearchTransactionsResponse, resp, session)
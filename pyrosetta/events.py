@@ -1,17 +1,101 @@
-from typing import Optional
+import time
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
 
 import requests
 
 from .models import (
+    Block,
+    BlockEvent,
     EventsBlocksRequest,
     EventsBlocksResponse,
     NetworkIdentifier
 )
 
 from .endpoints.indexer import get_range_of_block_events
+from .utils.concurrency import ordered_map
+
+class ResolvedBlockEvent(NamedTuple):
+    """
+    A block event along with the block it added, see `RosettaAPI.iter_block_events`.
+
+    Attributes
+    ----------
+    event: BlockEvent
+        sequence: int
+        block_identifier: BlockIdentifier
+        type_: BlockEventType
+    block: Block, optional
+        The block added, None for a block_removed event.
+    """
+    event : BlockEvent
+    block : Optional[Block]
+
+class EventCursor(object):
+    """
+    How far a stream of block events has been read, and which pages are left
+    to request up to the highest sequence known, so that they can be requested
+    ahead of the consumer.
+
+    Nodes may return fewer events than the limit asked for. When a page comes
+    back short of the next one, the limit is lowered to what the node returned
+    and the remaining pages have to be planned again.
+    """
+
+    def __init__(self, offset : int = 0, limit : int = 100) -> None:
+        """
+        Parameters
+        ----------
+        offset: int
+            The sequence of the first event to read.
+        limit: int
+            The number of events asked for per page.
+        """
+        self.next_sequence = offset
+        self.max_sequence = offset - 1
+        self.limit = limit
+
+    @property
+    def caught_up(self) -> bool:
+        """
+        Whether every event known has been read.
+        """
+        return self.next_sequence > self.max_sequence
+
+    def offsets(self) -> Sequence[int]:
+        """
+        The offsets of the pages left to read, or of the next page to probe
+        for new events once caught up.
+        """
+        if self.caught_up:
+            return [self.next_sequence]
+        return range(self.next_sequence, self.max_sequence + 1, self.limit)
+
+    def take(self, offset : int, resp : EventsBlocksResponse) -> Tuple[List[BlockEvent], bool]:
+        """
+        Read a page requested at the offset.
+
+        Returns
+        -------
+        list[BlockEvent]
+            The events not read before.
+        bool
+            Whether the pages planned after it are still valid.
+        """
+        self.max_sequence = max(self.max_sequence, resp.max_sequence)
+        events = [event for event in resp.events if event.sequence >= self.next_sequence]
+        if events:
+            self.next_sequence = events[-1].sequence + 1
+        elif offset >= self.next_sequence:
+            # Nothing more is available yet, whatever max_sequence says.
+            self.max_sequence = self.next_sequence - 1
+            return events, False
+        if len(resp.events) < self.limit and self.next_sequence <= min(offset + self.limit - 1, self.max_sequence):
+            self.limit = max(len(resp.events), 1)
+            return events, False
+        return events, True
 
 def blocks(api_url : str, network_id : NetworkIdentifier, offset : Optional[int], limit : Optional[int], 
-           sesison : Optional[requests.Session] = None) -> EventsBlocksResponse:
+           session : Optional[requests.Session] = None) -> EventsBlocksResponse:
     """
     Query a sequence of BlockEvents indicating which blocks were added and removed from
     storage to reach the current state.
@@ -36,3 +120,62 @@ def blocks(api_url : str, network_id : NetworkIdentifier, offset : Optional[int]
     """
     req = EventsBlocksRequest(network_identifier=network_id, offset=offset, limit=limit)
     return get_range_of_block_events(api_url, req, session)
+
+def iter_pages(api_url : str, network_id : NetworkIdentifier, offset : int = 0, limit : int = 100, concurrency : int = 4,
+               poll_interval : Optional[float] = None, session : Optional[requests.Session] = None) -> Iterator[List[BlockEvent]]:
+    """
+    Stream the block events from an offset on, a page at a time, keeping up to
+    `concurrency` pages requested ahead of the consumer up to the highest
+    sequence the node reported.
+
+    Parameters
+    ----------
+    api_url: str
+    network_id: NetworkIdentifier
+    offset: int
+        The sequence of the first event. Defaults to 0, the beginning.
+    limit: int
+        The number of events asked for per page. Defaults to 100.
+    concurrency: int
+        The maximum number of pages in flight. Defaults to 4.
+    poll_interval: float, optional
+        Once every event has been read, how long to wait, in seconds, before
+        looking for new ones. Defaults to None, stopping instead.
+    session: requests.Session, optional
+
+    Yields
+    ------
+    list[BlockEvent]
+        The events in sequence order, never empty.
+    """
+    cursor = EventCursor(offset, limit)
+    while True:
+        probing = cursor.caught_up
+        limit = cursor.limit
+        pages = ordered_map(lambda page_offset: (page_offset, blocks(api_url, network_id, page_offset, limit, session)),
+                            cursor.offsets(), concurrency)
+        for page_offset, resp in pages:
+            events, planned = cursor.take(page_offset, resp)
+            if events:
+                yield events
+            if not planned:
+                break
+        if probing and cursor.caught_up:
+            if poll_interval is None:
+                return
+            time.sleep(poll_interval)
+
+def iter_events(api_url : str, network_id : NetworkIdentifier, offset : int = 0, limit : int = 100, concurrency : int = 4,
+                poll_interval : Optional[float] = None, session : Optional[requests.Session] = None) -> Iterator[BlockEvent]:
+    """
+    Stream the block events from an offset on, see `iter_pages`.
+
+    Yields
+    ------
+    BlockEvent
+        sequence: int
+        block_identifier: BlockIdentifier
+        type_: BlockEventType
+    """
+    for events in iter_pages(api_url, network_id, offset, limit, concurrency, poll_interval, session):
+        yield from events
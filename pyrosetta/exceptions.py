@@ -0,0 +1,78 @@
+from typing import Any, Optional
+
+from pydantic import ValidationError
+
+from .models import Error
+
+class RosettaError(Exception):
+    """
+    An error response from a Rosetta node, carrying the `Error` the
+    node returned.
+
+    Attributes
+    ----------
+    error: Error
+        code: int
+        message: str
+        description: str, optional
+        retriable: bool
+        details: dict[str, Any], optional
+    status_code: int
+        The HTTP status of the response.
+    url: str
+        The url the request was posted to.
+    """
+
+    def __init__(self, error : Error, status_code : int, url : str) -> None:
+        self.error = error
+        self.status_code = status_code
+        self.url = url
+        message = "{} {} from {}: {}".format(status_code, error.code, url, error.message)
+        if error.details:
+            message = "{} {}".format(message, error.details)
+        super().__init__(message)
+
+    @property
+    def retriable(self) -> bool:
+        """
+        Whether the node reported that the same request may succeed if submitted again.
+        """
+        return self.error.retriable
+
+    @classmethod
+    def from_body(cls, body : Any, status_code : int, url : str) -> Optional['RosettaError']:
+        """
+        Build the exception out of the decoded body of an error response.
+
+        Parameters
+        ----------
+        body: Any
+            The decoded json body.
+        status_code: int
+        url: str
+
+        Returns
+        -------
+        RosettaError, optional
+            None if the body isn't a Rosetta `Error`, ex: the response
+            came from a proxy in front of the node.
+        """
+        if not isinstance(body, dict):
+            return None
+        try:
+            error = Error(**body)
+        except ValidationError:
+            return None
+        return cls(error, status_code, url)
+
+class DeadlineExceeded(TimeoutError):
+    """
+    The deadline set around a call, see `utils.deadline`, passed
+    before the call could complete.
+    """
+
+class ReorgTooDeep(Exception):
+    """
+    The chain being followed reorganized deeper than the blocks kept
+    to detect reorgs, see `chain.Chain`.
+    """
@@ -1,4 +1,5 @@
 from ._models import *
+from ._construct import construct_model
+from ._lazy import LazyBlock, LazyTransactions, lazy_block_response
 from . import _views
 #from . import _overrides
-
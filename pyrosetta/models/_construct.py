@@ -0,0 +1,72 @@
+"""
+Build models from trusted json without running any validation.
+"""
+from inspect import isclass
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+
+M = TypeVar('M', bound=BaseModel)
+
+_plans : Dict[Type[BaseModel], List[Tuple[str, str, int, Any, Any]]] = {}
+
+def _plan(model : Type[BaseModel]) -> List[Tuple[str, str, int, Any, Any]]:
+    """
+    The (name, alias, shape, nested model, default) of every field of the
+    model, worked out once per model.
+    """
+    plan = _plans.get(model)
+    if plan is None:
+        plan = []
+        for name, field in model.__fields__.items():
+            type_ = field.type_
+            if not (isclass(type_) and issubclass(type_, BaseModel)):
+                type_ = None
+            plan.append((name, field.alias, field.shape, type_, field.default))
+        _plans[model] = plan
+    return plan
+
+def construct_model(model : Type[M], data : Any) -> M:
+    """
+    Recursively build `model` from decoded json the way `model.construct`
+    does, without validating or coercing anything. Nested models are built
+    too, so attribute access works the same as on a validated model.
+
+    Only use this on responses from a trusted node, malformed data will
+    surface as wrong values rather than a ValidationError.
+
+    Parameters
+    ----------
+    model: Type[BaseModel]
+    data: Any
+        The decoded json, keyed by the field aliases.
+
+    Returns
+    -------
+    An instance of `model`.
+    """
+    if '__root__' in model.__fields__:
+        return model.construct(__root__=data)
+    values = {}
+    fields_set = set()
+    for name, alias, shape, type_, default in _plan(model):
+        if alias in data:
+            value = data[alias]
+        elif name in data:
+            value = data[name]
+        else:
+            values[name] = default
+            continue
+        if type_ is not None and value is not None:
+            if shape == SHAPE_SINGLETON:
+                value = construct_model(type_, value)
+            elif shape == SHAPE_LIST:
+                value = [construct_model(type_, v) for v in value]
+        values[name] = value
+        fields_set.add(name)
+    # The same as BaseModel.construct, minus its per call default handling.
+    instance = model.__new__(model)
+    object.__setattr__(instance, '__dict__', values)
+    object.__setattr__(instance, '__fields_set__', fields_set)
+    return instance
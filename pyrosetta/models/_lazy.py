@@ -0,0 +1,151 @@
+"""
+Blocks whose transactions are only turned into models when they are used.
+"""
+from typing import Any, Dict, Iterable, Iterator
+
+from ._construct import construct_model
+from ._models import Block, BlockResponse, Transaction
+
+class LazyTransactions(list):
+    """
+    A list of Transaction that holds on to the raw json of each transaction,
+    and only builds its model the first time it is accessed or iterated over.
+    Once built, the model replaces the raw json.
+    """
+
+    def __init__(self, raw : Iterable[Any] = (), validate : bool = True) -> None:
+        """
+        Parameters
+        ----------
+        raw: Iterable[dict[str, Any] | Transaction]
+            The decoded json of the transactions.
+        validate: bool
+            Whether the transactions are validated when they are built.
+        """
+        super().__init__(raw)
+        self._validate = validate
+
+    def _load(self, index : int) -> Transaction:
+        item = list.__getitem__(self, index)
+        if isinstance(item, dict):
+            if self._validate:
+                item = Transaction(**item)
+            else:
+                item = construct_model(Transaction, item)
+            list.__setitem__(self, index, item)
+        return item
+
+    @property
+    def loaded(self) -> int:
+        """
+        The number of transactions that have been built so far.
+        """
+        return sum(1 for item in list.__iter__(self) if not isinstance(item, dict))
+
+    def raw(self, index : int) -> Any:
+        """
+        The transaction at the index without building its model, either
+        the decoded json or the Transaction if it's already been built.
+        """
+        return list.__getitem__(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._load(i) for i in range(*index.indices(len(self)))]
+        return self._load(index)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        for i in range(len(self)):
+            yield self._load(i)
+
+    def __reversed__(self) -> Iterator[Transaction]:
+        for i in reversed(range(len(self))):
+            yield self._load(i)
+
+    def __contains__(self, item) -> bool:
+        return any(transaction == item for transaction in self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, list) or len(self) != len(other):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def index(self, item, *args) -> int:
+        return list(self).index(item, *args)
+
+    def pop(self, index : int = -1) -> Transaction:
+        transaction = self._load(index)
+        list.pop(self, index)
+        return transaction
+
+    def copy(self) -> 'LazyTransactions':
+        return LazyTransactions(list.__iter__(self), self._validate)
+
+    def __repr__(self) -> str:
+        return "LazyTransactions({} transactions, {} loaded)".format(len(self), self.loaded)
+
+class LazyBlock(Block):
+    """
+    A Block whose header (block_identifier, parent_block_identifier, timestamp and
+    metadata) is built straight away, while its transactions are a LazyTransactions,
+    only built when they are accessed. This makes reading only the header of large
+    blocks, ex: for following the chain or detecting reorgs, much cheaper.
+    """
+
+    @classmethod
+    def from_json(cls, data : Dict[str, Any], validate : bool = True) -> 'LazyBlock':
+        """
+        Parameters
+        ----------
+        data: dict[str, Any]
+            The decoded json of the block.
+        validate: bool
+            Whether the header, and later each transaction, is validated.
+
+        Returns
+        -------
+        LazyBlock
+        """
+        header = {key: value for key, value in data.items() if key != 'transactions'}
+        if validate:
+            block = cls(transactions=[], **header)
+        else:
+            block = construct_model(cls, header)
+        block.transactions = LazyTransactions(data.get('transactions', []), validate)
+        return block
+
+    @classmethod
+    def _get_value(cls, v, *args, **kwargs):
+        # Export the transactions as a plain list, rather than rebuilding a
+        # LazyTransactions out of the exported dicts.
+        if isinstance(v, LazyTransactions):
+            v = list(v)
+        return super()._get_value(v, *args, **kwargs)
+
+def lazy_block_response(data : Dict[str, Any], validate : bool = True) -> BlockResponse:
+    """
+    Build a BlockResponse whose block is a LazyBlock.
+
+    Parameters
+    ----------
+    data: dict[str, Any]
+        The decoded json of the /block response.
+    validate: bool
+        Whether the response is validated.
+
+    Returns
+    -------
+    BlockResponse
+    """
+    block = data.get('block')
+    if block is not None:
+        block = LazyBlock.from_json(block, validate)
+    other_transactions = data.get('other_transactions')
+    if validate:
+        return BlockResponse(block=block, other_transactions=other_transactions)
+    response = construct_model(BlockResponse, {'other_transactions': other_transactions})
+    response.block = block
+    return response
@@ -0,0 +1,514 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, TypeVar
+from urllib.parse import urljoin
+
+import requests
+from pydantic import BaseModel
+
+from .models import (
+    AccountBalanceResponse,
+    AccountCoinsResponse,
+    AccountIdentifier,
+    BlockIdentifier,
+    BlockRequest,
+    BlockResponse,
+    BlockTransactionResponse,
+    Currency,
+    MempoolTransactionResponse,
+    NetworkIdentifier,
+    NetworkOptionsResponse,
+    NetworkRequest,
+    NetworkStatusResponse,
+    PartialBlockIdentifier,
+    Transaction,
+    TransactionIdentifier,
+    construct_model
+)
+
+from .api import RosettaAPI
+from .async_api import AsyncRosettaAPI
+from .exceptions import DeadlineExceeded, RosettaError
+from .utils.cache import BlockCache
+from .utils.codec import encode_request
+from .utils.concurrency import ordered_map
+from .utils.deadline import DEFAULT_TIMEOUT, Timeout
+from .utils.hedging import HedgePolicy, hedged
+from .utils.nodes import Node, NodePool
+from .utils.retry import DEFAULT_RETRY, RetryPolicy
+from .utils.store import BlockStore
+from .utils.throttle import Throttle
+from .utils import communication as comm
+from .utils import _async as comm_async
+
+from . import network as net
+from . import account as acnt
+from . import block as blk
+from . import mempool as memp
+
+R = TypeVar('R')
+
+def _network_key(network_id : NetworkIdentifier) -> bytes:
+    return encode_request(network_id)
+
+def _is_node_failure(error : Exception) -> bool:
+    """
+    Whether an error is the node's fault: it couldn't be reached, timed
+    out, or answered with a 5xx, a 429 or a retriable `Error`. A valid
+    answer to a bad request, ex: an unknown block or a 404, isn't, and
+    neither is the caller giving up once its deadline passed.
+    """
+    if isinstance(error, DeadlineExceeded):
+        return False
+    if isinstance(error, RosettaError):
+        return error.retriable
+    if isinstance(error, requests.HTTPError):
+        status = None if error.response is None else error.response.status_code
+    else:
+        # aiohttp.ClientResponseError
+        status = getattr(error, 'status', None)
+    if isinstance(status, int):
+        return status >= 500 or status == 429
+    return isinstance(error, _transport_errors())
+
+def _transport_errors():
+    errors = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, asyncio.TimeoutError)
+    try:
+        import aiohttp
+    except ImportError:
+        return errors
+    return errors + (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+def _record(pool : NodePool, node : Node, start : float, error : Optional[BaseException] = None) -> None:
+    """
+    Record the outcome of a request to a node. A request given up on because
+    the deadline of the caller passed, or cancelled, ex: the losing attempts
+    of a hedged read, says nothing of the node.
+    """
+    if isinstance(error, (DeadlineExceeded, asyncio.CancelledError)) or not isinstance(error, (Exception, type(None))):
+        pool.cancel(node)
+    elif error is not None and _is_node_failure(error):
+        pool.failure(node, start)
+    else:
+        pool.success(node, start)
+
+class MultiNodeRosettaAPI(RosettaAPI):
+    """
+    A RosettaAPI that spreads its requests across several nodes of the same
+    chain, see `utils.nodes.NodePool` for how nodes are picked, ejected and
+    re-admitted.
+
+    A request that fails because of its node, ie. a connection error, an HTTP
+    error or a retriable Rosetta `Error`, is tried again on another node until
+    every node has been tried. Block reads by height are only sent to nodes
+    whose /network/status tip has reached that height.
+    """
+
+    def __init__(self, api_urls : List[str], session : Optional[requests.Session] = None,
+                 pool_maxsize : int = 10, keep_alive : bool = True, prewarm : int = 0,
+                 validate : bool = True, lazy_blocks : bool = False,
+                 retry : Optional[RetryPolicy] = DEFAULT_RETRY, hedge : Optional[HedgePolicy] = None,
+                 coalesce : bool = False, throttle : Optional[Throttle] = None,
+                 timeout : Optional[Timeout] = DEFAULT_TIMEOUT, block_cache : Optional[BlockCache] = None,
+                 block_store : Optional[BlockStore] = None, indexed_blocks : int = 16, eject_after : int = 3,
+                 eject_for : float = 5.0, max_eject_for : float = 60.0, tip_ttl : float = 5.0) -> None:
+        """
+        Parameters
+        ----------
+        api_urls: list[str]
+            The urls where the nodes are located.
+        session: requests.Session, optional
+            An already existing requests sesion, shared by all the nodes. If
+            none is passed a session will be created for this object.
+        pool_maxsize: int
+            The maximum number of connections the created session keeps open
+            to each node. Defaults to 10. Ignored when a session is passed.
+        keep_alive: bool
+            Whether the created session reuses its connections across requests.
+            Defaults to True. Ignored when a session is passed.
+        prewarm: int
+            The number of connections to open to each node up front. Defaults to 0.
+        validate: bool
+            Whether responses are validated into their models. Defaults to True.
+            Ignored when a session is passed.
+        lazy_blocks: bool
+            Whether the blocks returned are LazyBlocks. Defaults to False.
+            Ignored when a session is passed.
+        retry: RetryPolicy, optional
+            When and how failed requests are retried on the same node, before
+            moving on to another one. Ignored when a session is passed.
+        hedge: HedgePolicy, optional
+            Opt-in hedging of slow read-only requests, which are sent again to
+            another node. Defaults to None, no hedging.
+        coalesce: bool
+            Whether identical read requests made concurrently to the same node
+            share one call. Defaults to False. Ignored when a session is passed.
+        throttle: Throttle, optional
+            Limits the rate and the concurrency of the requests to all the nodes
+            together. Defaults to None. Ignored when a session is passed.
+        timeout: float | tuple[float, float], optional
+            The (connect, read) timeout of every request. Defaults to (10, 60).
+            Ignored when a session is passed.
+        block_cache: BlockCache, optional
+            Keeps recent /block responses, whichever node they came from.
+            Defaults to None, no caching.
+        block_store: BlockStore, optional
+            Persists final blocks on disk. Defaults to None. Ignored when a
+            session is passed.
+        indexed_blocks: int
+            How many of the blocks fetched last have their transactions
+            indexed. Defaults to 16.
+        eject_after: int
+            The number of failures in a row that eject a node. Defaults to 3.
+        eject_for: float
+            How long, in seconds, a node is first ejected for. Defaults to 5.
+        max_eject_for: float
+            The longest, in seconds, a node is ejected for. Defaults to 60.
+        tip_ttl: float
+            How long, in seconds, the tip of a node is trusted before it is
+            checked again. Defaults to 5.
+
+        Raises
+        ------
+        ValueError: If no url is given.
+        """
+        self._pool = NodePool(api_urls, eject_after, eject_for, max_eject_for, tip_ttl)
+        # Hedges go to another node, rather than another connection to the same one.
+        super().__init__(api_urls[0], session, len(api_urls), pool_maxsize, keep_alive,
+                         0, validate, lazy_blocks, retry, None, coalesce, throttle, timeout, block_cache, block_store, indexed_blocks)
+        self._hedge = hedge
+        if prewarm > 0:
+            self.prewarm(prewarm)
+
+    @property
+    def nodes(self) -> NodePool:
+        return self._pool
+
+    @property
+    def url(self) -> str:
+        """
+        The url of the node the next request would most likely go to.
+        """
+        return self._pool.choose(self._pool.candidates()).url
+
+    def health(self) -> Dict[str, Dict[str, float]]:
+        """
+        A snapshot of the health of every node, keyed by url.
+
+        Returns
+        -------
+        dict[str, dict[str, float]]
+            latency: float
+                Moving average of the duration of successful requests, in seconds.
+            error_rate: float
+                Moving average of the share of failed requests.
+            in_flight: int
+            ejected: bool
+        """
+        return self._pool.health()
+
+    def prewarm(self, connections : int) -> None:
+        """
+        Open connections to every node ahead of time.
+
+        Parameters
+        ----------
+        connections: int
+            The number of connections to open to each node.
+        """
+        for node in self._pool.nodes:
+            comm.prewarm(node.url, connections, self.session)
+
+    def _call(self, node : Node, call : Callable[[str], R]) -> R:
+        """
+        Make a call to a single node, recording its outcome.
+        """
+        start = self._pool.begin(node)
+        try:
+            result = call(node.url)
+        except BaseException as e:
+            _record(self._pool, node, start, e)
+            raise
+        self._pool.success(node, start)
+        return result
+
+    def _refresh_tips(self, network_id : NetworkIdentifier, nodes : List[Node]) -> None:
+        def _refresh(node):
+            try:
+                self._call(node, lambda url: self._node_status(url, network_id))
+            except (requests.RequestException, RosettaError):
+                pass
+
+        for _ in ordered_map(_refresh, nodes, len(nodes) or 1):
+            pass
+
+    def _node_status(self, url : str, network_id : NetworkIdentifier, **kwargs) -> NetworkStatusResponse:
+        status = net.status(url, network_id, self.session, **kwargs)
+        self._pool.set_tip(url, _network_key(network_id), status.current_block_identifier.index)
+        if self._block_cache is not None:
+            self._block_cache.observe_tip(network_id, status.current_block_identifier.index)
+        return status
+
+    def _select(self, tried : List[Node], network_id : Optional[NetworkIdentifier] = None, height : Optional[int] = None) -> Node:
+        """
+        Pick the node for the next attempt of a request.
+        """
+        nodes = self._pool.candidates(tried) or self._pool.candidates()
+        if height is None or network_id is None:
+            return self._pool.choose(nodes)
+        key = _network_key(network_id)
+        covering = self._pool.covering(nodes, key, height)
+        if not covering:
+            self._refresh_tips(network_id, self._pool.stale(nodes, key))
+            # If no node has reached the height, the highest one answers
+            # the request the same way a single node would.
+            covering = self._pool.covering(nodes, key, height) or [self._pool.highest(nodes, key)]
+        return self._pool.choose(covering)
+
+    def _route(self, call : Callable[[str], R], network_id : Optional[NetworkIdentifier] = None,
+               height : Optional[int] = None, endpoint : Optional[str] = None) -> R:
+        """
+        Make the call on the best node for it, moving on to the next node
+        whenever it fails because of the node, and hedging it on another
+        node if it is a slow read.
+
+        Parameters
+        ----------
+        call: Callable[[str], R]
+            Makes the request given the url of a node.
+        network_id: NetworkIdentifier, optional
+        height: int, optional
+            The height the node needs to have reached.
+        endpoint: str, optional
+            The endpoint of the request, ex: 'block', for hedging.
+        """
+        tried = []
+        if self._hedge is None or endpoint not in self._hedge.endpoints:
+            return self._failover(call, network_id, height, tried)
+        # The hedges share the nodes already tried, so each goes to a different node.
+        return hedged(lambda: self._failover(call, network_id, height, tried), 1 + self._hedge.max_hedges,
+                      self._hedge.delay(endpoint), observe=lambda latency: self._hedge.observe(endpoint, latency))
+
+    def _failover(self, call : Callable[[str], R], network_id : Optional[NetworkIdentifier], height : Optional[int], tried : List[Node]) -> R:
+        while True:
+            node = self._select(tried, network_id, height)
+            tried.append(node)
+            try:
+                return self._call(node, call)
+            except (requests.RequestException, RosettaError) as e:
+                if not _is_node_failure(e) or len(tried) >= len(self._pool.nodes):
+                    raise
+
+    def list_supported_networks(self, **kwargs) -> List[NetworkIdentifier]:
+        return self._route(lambda url: net.list_supported(url, self.session, **kwargs))
+
+    def _network_status(self, network_id : NetworkIdentifier, **kwargs) -> NetworkStatusResponse:
+        return self._route(lambda url: self._node_status(url, network_id, **kwargs), endpoint='network/status')
+
+    def _network_supported_options(self, network_id : NetworkIdentifier, **kwargs) -> NetworkOptionsResponse:
+        return self._route(lambda url: net.supported_options(url, network_id, self.session, **kwargs))
+
+    def _balance(self, network_id : NetworkIdentifier, account_id : AccountIdentifier,
+                 block_id : Optional[PartialBlockIdentifier] = None, currencies : Optional[List[Currency]] = None) -> AccountBalanceResponse:
+        height = None if block_id is None else block_id.index
+        return self._route(lambda url: acnt.balance(url, network_id, account_id, block_id, currencies, self.session), network_id, height, 'account/balance')
+
+    def _unspent_coins(self, network_id : NetworkIdentifier, account_id : AccountIdentifier, include_mempool : Optional[bool] = False, currencies : Optional[List[Currency]] = None) -> AccountCoinsResponse:
+        return self._route(lambda url: acnt.unspent_coins(url, network_id, account_id, include_mempool, currencies, self.session))
+
+    def _block(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> BlockResponse:
+        def _fetch():
+            # A stored block needs no node, nor the tips of the nodes to pick one.
+            stored = blk.stored_block(network_id, block_id, self.session)
+            if stored is not None:
+                return stored
+            return self._route(lambda url: blk.block(url, network_id, block_id, self.session), network_id, block_id.index, 'block')
+
+        return self._cached_block(network_id, block_id, _fetch)
+
+    def _iter_block_transactions(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> Iterator[Transaction]:
+        # The transactions are streamed, so the request can't move on to
+        # another node once it started yielding.
+        node = self._select([], network_id, block_id.index)
+        start = self._pool.begin(node)
+        try:
+            yield from blk.iter_transactions(node.url, network_id, block_id, self.session)
+        except GeneratorExit:
+            self._pool.success(node, start)
+            raise
+        except BaseException as e:
+            _record(self._pool, node, start, e)
+            raise
+        self._pool.success(node, start)
+
+    def _block_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, transaction_id : TransactionIdentifier) -> Transaction:
+        return self._indexed_transaction(network_id, block_id, transaction_id,
+                                         lambda: self._route(lambda url: blk.transaction(url, network_id, block_id, transaction_id, self.session),
+                                                             network_id, block_id.index, 'block/transaction'))
+
+    def _all_mempool_transactions(self, network_id : NetworkIdentifier, **kwargs) -> List[TransactionIdentifier]:
+        return self._route(lambda url: memp.all_transactions(url, network_id, self.session, **kwargs))
+
+    def _mempool_transaction(self, network_id : NetworkIdentifier, transaction_id : TransactionIdentifier) -> MempoolTransactionResponse:
+        return self._route(lambda url: memp.transaction(url, network_id, transaction_id, self.session))
+
+    def discover_networks(self, network_metadata : Optional[Dict[str, Any]] = None, concurrency : int = 8, **kwargs) -> List[net.NetworkOverview]:
+        return self._route(lambda url: net.discover(url, self.session, network_metadata, concurrency, **kwargs))
+
+class AsyncMultiNodeRosettaAPI(AsyncRosettaAPI):
+    """
+    The asyncio version of MultiNodeRosettaAPI, see its documentation.
+    """
+
+    def __init__(self, api_urls : List[str], session = None, max_connections : int = 100,
+                 max_connections_per_host : int = 0, keep_alive : bool = True, prewarm : int = 0,
+                 validate : bool = True, lazy_blocks : bool = False, retry : Optional[RetryPolicy] = DEFAULT_RETRY,
+                 hedge : Optional[HedgePolicy] = None, coalesce : bool = False, throttle : Optional[Throttle] = None,
+                 timeout : Optional[Timeout] = DEFAULT_TIMEOUT, block_cache : Optional[BlockCache] = None,
+                 block_store : Optional[BlockStore] = None, indexed_blocks : int = 16, eject_after : int = 3,
+                 eject_for : float = 5.0, max_eject_for : float = 60.0, tip_ttl : float = 5.0) -> None:
+        """
+        Parameters
+        ----------
+        api_urls: list[str]
+            The urls where the nodes are located.
+
+        See AsyncRosettaAPI and MultiNodeRosettaAPI for the other parameters.
+        `prewarm` is the number of connections opened to each node.
+        """
+        self._pool = NodePool(api_urls, eject_after, eject_for, max_eject_for, tip_ttl)
+        super().__init__(api_urls[0], session, max_connections, max_connections_per_host, keep_alive,
+                         0, validate, lazy_blocks, retry, hedge, coalesce, throttle, timeout, block_cache, block_store, indexed_blocks)
+        self._prewarm_connections = prewarm
+
+    @property
+    def nodes(self) -> NodePool:
+        return self._pool
+
+    @property
+    def url(self) -> str:
+        """
+        The url of the node the next request would most likely go to.
+        """
+        return self._pool.choose(self._pool.candidates()).url
+
+    def health(self) -> Dict[str, Dict[str, float]]:
+        """
+        A snapshot of the health of every node, keyed by url. See `MultiNodeRosettaAPI.health`.
+        """
+        return self._pool.health()
+
+    async def _get_session(self):
+        if self._session is None:
+            connections, self._prewarm_connections = self._prewarm_connections, 0
+            await super()._get_session()
+            if connections > 0:
+                await self.prewarm(connections)
+        return self._session
+
+    async def prewarm(self, connections : int) -> None:
+        """
+        Open connections to every node ahead of time.
+
+        Parameters
+        ----------
+        connections: int
+            The number of connections to open to each node.
+        """
+        session = await self._get_session()
+        for node in self._pool.nodes:
+            await comm_async.prewarm(node.url, connections, session)
+
+    async def _call(self, node : Node, path : str, req : BaseModel) -> Dict[str, Any]:
+        start = self._pool.begin(node)
+        try:
+            resp = await self._post_node(node.url, path, req)
+        except BaseException as e:
+            _record(self._pool, node, start, e)
+            raise
+        self._pool.success(node, start)
+        if path == 'network/status':
+            self._pool.set_tip(node.url, _network_key(req.network_identifier), resp['current_block_identifier']['index'])
+        return resp
+
+    async def _post_node(self, url : str, path : str, req : BaseModel) -> Dict[str, Any]:
+        session = await self._get_session()
+        return await comm_async.post_request(urljoin(url, path), encode_request(req), session, self._retry, self._throttle, self._timeout)
+
+    async def _refresh_tips(self, network_id : NetworkIdentifier, nodes : List[Node]) -> None:
+        async def _refresh(node):
+            try:
+                await self._call(node, 'network/status', NetworkRequest(network_identifier=network_id))
+            except _request_errors():
+                pass
+
+        await asyncio.gather(*[_refresh(node) for node in nodes])
+
+    async def _select(self, tried : List[Node], network_id : Optional[NetworkIdentifier] = None, height : Optional[int] = None) -> Node:
+        nodes = self._pool.candidates(tried) or self._pool.candidates()
+        if height is None or network_id is None:
+            return self._pool.choose(nodes)
+        key = _network_key(network_id)
+        covering = self._pool.covering(nodes, key, height)
+        if not covering:
+            await self._refresh_tips(network_id, self._pool.stale(nodes, key))
+            covering = self._pool.covering(nodes, key, height) or [self._pool.highest(nodes, key)]
+        return self._pool.choose(covering)
+
+    async def _post_json(self, path : str, req : BaseModel) -> Dict[str, Any]:
+        network_id, height = _route_of(req)
+        tried = []
+        if self._hedge is None or path not in self._hedge.endpoints:
+            return await self._failover(path, req, network_id, height, tried)
+        return await comm_async.hedged(lambda: self._failover(path, req, network_id, height, tried), 1 + self._hedge.max_hedges,
+                                       self._hedge.delay(path), lambda latency: self._hedge.observe(path, latency))
+
+    async def _failover(self, path : str, req : BaseModel, network_id : Optional[NetworkIdentifier], height : Optional[int], tried : List[Node]) -> Dict[str, Any]:
+        while True:
+            node = await self._select(tried, network_id, height)
+            tried.append(node)
+            try:
+                return await self._call(node, path, req)
+            except _request_errors() as e:
+                if not _is_node_failure(e) or len(tried) >= len(self._pool.nodes):
+                    raise
+
+    async def _iter_block_transactions(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> AsyncIterator[Transaction]:
+        if self._block_store is not None and self._block_store.get_block(network_id, block_id) is not None:
+            async for transaction in super()._iter_block_transactions(network_id, block_id):
+                yield transaction
+            return
+        # The transactions are streamed, so the request can't move on to
+        # another node once it started yielding.
+        node = await self._select([], network_id, block_id.index)
+        req = BlockRequest(network_identifier=network_id, block_identifier=block_id)
+        session = await self._get_session()
+        start = self._pool.begin(node)
+        error = None
+        try:
+            async for data in comm_async.stream_json_array(urljoin(node.url, 'block'), encode_request(req), session,
+                                                           ('block', 'transactions'), self._retry, self._throttle,
+                                                           timeout=self._timeout):
+                if self._validate:
+                    yield Transaction(**data)
+                else:
+                    yield construct_model(Transaction, data)
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _record(self._pool, node, start, error)
+
+def _request_errors():
+    import aiohttp
+
+    return (aiohttp.ClientError, asyncio.TimeoutError, RosettaError)
+
+def _route_of(req : BaseModel):
+    """
+    The network and the height a node needs to have reached to answer the request.
+    """
+    block_id = getattr(req, 'block_identifier', None)
+    height = None if block_id is None else block_id.index
+    return getattr(req, 'network_identifier', None), height
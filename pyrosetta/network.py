@@ -22,6 +22,7 @@ from .endpoints.data import (
     get_available_networks,
     
 )
+from .utils.concurrency import ordered_map
 
 class NetworkOverview(NamedTuple):
     network : NetworkIdentifier
@@ -33,10 +34,12 @@ class NetworkOverview(NamedTuple):
         opts = "Implementation Details:\n{}\n".format(self.options)
         status = "Status:\n{}".format(self.status)
 
-def discover(api_url : str, session : Optional[requests.Session] = None, network_metadata : Optional[Dict[str, Any]] = None, **kwargs) -> List[NetworkOverview]:
+def discover(api_url : str, session : Optional[requests.Session] = None, network_metadata : Optional[Dict[str, Any]] = None,
+             concurrency : int = 8, **kwargs) -> List[NetworkOverview]:
     """
     Discover the availble networks supported by the Rosetta server
-    at the api_url and any information about them.
+    at the api_url and any information about them. The /network/options
+    and /network/status requests of all the networks are made concurrently.
 
     NOTE: If /network/options and /network/status need additional but different
     metadata, this will not work.
@@ -47,12 +50,15 @@ def discover(api_url : str, session : Optional[requests.Session] = None, network
         The url to the node's api.
     session : requests.Session, optional
         The persistent requests session to use. If none is
-        provided, a new session will be created for the single
-        request.
+        provided, a pooled session shared by the whole process
+        is used.
     network_metadata: dict[str, Any], optional:
         Any additional metadata to be passed along to the /network/options
         and /network/status routes. See the individual node implementation
         to verify if additional metadata is needed.
+    concurrency: int
+        The maximum number of requests in flight at once. Defaults to 8,
+        keep it within the connection pool of the session.
     **kwargs
         Any additional metadata to be passed along to the /network/list request. 
         See the individual node implementation to verify if additional
@@ -65,13 +71,14 @@ def discover(api_url : str, session : Optional[requests.Session] = None, network
         options: NetworkOptionsResponse
         status: NetworkStatusRespone
     """
-    nws = []
+    if network_metadata is None:
+        network_metadata = {}
     network_ids = list_supported(api_url, session, **kwargs)
-    for network_id in network_ids:
-        opts = supported_options(api_url, network_id, session)
-        status = status(api_url, network_id, session)
-        nws.append(NetworkOverview(network_id, opts, status))
-    return nws
+    calls = [(call, network_id) for network_id in network_ids for call in (supported_options, status)]
+    results = ordered_map(lambda c: c[0](api_url, c[1], session, **network_metadata), calls, concurrency)
+    # The results come in the order of the calls: each network takes
+    # the next two, its options then its status.
+    return [NetworkOverview(network_id, opts, nw_status) for network_id, opts, nw_status in zip(network_ids, results, results)]
 
 def list_supported(api_url : str, session : Optional[requests.Session] = None, **kwargs) -> List[NetworkIdentifier]:
     """
@@ -83,8 +90,8 @@ def list_supported(api_url : str, session : Optional[requests.Session] = None, *
         The url to the node's api.
     session : requests.Session, optional
         The persistent requests session to use. If none is
-        provided, a new session will be created for the single
-        request.
+        provided, a pooled session shared by the whole process
+        is used.
     **kwargs
         Any additional metadata to be passed along to the /network/list request. 
         See the individual node implementation to verify if additional
@@ -111,8 +118,8 @@ def supported_options(api_url : str, network_identifier : NetworkIdentifier, ses
     network_identifier: NetworkIdentifier
     session : requests.Session, optional
         The persistent requests session to use. If none is
-        provided, a new session will be created for the single
-        request.
+        provided, a pooled session shared by the whole process
+        is used.
     **kwargs
         Any additional metadata to be passed along to the /network/options request. 
         See the individual node implementation to verify if additional
@@ -138,8 +145,8 @@ def status(api_url : str, network_identifier : NetworkIdentifier, session : Opti
     network_identifier: NetworkIdentifier
     session : requests.Session, optional
         The persistent requests session to use. If none is
-        provided, a new session will be created for the single
-        request.
+        provided, a pooled session shared by the whole process
+        is used.
     **kwargs
         Any additional metadata to be passed along to the /network/status request. 
         See the individual node implementation to verify if additional
@@ -1,9 +1,10 @@
-from typing import Optional
+from typing import Iterator, Optional, Sequence
 
 import requests
 
 from .models import (
     AccountIdentifier,
+    BlockTransaction,
     CoinIdentifier,
     Currency,
     Operator,
@@ -14,13 +15,14 @@ from .models import (
 )
 
 from .endpoints.indexer import search_for_transactions
+from .utils.concurrency import ordered_map
 
 def transactions(api_url : str, network_id : NetworkIdentifier, operator : Optional[Operator] = "and",
                  max_block : Optional[int] = None, offset : Optional[int] = None, limit : Optional[int] = None,
                  transaction_id : Optional[TransactionIdentifier] = None, account_id : Optional[AccountIdentifier] = None,
                  coin_id : Optional[CoinIdentifier] = None, currency : Optional[Currency] = None,
                  status : Optional[str] = None, type_ : Optional[str] = None, address : Optional[str] = None,
-                 success : Optional[bool] = None, sesion : Optional[requests.Session] = None) -> SearchTransactionsResponse:
+                 success : Optional[bool] = None, session : Optional[requests.Session] = None) -> SearchTransactionsResponse:
     """
     Search for transactions that match given conditions.
 
@@ -70,3 +72,71 @@ def transactions(api_url : str, network_id : NetworkIdentifier, operator : Optio
                                     account_identifier=account_id, coin_identifier=coin_id, currency=currency,
                                     status=status, type=type_, address=address, success=success)
     return search_for_transactions(api_url, req, session)
+
+def iter_transactions(api_url : str, network_id : NetworkIdentifier, operator : Optional[Operator] = "and",
+                      max_block : Optional[int] = None, offset : Optional[int] = None, limit : Optional[int] = None,
+                      transaction_id : Optional[TransactionIdentifier] = None, account_id : Optional[AccountIdentifier] = None,
+                      coin_id : Optional[CoinIdentifier] = None, currency : Optional[Currency] = None,
+                      status : Optional[str] = None, type_ : Optional[str] = None, address : Optional[str] = None,
+                      success : Optional[bool] = None, concurrency : int = 4,
+                      session : Optional[requests.Session] = None) -> Iterator[BlockTransaction]:
+    """
+    Stream every transaction that matches the conditions, following `next_offset`
+    across pages. When the offsets are predictable, the next offset of a page being
+    its offset plus its number of transactions, the pages left up to `total_count`
+    are requested ahead, keeping at most `concurrency` of them in flight.
+
+    Pass `max_block`, ex: the current tip, so that blocks added meanwhile
+    can't shift the results between pages.
+
+    Parameters
+    ----------
+    concurrency: int
+        The maximum number of pages in flight. Defaults to 4, 1 follows
+        `next_offset` one page at a time.
+
+    See `transactions` for the other parameters.
+
+    Yields
+    ------
+    BlockTransaction
+        block_identifier: BlockIdentifier
+        transaction: Transaction
+    """
+    req = SearchTransactionsRequest(network_identifier=network_id, operator=operator, max_block=max_block,
+                                    offset=offset, limit=limit, transaction_identifier=transaction_id,
+                                    account_identifier=account_id, coin_identifier=coin_id, currency=currency,
+                                    status=status, type=type_, address=address, success=success)
+
+    def _page(page_offset):
+        return page_offset, search_for_transactions(api_url, req.copy(update={'offset': page_offset}), session)
+
+    page_offset, resp = _page(offset or 0)
+    while True:
+        offsets = planned_offsets(page_offset, resp)
+        yield from resp.transactions
+        if resp.next_offset is None:
+            return
+        if offsets is None or concurrency <= 1:
+            page_offset, resp = _page(resp.next_offset)
+            continue
+        for page_offset, resp in ordered_map(_page, offsets, concurrency):
+            if page_offset == offsets[-1] or resp.next_offset != page_offset + offsets.step:
+                # The last page planned, or one that didn't go as planned,
+                # the pages left are worked out from it.
+                break
+            yield from resp.transactions
+
+def planned_offsets(offset : int, resp : SearchTransactionsResponse) -> Optional[Sequence[int]]:
+    """
+    The offsets of the pages left after the page read at the offset, if they
+    can be predicted from it, up to `total_count`.
+
+    Returns
+    -------
+    range, optional
+    """
+    page = len(resp.transactions)
+    if resp.next_offset is None or page == 0 or resp.next_offset != offset + page:
+        return None
+    return range(resp.next_offset, max(resp.total_count, resp.next_offset + 1), page)
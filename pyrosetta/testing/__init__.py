@@ -0,0 +1,2 @@
+from .chain import SyntheticChain
+from .server import StandInServer
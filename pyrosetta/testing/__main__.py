@@ -0,0 +1,42 @@
+"""
+Serve a synthetic chain until interrupted, to point other tools at.
+
+    $ python -m pyrosetta.testing --height 100000 --transactions 200 --latency 0.01 --reorg-every 50
+"""
+import argparse
+import time
+
+from .chain import SyntheticChain
+from .server import StandInServer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--height', type=int, default=1000)
+    parser.add_argument('--transactions', type=int, default=10)
+    parser.add_argument('--operations', type=int, default=2)
+    parser.add_argument('--padding', type=int, default=0)
+    parser.add_argument('--other-transactions', type=int, default=0)
+    parser.add_argument('--accounts', type=int, default=1000)
+    parser.add_argument('--reorg-every', type=int, default=0)
+    parser.add_argument('--reorg-depth', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--block-interval', type=float, default=None)
+    args = parser.parse_args()
+
+    chain = SyntheticChain(height=args.height, transactions=args.transactions, operations=args.operations,
+                           padding=args.padding, other_transactions=args.other_transactions, accounts=args.accounts,
+                           reorg_every=args.reorg_every, reorg_depth=args.reorg_depth, seed=args.seed)
+    with StandInServer(chain, args.host, args.port, args.latency, args.jitter, args.block_interval) as server:
+        print("Serving {} at {}".format(chain.network_identifier, server.url))
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == '__main__':
+    main()
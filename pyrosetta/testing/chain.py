@@ -0,0 +1,412 @@
+"""
+A deterministic, synthetic chain to serve from the stand-in server.
+
+Blocks are generated on demand from the seed, their height and the fork they
+are on, so chains of millions of blocks cost no memory. Hashes encode the
+height and the fork, which lets orphaned blocks be looked up by hash as well.
+"""
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+GENESIS_TIMESTAMP = 1600000000000
+
+def _digest(*parts : Any) -> str:
+    return hashlib.sha256(':'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+class SyntheticChain(object):
+    """
+    A chain of blocks of `transactions` transactions of `operations` transfer
+    operations each, between `accounts` accounts. Every field of a block is a
+    function of the seed, its height and its fork: two chains built with the
+    same parameters serve the very same json.
+
+    The chain grows with `advance`, and reorgs with `reorg`, or every
+    `reorg_every` blocks on its own. Every change is recorded as block events,
+    for /events/blocks. It can be read by many threads while one advances it.
+    """
+
+    def __init__(self, height : int = 1000, transactions : int = 10, operations : int = 2, padding : int = 0,
+                 other_transactions : int = 0, accounts : int = 1000, reorg_every : int = 0, reorg_depth : int = 2,
+                 seed : int = 0, blockchain : str = 'synthetic', network : str = 'testnet',
+                 block_time : int = 1000, mempool : int = 5) -> None:
+        """
+        Parameters
+        ----------
+        height: int
+            The index of the tip to start with. Defaults to 1000.
+        transactions: int
+            The number of transactions per block. Defaults to 10.
+        operations: int
+            The number of operations per transaction. Defaults to 2.
+        padding: int
+            The number of bytes of filler metadata per transaction, to reach
+            a given block size. Defaults to 0.
+        other_transactions: int
+            How many of the transactions of each block are only listed in
+            `other_transactions`, to be fetched with /block/transaction. Defaults to 0.
+        accounts: int
+            The number of accounts the transfers are between. Defaults to 1000.
+        reorg_every: int
+            Reorg the tip every that many blocks added by `advance`. Defaults to 0, never.
+        reorg_depth: int
+            The number of blocks replaced by those reorgs. Defaults to 2.
+        seed: int
+            Defaults to 0.
+        blockchain: str
+        network: str
+            The network identifier served. Defaults to synthetic / testnet.
+        block_time: int
+            The milliseconds between the timestamps of two blocks. Defaults to 1000.
+        mempool: int
+            The number of transactions in the mempool. Defaults to 5.
+        """
+        self.transactions = transactions
+        self.operations = operations
+        self.padding = padding
+        self.other_transactions = min(other_transactions, transactions)
+        self.accounts = max(accounts, 1)
+        self.reorg_every = reorg_every
+        self.reorg_depth = reorg_depth
+        self.seed = seed
+        self.network_identifier = {'blockchain': blockchain, 'network': network}
+        self.block_time = block_time
+        self.mempool_size = mempool
+        self.height = height
+        self._added = 0
+        # The fork of each height not on fork 0, and for each fork, the height
+        # it starts at, the fork it branched off from and the height it reached.
+        self._canonical : Dict[int, int] = {}
+        self._branches : List[List[int]] = [[0, 0, height]]
+        # The block events after the initial ones, which are the blocks
+        # of fork 0 up to the initial height.
+        self._initial_events = height + 1
+        self._events : List[Tuple[str, int, int]] = []
+        self._lock = threading.Lock()
+
+    # Identifiers
+
+    def _hash(self, index : int, fork : int) -> str:
+        return '{:08x}{:04x}{}'.format(index, fork, _digest(self.seed, index, fork)[:52])
+
+    @staticmethod
+    def _parse_hash(hash_ : str) -> Optional[Tuple[int, int]]:
+        try:
+            return int(hash_[:8], 16), int(hash_[8:12], 16)
+        except ValueError:
+            return None
+
+    def _fork_at(self, index : int) -> int:
+        return self._canonical.get(index, 0)
+
+    def _block_id(self, index : int, fork : int) -> Dict[str, Any]:
+        return {'index': index, 'hash': self._hash(index, fork)}
+
+    def _parent(self, index : int, fork : int) -> Tuple[int, int]:
+        if index == 0:
+            return 0, fork
+        while fork != 0 and index - 1 < self._branches[fork][0]:
+            fork = self._branches[fork][1]
+        return index - 1, fork
+
+    def _exists(self, index : int, fork : int) -> bool:
+        """
+        Whether the block is or was part of the chain.
+        """
+        if fork >= len(self._branches):
+            return False
+        start, _, end = self._branches[fork]
+        return start <= index <= end
+
+    def block_identifier(self, index : Optional[int] = None, hash_ : Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        The identifier of a block of the chain, by index, hash or both, None if there's none.
+        """
+        with self._lock:
+            found = self._locate(index, hash_)
+            return None if found is None else self._block_id(*found)
+
+    def _locate(self, index : Optional[int], hash_ : Optional[str]) -> Optional[Tuple[int, int]]:
+        if hash_ is not None:
+            found = self._parse_hash(hash_)
+            if found is None or (index is not None and found[0] != index):
+                return None
+            if self._hash(*found) != hash_ or not self._exists(*found):
+                return None
+            return found
+        if index is None:
+            index = self.height
+        if index < 0 or index > self.height:
+            return None
+        return index, self._fork_at(index)
+
+    # Blocks and transactions
+
+    def block(self, index : Optional[int] = None, hash_ : Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        The json of a /block response, by index, hash or both, or of the tip
+        if neither is given. None if the chain has no such block.
+        """
+        with self._lock:
+            found = self._locate(index, hash_)
+            if found is None:
+                return None
+            index, fork = found
+            parent = self._parent(index, fork)
+        transactions = [self._transaction(index, fork, i) for i in range(self.transactions)]
+        inlined = self.transactions - self.other_transactions
+        resp = {
+            'block': {
+                'block_identifier': self._block_id(index, fork),
+                'parent_block_identifier': self._block_id(*parent),
+                'timestamp': GENESIS_TIMESTAMP + index * self.block_time,
+                'transactions': transactions[:inlined]
+            }
+        }
+        if self.other_transactions:
+            resp['other_transactions'] = [transaction['transaction_identifier'] for transaction in transactions[inlined:]]
+        return resp
+
+    def address(self, account : int) -> str:
+        """
+        The address of the account of the given number.
+        """
+        return '0x{:040x}'.format(account % self.accounts)
+
+    def _account_number(self, address : str) -> Optional[int]:
+        try:
+            account = int(address, 16)
+        except ValueError:
+            return None
+        return account if 0 <= account < self.accounts and self.address(account) == address else None
+
+    def _transaction_hash(self, index : int, fork : int, position : int) -> str:
+        return '{:08x}{:04x}{:04x}{}'.format(index, fork, position, _digest(self.seed, 'tx', index, fork, position)[:48])
+
+    def _transaction(self, index : int, fork : int, position : int) -> Dict[str, Any]:
+        serial = index * self.transactions + position
+        operations = []
+        for o in range(self.operations):
+            value = (serial * 7919 + o // 2) % 1000000 + 1
+            operations.append({
+                'operation_identifier': {'index': o},
+                'type': 'TRANSFER',
+                'status': 'SUCCESS',
+                'account': {'address': self.address(serial + o % 2)},
+                'amount': {'value': str(-value if o % 2 == 0 else value), 'currency': {'symbol': 'SYN', 'decimals': 18}}
+            })
+        transaction = {
+            'transaction_identifier': {'hash': self._transaction_hash(index, fork, position)},
+            'operations': operations
+        }
+        if self.padding:
+            transaction['metadata'] = {'padding': 'f' * self.padding}
+        return transaction
+
+    def transaction(self, block_id : Dict[str, Any], hash_ : str) -> Optional[Dict[str, Any]]:
+        """
+        The json of a /block/transaction response, None if the block has no such transaction.
+        """
+        with self._lock:
+            found = self._locate(block_id.get('index'), block_id.get('hash'))
+        try:
+            position = int(hash_[12:16], 16)
+        except ValueError:
+            return None
+        if found is None or position >= self.transactions or self._transaction_hash(*found, position) != hash_:
+            return None
+        return {'transaction': self._transaction(*found, position)}
+
+    # Growth and reorgs
+
+    def advance(self, blocks : int = 1) -> None:
+        """
+        Add blocks on top of the tip, reorging it every `reorg_every` blocks.
+        """
+        for _ in range(blocks):
+            with self._lock:
+                self.height += 1
+                fork = self._fork_at(self.height - 1)
+                if fork:
+                    self._canonical[self.height] = fork
+                self._branches[fork][2] = self.height
+                self._events.append(('block_added', self.height, fork))
+                self._added += 1
+                reorg = self.reorg_every > 0 and self._added % self.reorg_every == 0
+            if reorg:
+                self.reorg(self.reorg_depth)
+
+    def reorg(self, depth : int, length : Optional[int] = None) -> None:
+        """
+        Replace the top `depth` blocks with `length` blocks of a new fork,
+        one more than `depth` by default.
+        """
+        if length is None:
+            length = depth + 1
+        with self._lock:
+            depth = min(depth, self.height)
+            base = self.height - depth + 1
+            fork = len(self._branches)
+            self._branches.append([base, self._fork_at(base - 1), base + length - 1])
+            for index in range(self.height, base - 1, -1):
+                self._events.append(('block_removed', index, self._fork_at(index)))
+                self._canonical.pop(index, None)
+            self.height = base + length - 1
+            for index in range(base, self.height + 1):
+                self._canonical[index] = fork
+                self._events.append(('block_added', index, fork))
+
+    # Network
+
+    def status(self) -> Dict[str, Any]:
+        """
+        The json of a /network/status response.
+        """
+        with self._lock:
+            tip = self._block_id(self.height, self._fork_at(self.height))
+            height = self.height
+        return {
+            'current_block_identifier': tip,
+            'current_block_timestamp': GENESIS_TIMESTAMP + height * self.block_time,
+            'genesis_block_identifier': self._block_id(0, 0),
+            'peers': []
+        }
+
+    # Events
+
+    @property
+    def max_sequence(self) -> int:
+        return self._initial_events + len(self._events) - 1
+
+    def events(self, offset : Optional[int], limit : int) -> Dict[str, Any]:
+        """
+        The json of an /events/blocks response.
+        """
+        with self._lock:
+            max_sequence = self.max_sequence
+            if offset is None:
+                offset = max(max_sequence - limit + 1, 0)
+            events = []
+            for sequence in range(offset, min(offset + limit, max_sequence + 1)):
+                if sequence < self._initial_events:
+                    type_, index, fork = 'block_added', sequence, 0
+                else:
+                    type_, index, fork = self._events[sequence - self._initial_events]
+                events.append({'sequence': sequence, 'block_identifier': self._block_id(index, fork), 'type': type_})
+        return {'max_sequence': max_sequence, 'events': events}
+
+    # Accounts
+
+    def balance(self, address : str, block_id : Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        The json of an /account/balance response, a made up but
+        deterministic balance. None if there's no such block.
+        """
+        block_id = block_id or {}
+        found = self.block_identifier(block_id.get('index'), block_id.get('hash'))
+        if found is None:
+            return None
+        value = int(_digest(self.seed, 'balance', address, found['hash'])[:12], 16)
+        return {'block_identifier': found, 'balances': [{'value': str(value), 'currency': {'symbol': 'SYN', 'decimals': 18}}]}
+
+    def coins(self, address : str) -> Dict[str, Any]:
+        """
+        The json of an /account/coins response, a few made up but deterministic coins.
+        """
+        tip = self.block_identifier()
+        coins = []
+        for n in range(3):
+            digest = _digest(self.seed, 'coin', address, n)
+            coins.append({
+                'coin_identifier': {'identifier': '{}:{}'.format(digest[:64], n)},
+                'amount': {'value': str(int(digest[:8], 16)), 'currency': {'symbol': 'SYN', 'decimals': 18}}
+            })
+        return {'block_identifier': tip, 'coins': coins}
+
+    # Mempool
+
+    def _mempool_hash(self, position : int) -> str:
+        return 'ffffffffffff{:04x}{}'.format(position, _digest(self.seed, 'mempool', position)[:48])
+
+    def mempool(self) -> Dict[str, Any]:
+        """
+        The json of a /mempool response.
+        """
+        return {'transaction_identifiers': [{'hash': self._mempool_hash(i)} for i in range(self.mempool_size)]}
+
+    def mempool_transaction(self, hash_ : str) -> Optional[Dict[str, Any]]:
+        """
+        The json of a /mempool/transaction response, None if there's no such transaction.
+        """
+        for position in range(self.mempool_size):
+            if self._mempool_hash(position) == hash_:
+                transaction = self._transaction(self.height + 1, 0, position)
+                transaction['transaction_identifier'] = {'hash': hash_}
+                return {'transaction': transaction}
+        return None
+
+    # Search
+
+    def search(self, max_block : Optional[int] = None, offset : int = 0, limit : int = 100,
+               address : Optional[str] = None, transaction_hash : Optional[str] = None) -> Dict[str, Any]:
+        """
+        The json of a /search/transactions response, newest transactions first,
+        matching the address and the transaction hash if given.
+        """
+        with self._lock:
+            height = self.height if max_block is None else min(max_block, self.height)
+        count = (height + 1) * self.transactions
+        if transaction_hash is not None:
+            serials = self._search_hash(transaction_hash, height)
+        elif address is not None:
+            account = self._account_number(address)
+            serials = [] if account is None else _SerialsOf(count, self.accounts, {account, (account - 1) % self.accounts})
+        else:
+            serials = range(count - 1, -1, -1)
+        found = serials[offset:offset + limit]
+        transactions = []
+        for serial in found:
+            index, position = divmod(serial, self.transactions)
+            fork = self._fork_at(index)
+            transactions.append({'block_identifier': self._block_id(index, fork), 'transaction': self._transaction(index, fork, position)})
+        resp = {'transactions': transactions, 'total_count': len(serials)}
+        if offset + limit < len(serials):
+            resp['next_offset'] = offset + limit
+        return resp
+
+    def _search_hash(self, hash_ : str, height : int) -> List[int]:
+        found = self._parse_hash(hash_)
+        try:
+            position = int(hash_[12:16], 16)
+        except ValueError:
+            return []
+        if (found is None or found[0] > height or position >= self.transactions
+                or self._transaction_hash(found[0], self._fork_at(found[0]), position) != hash_):
+            return []
+        return [found[0] * self.transactions + position]
+
+class _SerialsOf(object):
+    """
+    The serial numbers of the transactions below `count` whose serial, modulo
+    the number of accounts, is one of the residues, ex: the transactions an
+    account takes part in, newest first, without listing them.
+    """
+
+    def __init__(self, count : int, modulus : int, residues : set) -> None:
+        self.count = count
+        self.modulus = modulus
+        self.residues = sorted(residues, reverse=True)
+        cycles, rest = divmod(count, modulus)
+        self._top = [cycles * modulus + residue for residue in self.residues if residue < rest]
+        self._cycles = cycles
+
+    def __len__(self) -> int:
+        return len(self._top) + self._cycles * len(self.residues)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(len(self)))]
+        if item < len(self._top):
+            return self._top[item]
+        cycle, within = divmod(item - len(self._top), len(self.residues))
+        return (self._cycles - 1 - cycle) * self.modulus + self.residues[within]
@@ -0,0 +1,338 @@
+"""
+A stand-in Rosetta node, serving a `SyntheticChain` over HTTP from a
+background thread, to run the clients against without a real node.
+"""
+import hashlib
+import random
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..utils.codec import get_codec
+from .chain import SyntheticChain
+
+class StandInError(Exception):
+    """
+    A Rosetta error, answered as an Error with a 500 status.
+    """
+
+    def __init__(self, code : int, message : str, retriable : bool = False) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.retriable = retriable
+
+    def body(self) -> Dict[str, Any]:
+        return {'code': self.code, 'message': self.message, 'retriable': self.retriable}
+
+NETWORK_NOT_SUPPORTED = (1, "Network not supported")
+BLOCK_NOT_FOUND = (2, "Block not found")
+TRANSACTION_NOT_FOUND = (3, "Transaction not found")
+INVALID_REQUEST = (4, "Invalid request")
+
+ERRORS = [NETWORK_NOT_SUPPORTED, BLOCK_NOT_FOUND, TRANSACTION_NOT_FOUND, INVALID_REQUEST]
+
+class StandInServer(object):
+    """
+    Serves every endpoint the clients call, the data and indexer ones from the
+    chain and the construction ones with well formed, echoed responses.
+
+    Every request is answered after `latency` seconds, give or take up to
+    `jitter`, like a node on the other side of a network would. With a
+    `block_interval`, a thread advances the chain by a block every that many
+    seconds while the server runs, for the clients following the tip.
+
+        with StandInServer(SyntheticChain(height=10000), latency=0.005) as server:
+            api = RosettaAPI(server.url)
+    """
+
+    def __init__(self, chain : Optional[SyntheticChain] = None, host : str = '127.0.0.1', port : int = 0,
+                 latency : float = 0.0, jitter : float = 0.0, block_interval : Optional[float] = None,
+                 cached_blocks : int = 256) -> None:
+        """
+        Parameters
+        ----------
+        chain: SyntheticChain, optional
+            Defaults to `SyntheticChain()`.
+        host: str
+        port: int
+            Where to listen. Defaults to 127.0.0.1, on any free port.
+        latency: float
+            The seconds every request takes on top of its handling. Defaults to 0.
+        jitter: float
+            The most seconds randomly added to the latency. Defaults to 0.
+        block_interval: float, optional
+            Advance the chain every that many seconds. Defaults to None, never.
+        cached_blocks: int
+            How many encoded /block responses are kept, so that serving a block
+            again costs as little as a real node's. Defaults to 256.
+        """
+        self.chain = chain if chain is not None else SyntheticChain()
+        self.latency = latency
+        self.jitter = jitter
+        self.block_interval = block_interval
+        self.requests = 0
+        self._cached_blocks = cached_blocks
+        self._blocks : 'OrderedDict[str, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._random = random.Random(self.chain.seed)
+        self._stopped = threading.Event()
+        self._threads = []
+        self._routes : Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            '/network/list': self._network_list,
+            '/network/options': self._network_options,
+            '/network/status': self._network_status,
+            '/account/balance': self._account_balance,
+            '/account/coins': self._account_coins,
+            '/block': self._block,
+            '/block/transaction': self._block_transaction,
+            '/mempool': self._mempool,
+            '/mempool/transaction': self._mempool_transaction,
+            '/events/blocks': self._events_blocks,
+            '/search/transactions': self._search_transactions,
+            '/construction/combine': self._construction_combine,
+            '/construction/derive': self._construction_derive,
+            '/construction/hash': self._construction_hash,
+            '/construction/metadata': self._construction_metadata,
+            '/construction/parse': self._construction_parse,
+            '/construction/payloads': self._construction_payloads,
+            '/construction/preprocess': self._construction_preprocess,
+            '/construction/submit': self._construction_submit
+        }
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._server.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """
+        The url to give to the clients, ex: http://127.0.0.1:53011/
+        """
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}/'.format(host, port)
+
+    def start(self) -> 'StandInServer':
+        """
+        Start serving, and advancing the chain if there's a `block_interval`, in background threads.
+        """
+        self._stopped.clear()
+        self._threads = [threading.Thread(target=self._server.serve_forever, daemon=True)]
+        if self.block_interval is not None:
+            self._threads.append(threading.Thread(target=self._produce, daemon=True))
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving and close the socket.
+        """
+        self._stopped.set()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _produce(self) -> None:
+        while not self._stopped.wait(self.block_interval):
+            self.chain.advance()
+
+    def handle(self, path : str, body : bytes) -> Tuple[int, bytes]:
+        """
+        The status and the body of the response to a request, after the latency.
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        codec = get_codec()
+        route = self._routes.get(path)
+        try:
+            if route is None:
+                raise StandInError(*INVALID_REQUEST)
+            try:
+                req = codec.loads(body) if body else {}
+            except ValueError:
+                raise StandInError(*INVALID_REQUEST)
+            if path != '/network/list':
+                self._check_network(req)
+            resp = route(req)
+        except StandInError as e:
+            return 500, codec.dumps(e.body())
+        return 200, resp if isinstance(resp, bytes) else codec.dumps(resp)
+
+    def _check_network(self, req : Dict[str, Any]) -> None:
+        if req.get('network_identifier') != self.chain.network_identifier:
+            raise StandInError(*NETWORK_NOT_SUPPORTED)
+
+    # Data
+
+    def _network_list(self, req : Dict[str, Any]) -> Any:
+        return {'network_identifiers': [self.chain.network_identifier]}
+
+    def _network_options(self, req : Dict[str, Any]) -> Any:
+        return {
+            'version': {'rosetta_version': '1.4.13', 'node_version': '1.0.0', 'middleware_version': '1.0.0'},
+            'allow': {
+                'operation_statuses': [{'status': 'SUCCESS', 'successful': True}, {'status': 'FAILURE', 'successful': False}],
+                'operation_types': ['TRANSFER'],
+                'errors': [StandInError(*error).body() for error in ERRORS],
+                'historical_balance_lookup': True,
+                'call_methods': [],
+                'balance_exemptions': [],
+                'mempool_coins': False
+            }
+        }
+
+    def _network_status(self, req : Dict[str, Any]) -> Any:
+        return self.chain.status()
+
+    def _account_balance(self, req : Dict[str, Any]) -> Any:
+        resp = self.chain.balance(self._address(req), req.get('block_identifier'))
+        if resp is None:
+            raise StandInError(*BLOCK_NOT_FOUND)
+        return resp
+
+    def _account_coins(self, req : Dict[str, Any]) -> Any:
+        return self.chain.coins(self._address(req))
+
+    @staticmethod
+    def _address(req : Dict[str, Any]) -> str:
+        try:
+            return req['account_identifier']['address']
+        except (KeyError, TypeError):
+            raise StandInError(*INVALID_REQUEST)
+
+    def _block(self, req : Dict[str, Any]) -> Any:
+        block_id = req.get('block_identifier') or {}
+        found = self.chain.block_identifier(block_id.get('index'), block_id.get('hash'))
+        if found is None:
+            raise StandInError(*BLOCK_NOT_FOUND)
+        # Blocks are immutable once looked up by hash, whatever becomes of the chain.
+        with self._lock:
+            body = self._blocks.get(found['hash'])
+            if body is not None:
+                self._blocks.move_to_end(found['hash'])
+                return body
+        body = get_codec().dumps(self.chain.block(found['index'], found['hash']))
+        if self._cached_blocks > 0:
+            with self._lock:
+                self._blocks[found['hash']] = body
+                if len(self._blocks) > self._cached_blocks:
+                    self._blocks.popitem(last=False)
+        return body
+
+    def _block_transaction(self, req : Dict[str, Any]) -> Any:
+        try:
+            resp = self.chain.transaction(req['block_identifier'], req['transaction_identifier']['hash'])
+        except (KeyError, TypeError):
+            raise StandInError(*INVALID_REQUEST)
+        if resp is None:
+            raise StandInError(*TRANSACTION_NOT_FOUND)
+        return resp
+
+    def _mempool(self, req : Dict[str, Any]) -> Any:
+        return self.chain.mempool()
+
+    def _mempool_transaction(self, req : Dict[str, Any]) -> Any:
+        try:
+            resp = self.chain.mempool_transaction(req['transaction_identifier']['hash'])
+        except (KeyError, TypeError):
+            raise StandInError(*INVALID_REQUEST)
+        if resp is None:
+            raise StandInError(*TRANSACTION_NOT_FOUND)
+        return resp
+
+    # Indexer
+
+    def _events_blocks(self, req : Dict[str, Any]) -> Any:
+        return self.chain.events(req.get('offset'), req.get('limit') or 100)
+
+    def _search_transactions(self, req : Dict[str, Any]) -> Any:
+        # Only the account and transaction filters are supported, with the "and" operator.
+        address = (req.get('account_identifier') or {}).get('address') or req.get('address')
+        transaction_hash = (req.get('transaction_identifier') or {}).get('hash')
+        return self.chain.search(req.get('max_block'), req.get('offset') or 0, req.get('limit') or 100,
+                                 address=address, transaction_hash=transaction_hash)
+
+    # Construction
+
+    def _construction_derive(self, req : Dict[str, Any]) -> Any:
+        hex_bytes = (req.get('public_key') or {}).get('hex_bytes', '')
+        address = '0x' + hex_bytes[-40:].rjust(40, '0')
+        return {'address': address, 'account_identifier': {'address': address}}
+
+    def _construction_preprocess(self, req : Dict[str, Any]) -> Any:
+        return {'options': {'operations': len(req.get('operations') or ())}}
+
+    def _construction_metadata(self, req : Dict[str, Any]) -> Any:
+        return {'metadata': {'nonce': self.chain.height, 'options': req.get('options') or {}},
+                'suggested_fee': [{'value': '21000', 'currency': {'symbol': 'SYN', 'decimals': 18}}]}
+
+    def _construction_payloads(self, req : Dict[str, Any]) -> Any:
+        unsigned = get_codec().dumps({'operations': req.get('operations') or []}).hex()
+        signers = {operation['account']['address'] for operation in req.get('operations') or () if operation.get('account')}
+        return {
+            'unsigned_transaction': unsigned,
+            'payloads': [{'address': address, 'account_identifier': {'address': address}, 'hex_bytes': unsigned[:64],
+                          'signature_type': 'ecdsa'} for address in sorted(signers)]
+        }
+
+    def _construction_combine(self, req : Dict[str, Any]) -> Any:
+        signatures = [signature.get('hex_bytes') or '' for signature in req.get('signatures') or ()]
+        return {'signed_transaction': '.'.join([req.get('unsigned_transaction', '')] + signatures)}
+
+    def _construction_parse(self, req : Dict[str, Any]) -> Any:
+        transaction = req.get('transaction', '')
+        try:
+            operations = get_codec().loads(bytes.fromhex(transaction.split('.')[0]))['operations']
+        except (ValueError, KeyError, TypeError):
+            operations = []
+        resp = {'operations': operations}
+        if req.get('signed'):
+            resp['account_identifier_signers'] = [operation['account'] for operation in operations if operation.get('account')]
+        return resp
+
+    def _construction_hash(self, req : Dict[str, Any]) -> Any:
+        return {'transaction_identifier': {'hash': self._signed_hash(req)}}
+
+    def _construction_submit(self, req : Dict[str, Any]) -> Any:
+        return {'transaction_identifier': {'hash': self._signed_hash(req)}}
+
+    @staticmethod
+    def _signed_hash(req : Dict[str, Any]) -> str:
+        return hashlib.sha256(req.get('signed_transaction', '').encode('utf-8')).hexdigest()
+
+def _handler(server : StandInServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            status, resp = server.handle('/' + self.path.strip('/'), body)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(resp)))
+            self.end_headers()
+            self.wfile.write(resp)
+
+        def handle(self) -> None:
+            # Clients closing their connections mid response are none of our business.
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return Handler
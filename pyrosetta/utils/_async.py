@@ -1,34 +1,401 @@
 import asyncio
-import itertools
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Sequence, Tuple, TypeVar
+from urllib.parse import urljoin
 
-def chunk(it, size):
-    it = iter(it)
-    for c in iter(lambda: tuple(islice(it, size)), ()):
-        yield c
+from ..exceptions import RosettaError
+from .codec import get_codec
+from . import deadline
+from .deadline import DEFAULT_TIMEOUT, Timeout
+from .retry import DEFAULT_RETRY, NO_RETRY, RetryPolicy
+from .streaming import JSONArrayScanner
+from .throttle import Throttle
 
-async def post_request(session, url, request):
+_NO_THROTTLE = Throttle()
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+def make_session(max_connections : int = 100, max_connections_per_host : int = 0, keep_alive : bool = True):
+    """
+    Create an aiohttp.ClientSession suitable for many concurrent requests
+    against a single Rosetta node.
+
+    Parameters
+    ----------
+    max_connections: int
+        The maximum number of simultaneous connections the session will open.
+        0 means no limit.
+    max_connections_per_host: int
+        The maximum number of simultaneous connections to a single host.
+        0 means no limit other than `max_connections`.
+    keep_alive: bool
+        Whether connections are reused across requests.
+
+    Returns
+    -------
+    aiohttp.ClientSession
+    """
+    import aiohttp
+
+    connector = aiohttp.TCPConnector(limit=max_connections, limit_per_host=max_connections_per_host, force_close=not keep_alive)
+    return aiohttp.ClientSession(connector=connector)
+
+class SingleFlight(object):
+    """
+    The asyncio version of `coalescing.SingleFlight`: shares the result of
+    a call between every task that asks for the same key while the call is
+    in flight. A caller being cancelled doesn't cancel the shared call.
+    """
+
+    def __init__(self) -> None:
+        self._tasks : Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key : Hashable, fn : Callable[[], Awaitable[R]]) -> R:
+        """
+        Await `fn`, unless a call for the same key is already in flight,
+        in which case wait for it and return its result instead.
+
+        Parameters
+        ----------
+        key: Hashable
+        fn: Callable[[], Awaitable[R]]
+
+        Returns
+        -------
+        R
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def _done(self, key : Hashable, task : asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Mark the error as retrieved, in case every caller was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        """
+        The number of calls in flight.
+        """
+        return len(self._tasks)
+
+async def prewarm(api_url : str, connections : int, session) -> None:
+    """
+    Open up to `connections` connections to the node ahead of time by making
+    that many concurrent /network/list requests. This is best effort, any
+    failure is ignored and left to surface on the first real request.
+
+    Parameters
+    ----------
+    api_url: str
+        The url to the node's api.
+    connections: int
+        The number of connections to open.
+    session: aiohttp.ClientSession
+    """
+    import aiohttp
+
+    url = urljoin(api_url, 'network/list')
+
+    async def _open():
+        try:
+            async with session.post(url, data=b'{}', headers={'Content-Type': 'application/json'}) as resp:
+                await resp.read()
+        except aiohttp.ClientError:
+            pass
+
+    await asyncio.gather(*[_open() for _ in range(connections)])
+
+def client_timeout(timeout : Optional[Timeout]):
+    """
+    The aiohttp timeout of the next request, shortened to the time
+    left before the deadline, see `deadline.request_timeout`.
+
+    Returns
+    -------
+    aiohttp.ClientTimeout
+    """
+    import aiohttp
+
+    connect, read = deadline.request_timeout(timeout) or (None, None)
+    return aiohttp.ClientTimeout(total=deadline.remaining(), sock_connect=connect, sock_read=read)
+
+async def _send(url : str, data : bytes, session, retry : Optional[RetryPolicy], throttle : Optional[Throttle] = None,
+                timeout : Optional[Timeout] = DEFAULT_TIMEOUT):
+    """
+    Post the request, retrying it following the retry policy and within
+    the limits of the throttle and the deadline, and return the successful
+    response before its body is read.
+    """
+    import aiohttp
+
+    headers = {
+            'Content-Type': 'application/json'
+    }
+    policy = retry or NO_RETRY
+    throttle = throttle or _NO_THROTTLE
+    attempt = 0
+    while True:
+        attempt += 1
+        token = await throttle.acquire_async()
+        try:
+            request_timeout = client_timeout(timeout)
+            resp = await session.post(url, headers=headers, data=data, timeout=request_timeout)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            throttle.release(token)
+            deadline.check()
+            delay = policy.delay(attempt)
+            if not policy.should_retry(url, attempt) or not deadline.allows(delay):
+                raise
+            await asyncio.sleep(delay)
+            continue
+        except BaseException:
+            throttle.cancel(token)
+            raise
+        if resp.ok:
+            throttle.release(token, resp.status)
+            return resp
+        try:
+            error = await response_error(resp)
+        finally:
+            resp.release()
+        retriable = error.retriable if isinstance(error, RosettaError) else None
+        throttle.release(token, resp.status, retriable)
+        delay = policy.delay(attempt, resp.headers.get('Retry-After'))
+        if not policy.should_retry(url, attempt, resp.status, retriable) or not deadline.allows(delay):
+            raise error
+        await asyncio.sleep(delay)
+
+async def hedged(attempt : Callable[[], Awaitable[R]], attempts : int, delay : float,
+                 observe : Optional[Callable[[float], None]] = None) -> R:
+    """
+    Await `attempt`, and start it again every `delay` seconds without an
+    answer, up to `attempts` times in total. A failed attempt also starts the
+    next one straight away. The first successful attempt wins and the others
+    are cancelled. See `hedging.hedged` for the blocking version.
+
+    Parameters
+    ----------
+    attempt: Callable[[], Awaitable[R]]
+    attempts: int
+        The maximum number of attempts.
+    delay: float
+        In seconds.
+    observe: Callable[[float], None], optional
+        Called with how long the first successful attempt took to answer,
+        counting from the start of the first attempt.
+
+    Returns
+    -------
+    R
+        The result of the first successful attempt.
+
+    Raises
+    ------
+    The error of the last attempt, if every attempt failed.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    pending = {asyncio.ensure_future(attempt())}
+    started = 1
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=delay if started < attempts else None,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                pending.add(asyncio.ensure_future(attempt()))
+                started += 1
+                continue
+            for task in done:
+                if task.exception() is None:
+                    if observe is not None:
+                        observe(loop.time() - start)
+                    return task.result()
+                error = task.exception()
+            if started < attempts:
+                pending.add(asyncio.ensure_future(attempt()))
+                started += 1
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def response_error(resp) -> Exception:
+    """
+    The exception describing an unsuccessful response.
+
+    Parameters
+    ----------
+    resp: aiohttp.ClientResponse
+
+    Returns
+    -------
+    RosettaError
+        If the body is a Rosetta `Error`.
+    aiohttp.ClientResponseError
+        Otherwise.
+    """
+    import aiohttp
+
+    try:
+        body = get_codec().loads(await resp.read())
+    except ValueError:
+        body = None
+    error = RosettaError.from_body(body, resp.status, str(resp.url))
+    if error is not None:
+        return error
+    return aiohttp.ClientResponseError(resp.request_info, resp.history, status=resp.status, message=resp.reason, headers=resp.headers)
+
+async def post_request(url : str, data : bytes, session, retry : Optional[RetryPolicy] = DEFAULT_RETRY,
+                       throttle : Optional[Throttle] = None, timeout : Optional[Timeout] = DEFAULT_TIMEOUT) -> Dict[str, Any]:
     """
+    Post a request to the url with the given data on the provided session,
+    and return the decoded json body.
+
     Parameters
     ----------
+    url: str
+        The url to post to.
+    data: bytes
+        The serialized json data to include in the post request.
+        See `codec.encode_request`.
     session: aiohttp.ClientSession
+    retry: RetryPolicy, optional
+        When and how the request is retried. None disables retries.
+    throttle: Throttle, optional
+        The rate and concurrency limits the request is made within.
+    timeout: float | tuple[float, float], optional
+        The (connect, read) timeout of each attempt, see `communication.RosettaSession`.
+
+    Returns
+    -------
+    dict[str, Any]
+
+    Raises
+    ------
+    RosettaError: If the node answered with an `Error`.
+    DeadlineExceeded: If the deadline around the call passed.
+    aiohttp.ClientError: If the request failed otherwise.
+    """
+    async with await _send(url, data, session, retry, throttle, timeout) as resp:
+        return get_codec().loads(await resp.read())
+
+async def stream_json_array(url : str, data : bytes, session, path : Sequence[str],
+                            retry : Optional[RetryPolicy] = DEFAULT_RETRY, throttle : Optional[Throttle] = None,
+                            chunk_size : int = 1 << 16, timeout : Optional[Timeout] = DEFAULT_TIMEOUT) -> AsyncIterator[Any]:
+    """
+    Post a request to the url with the given data on the provided session,
+    and yield the decoded items of the array at `path` of the json body
+    as it downloads. See `streaming.JSONArrayScanner`.
+
+    Parameters
+    ----------
     url: str
-    request: dict
+        The url to post to.
+    data: bytes
+        The serialized json data to include in the post request.
+    session: aiohttp.ClientSession
+    path: Sequence[str]
+        The keys of the nested objects leading to the array.
+    retry: RetryPolicy, optional
+        When and how the request is retried. None disables retries.
+    throttle: Throttle, optional
+        The rate and concurrency limits the request is made within.
+    chunk_size: int
+        The size of the chunks the body is read in.
+    timeout: float | tuple[float, float], optional
+        The (connect, read) timeout of each attempt.
+
+    Yields
+    ------
+    Any
     """
-    return await session.post(url, json=request)
+    async with await _send(url, data, session, retry, throttle, timeout) as resp:
+        scanner = JSONArrayScanner(path)
+        async for chunk in resp.content.iter_chunked(chunk_size):
+            deadline.check()
+            for item in scanner.feed(chunk):
+                yield item
+            if scanner.done:
+                return
+        for item in scanner.close():
+            yield item
 
-async def post_requests(session, request_map, concurrent_requests=0):
+async def ordered_map(fn : Callable[[T], Awaitable[R]], items : Iterable[T], concurrency : int = 0) -> AsyncIterator[R]:
     """
+    Await `fn` for every item, keeping at most `concurrency` of them in
+    flight, and yield the results in the order of the items.
+
+    Items are only pulled from `items` as room frees up, so this is safe
+    to use with very long or unbounded iterables.
+
     Parameters
     ----------
+    fn: Callable[[T], Awaitable[R]]
+    items: Iterable[T]
+    concurrency: int
+        The maximum number of calls in flight. 0 or less means
+        every call is started immediately.
+
+    Yields
+    ------
+    R
+    """
+    items = iter(items)
+    pending = deque()
+    try:
+        for item in items:
+            pending.append(asyncio.ensure_future(fn(item)))
+            if concurrency > 0 and len(pending) >= concurrency:
+                break
+        while pending:
+            result = await pending.popleft()
+            for item in items:
+                pending.append(asyncio.ensure_future(fn(item)))
+                break
+            yield result
+    finally:
+        for task in pending:
+            task.cancel()
+
+async def post_requests(requests : Iterable[Tuple[str, bytes]], session, concurrent_requests : int = 0,
+                        retry : Optional[RetryPolicy] = DEFAULT_RETRY, throttle : Optional[Throttle] = None,
+                        timeout : Optional[Timeout] = DEFAULT_TIMEOUT) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Post many requests on the provided session, keeping at most
+    `concurrent_requests` of them in flight, and yield the decoded
+    responses in the order the requests were given.
+
+    Parameters
+    ----------
+    requests: Iterable[tuple[str, bytes]]
+        Pairs of the url to post to and the serialized json data.
     session: aiohttp.ClientSession
-    dict: url -> request
-    """
-    requests = []
-    for i, (url, request) in enumerate(request_map.items()):
-        requests.append(asyncio.create_task(post_request(session, url, request)))
-    
-    if concurrent_requests <= 0:
-        yield await asyncio.gather(*requests)
-    else:
-        for group in chunk(requests, concurrent_requests):
-            yield await asyncio.gather(*group)
+    concurrent_requests: int
+        The maximum number of requests in flight. 0 or less means
+        every request is started immediately.
+    retry: RetryPolicy, optional
+        When and how each request is retried. None disables retries.
+    throttle: Throttle, optional
+        The rate and concurrency limits the requests are made within. With an
+        `AdaptiveConcurrency`, `concurrent_requests` only caps how many requests
+        are queued up, while the throttle finds how many are actually in flight.
+    timeout: float | tuple[float, float], optional
+        The (connect, read) timeout of each attempt.
+
+    Yields
+    ------
+    dict[str, Any]
+    """
+    async def _post(request):
+        url, data = request
+        return await post_request(url, data, session, retry, throttle, timeout)
+
+    async for resp in ordered_map(_post, requests, concurrent_requests):
+        yield resp
@@ -0,0 +1,313 @@
+"""
+An in-process LRU cache of /block responses, aware of how far each
+block is from the tip of its network, and an index of the transactions
+of the blocks fetched last.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models import (
+    BlockIdentifier,
+    BlockResponse,
+    NetworkIdentifier,
+    PartialBlockIdentifier,
+    Transaction,
+    TransactionIdentifier
+)
+from .coalescing import request_key
+
+# Rough sizes, in bytes, of the json of a block, used to weigh the entries.
+_BLOCK_SIZE = 512
+_TRANSACTION_SIZE = 256
+_OPERATION_SIZE = 320
+
+def estimate_size(resp : BlockResponse) -> int:
+    """
+    The approximate size, in bytes, of the json of a /block response,
+    estimated from its number of transactions and operations without
+    building any lazy transaction.
+
+    Parameters
+    ----------
+    resp: BlockResponse
+
+    Returns
+    -------
+    int
+    """
+    size = _BLOCK_SIZE + _TRANSACTION_SIZE * len(resp.other_transactions or ())
+    if resp.block is None:
+        return size
+    # Iterate the underlying list, so a LazyTransactions hands out the raw
+    # json of the transactions it hasn't built.
+    for transaction in list.__iter__(resp.block.transactions):
+        operations = transaction.get('operations') if isinstance(transaction, dict) else transaction.operations
+        size += _TRANSACTION_SIZE + _OPERATION_SIZE * len(operations or ())
+    return size
+
+class _Entry(object):
+    __slots__ = ('resp', 'index', 'hash', 'size', 'stored_at')
+
+    def __init__(self, resp : BlockResponse, index : int, hash_ : str, size : int, stored_at : float) -> None:
+        self.resp = resp
+        self.index = index
+        self.hash = hash_
+        self.size = size
+        self.stored_at = stored_at
+
+class BlockCache(object):
+    """
+    Keeps recently used /block responses, keyed by both height and hash, within
+    a maximum number of blocks and an approximate number of bytes, evicting the
+    least recently used blocks first.
+
+    A block at least `finality_depth` blocks below the highest height seen on its
+    network, through /network/status or the blocks themselves, is final and kept
+    until evicted. A block closer to the tip could still be reorganized away, so
+    it is only served by height for `tip_ttl` seconds. Looking a block up by hash
+    is always safe, since a hash names a single block even once it is orphaned.
+
+    Every caller gets the very same response object, which should be treated
+    as read-only. It can be shared by threads and asyncio tasks alike.
+    """
+
+    def __init__(self, max_blocks : int = 1024, max_bytes : int = 256 << 20, finality_depth : int = 10,
+                 tip_ttl : float = 2.0, clock : Callable[[], float] = time.monotonic) -> None:
+        """
+        Parameters
+        ----------
+        max_blocks: int
+            The maximum number of blocks kept. Defaults to 1024.
+        max_bytes: int
+            The maximum approximate size, in bytes, of the json of the blocks
+            kept, see `estimate_size`. Defaults to 256MiB.
+        finality_depth: int
+            How many blocks below the tip a block needs to be to never change.
+            Defaults to 10, set it for the chain, ex: 6 on Bitcoin.
+        tip_ttl: float
+            How long, in seconds, a block that isn't final is served by height.
+            Defaults to 2.
+        clock: Callable[[], float]
+            The monotonic clock, in seconds.
+        """
+        self.max_blocks = max_blocks
+        self.max_bytes = max_bytes
+        self.finality_depth = finality_depth
+        self.tip_ttl = tip_ttl
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries : 'OrderedDict[Tuple[str, str], _Entry]' = OrderedDict()
+        self._heights : Dict[Tuple[str, int], str] = {}
+        self._tips : Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def observe_tip(self, network_id : NetworkIdentifier, index : int) -> None:
+        """
+        Record a height the network has reached, ex: the current block of a
+        /network/status response.
+        """
+        self._observe(request_key(network_id), index)
+
+    def _observe(self, network : str, index : int) -> None:
+        with self._lock:
+            if index > self._tips.get(network, -1):
+                self._tips[network] = index
+
+    def final(self, network_id : NetworkIdentifier, index : int) -> bool:
+        """
+        Whether the block at the height is deep enough below the tip to never change.
+        """
+        return self._final(request_key(network_id), index)
+
+    def _final(self, network : str, index : int) -> bool:
+        return self._tips.get(network, -1) - index >= self.finality_depth
+
+    def get(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> Optional[BlockResponse]:
+        """
+        The cached response for the block, if any.
+
+        Parameters
+        ----------
+        network_id: NetworkIdentifier
+        block_id: PartialBlockIdentifier
+            By index, hash or both.
+
+        Returns
+        -------
+        BlockResponse, optional
+        """
+        network = request_key(network_id)
+        with self._lock:
+            if block_id.hash_ is not None:
+                entry = self._entries.get((network, block_id.hash_))
+                if entry is not None and block_id.index is not None and entry.index != block_id.index:
+                    entry = None
+            elif block_id.index is not None:
+                hash_ = self._heights.get((network, block_id.index))
+                entry = None if hash_ is None else self._entries.get((network, hash_))
+                if (entry is not None and not self._final(network, entry.index)
+                        and self._clock() - entry.stored_at > self.tip_ttl):
+                    # The block may have been reorganized away since, it
+                    # has to be fetched by height again.
+                    del self._heights[(network, entry.index)]
+                    entry = None
+            else:
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((network, entry.hash))
+            self.hits += 1
+            return entry.resp
+
+    def put(self, network_id : NetworkIdentifier, resp : BlockResponse) -> None:
+        """
+        Cache the response, unless it holds no block or is too large to fit.
+
+        Parameters
+        ----------
+        network_id: NetworkIdentifier
+        resp: BlockResponse
+        """
+        if resp.block is None:
+            return
+        network = request_key(network_id)
+        block_id = resp.block.block_identifier
+        self._observe(network, block_id.index)
+        size = estimate_size(resp)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            key = (network, block_id.hash_)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = _Entry(resp, block_id.index, block_id.hash_, size, self._clock())
+            self._heights[(network, block_id.index)] = block_id.hash_
+            self.size += size
+            while len(self._entries) > self.max_blocks or self.size > self.max_bytes:
+                (network, _), entry = self._entries.popitem(last=False)
+                self.size -= entry.size
+                if self._heights.get((network, entry.index)) == entry.hash:
+                    del self._heights[(network, entry.index)]
+
+    def clear(self) -> None:
+        """
+        Drop every cached block.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._heights.clear()
+            self.size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        The number of blocks and the approximate bytes cached, and the hits and misses so far.
+        """
+        return {'blocks': len(self._entries), 'bytes': self.size, 'hits': self.hits, 'misses': self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return "BlockCache(blocks={}, bytes={})".format(len(self._entries), self.size)
+
+class TransactionIndex(object):
+    """
+    The transactions of the most recently fetched blocks, looked up by block
+    and transaction hash, so a /block/transaction call for a transaction the
+    client already holds needs no request.
+
+    The index of a block is only built the first time one of its transactions
+    is looked up, and only covers the transactions the block inlines, not its
+    `other_transactions`. It can be shared by threads and asyncio tasks alike.
+    """
+
+    def __init__(self, max_blocks : int = 16) -> None:
+        """
+        Parameters
+        ----------
+        max_blocks: int
+            The number of most recently fetched blocks indexed. Defaults to 16.
+        """
+        self.max_blocks = max_blocks
+        self._blocks : 'OrderedDict[Tuple[str, str], BlockResponse]' = OrderedDict()
+        self._positions : Dict[Tuple[str, str], Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, network_id : NetworkIdentifier, resp : BlockResponse) -> None:
+        """
+        Index the block of the response, evicting the least recently added block.
+        """
+        if resp.block is None or self.max_blocks <= 0:
+            return
+        key = (request_key(network_id), resp.block.block_identifier.hash_)
+        with self._lock:
+            self._blocks[key] = resp
+            self._blocks.move_to_end(key)
+            while len(self._blocks) > self.max_blocks:
+                evicted, _ = self._blocks.popitem(last=False)
+                self._positions.pop(evicted, None)
+
+    def get(self, network_id : NetworkIdentifier, block_id : BlockIdentifier,
+            transaction_id : TransactionIdentifier) -> Optional[Transaction]:
+        """
+        The transaction, if its block is indexed and inlines it.
+
+        Parameters
+        ----------
+        network_id: NetworkIdentifier
+        block_id: BlockIdentifier
+        transaction_id: TransactionIdentifier
+
+        Returns
+        -------
+        Transaction, optional
+        """
+        key = (request_key(network_id), block_id.hash_)
+        with self._lock:
+            resp = self._blocks.get(key)
+            if resp is None or resp.block.block_identifier.index != block_id.index:
+                return None
+            positions = self._positions.get(key)
+            if positions is None:
+                positions = self._positions[key] = index_transactions(resp.block.transactions)
+        position = positions.get(transaction_id.hash_)
+        return None if position is None else resp.block.transactions[position]
+
+    def clear(self) -> None:
+        """
+        Drop every indexed block.
+        """
+        with self._lock:
+            self._blocks.clear()
+            self._positions.clear()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+def index_transactions(transactions : List[Transaction]) -> Dict[str, int]:
+    """
+    The position of each transaction of a block, by hash. The hashes of a
+    LazyTransactions are read from the raw json, without building the
+    transactions.
+
+    Parameters
+    ----------
+    transactions: list[Transaction]
+
+    Returns
+    -------
+    dict[str, int]
+    """
+    positions = {}
+    for i, transaction in enumerate(list.__iter__(transactions)):
+        if isinstance(transaction, dict):
+            positions[transaction['transaction_identifier']['hash']] = i
+        else:
+            positions[transaction.transaction_identifier.hash_] = i
+    return positions
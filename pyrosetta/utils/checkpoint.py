@@ -0,0 +1,47 @@
+"""
+Where a stream, ex: of block events, was last processed up to, so that
+a restarted consumer resumes exactly there.
+
+A checkpoint is any object with a `load() -> Optional[int]` method, the
+last sequence processed or None, and a `save(sequence : int)` method.
+"""
+import os
+from typing import Optional
+
+class FileCheckpoint(object):
+    """
+    A checkpoint kept in a small text file, written to disk and then replaced
+    atomically on every save, so a crash leaves either the previous or the
+    new sequence.
+    """
+
+    def __init__(self, path : str) -> None:
+        """
+        Parameters
+        ----------
+        path: str
+            The path to the file, created on the first save.
+        """
+        self.path = path
+
+    def load(self) -> Optional[int]:
+        """
+        The last sequence saved, or None if there's none, including when
+        the file is empty or doesn't hold a sequence.
+        """
+        try:
+            with open(self.path) as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def save(self, sequence : int) -> None:
+        tmp = "{}.tmp".format(self.path)
+        with open(tmp, 'w') as f:
+            f.write(str(sequence))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def __repr__(self) -> str:
+        return "FileCheckpoint({!r})".format(self.path)
@@ -0,0 +1,101 @@
+"""
+Single-flight coalescing: identical requests made while one of them is
+already in flight wait for it and share its result, rather than each
+making their own call to the node.
+"""
+import functools
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from pydantic import BaseModel
+
+R = TypeVar('R')
+
+def request_key(req : BaseModel) -> str:
+    """
+    A canonical form of a request, the same for any two equal requests
+    regardless of the order of the keys of their metadata.
+
+    Parameters
+    ----------
+    req: BaseModel
+
+    Returns
+    -------
+    str
+    """
+    return json.dumps(req.dict(by_alias=True), sort_keys=True, separators=(',', ':'), default=str)
+
+class SingleFlight(object):
+    """
+    Shares the result of a call between every thread that asks for the same key
+    while the call is in flight. Nothing is cached: once the call returns, the
+    next call for the key goes out again.
+
+    Every caller gets the very same result object, which should be treated
+    as read-only.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls : Dict[Hashable, Future] = {}
+
+    def do(self, key : Hashable, fn : Callable[[], R]) -> R:
+        """
+        Call `fn`, unless a call for the same key is already in flight,
+        in which case wait for it and return its result instead.
+
+        Parameters
+        ----------
+        key: Hashable
+        fn: Callable[[], R]
+
+        Returns
+        -------
+        R
+
+        Raises
+        ------
+        Whatever the call raised, to every caller waiting on it.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def __len__(self) -> int:
+        """
+        The number of calls in flight.
+        """
+        return len(self._calls)
+
+def coalesced(endpoint : Callable[[str, BaseModel, Any], R]) -> Callable[[str, BaseModel, Any], R]:
+    """
+    Decorate an endpoint function taking `(api_url, req, session)` so that
+    identical concurrent requests share one call, when the session has a
+    `single_flight`, see `communication.RosettaSession`.
+    """
+    @functools.wraps(endpoint)
+    def wrapper(api_url : str, req : BaseModel, session = None) -> R:
+        flight = getattr(session, 'single_flight', None)
+        if flight is None:
+            return endpoint(api_url, req, session)
+        key = (endpoint.__name__, api_url, request_key(req))
+        return flight.do(key, lambda: endpoint(api_url, req, session))
+    return wrapper
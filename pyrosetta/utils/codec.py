@@ -0,0 +1,94 @@
+"""
+The json codec used to encode requests and decode responses.
+
+The standard library json module is used by default. orjson, when it is
+installed, can be opted into with `set_codec(OrjsonCodec())`: it decodes
+faster, but building the models takes most of the time of a response, and
+end to end it isn't faster, see benchmarks/bench_codec.py. Any object with
+matching `dumps` and `loads` methods can be plugged in with `set_codec`.
+"""
+import json
+from typing import Any
+
+import requests
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class StdlibCodec(object):
+    """
+    Codec backed by the standard library json module.
+    """
+    name = 'json'
+
+    def dumps(self, obj : Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+    def loads(self, data : bytes) -> Any:
+        return json.loads(data)
+
+class OrjsonCodec(object):
+    """
+    Codec backed by orjson, which decodes straight from bytes.
+    """
+    name = 'orjson'
+
+    def dumps(self, obj : Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data : bytes) -> Any:
+        return orjson.loads(data)
+
+_codec = StdlibCodec()
+
+def get_codec():
+    """
+    Returns
+    -------
+    The codec currently in use.
+    """
+    return _codec
+
+def set_codec(codec) -> None:
+    """
+    Replace the codec used by every endpoint.
+
+    Parameters
+    ----------
+    codec
+        An object with a `dumps(obj) -> bytes` and a `loads(bytes) -> obj` method.
+    """
+    global _codec
+    _codec = codec
+
+def encode_request(req : BaseModel) -> bytes:
+    """
+    Serialize a request model, using the field aliases the
+    Rosetta spec expects (ex: `hash` rather than `hash_`).
+
+    Parameters
+    ----------
+    req: BaseModel
+
+    Returns
+    -------
+    bytes
+    """
+    return _codec.dumps(req.dict(by_alias=True))
+
+def decode_response(resp : requests.Response) -> Any:
+    """
+    Decode the json body of a response straight from its bytes.
+
+    Parameters
+    ----------
+    resp: requests.Response
+
+    Returns
+    -------
+    The decoded json.
+    """
+    return _codec.loads(resp.content)
@@ -1,26 +1,345 @@
-from typing import Any, Dict, Optional
+import threading
+import time
+from typing import Any, Optional, Type, TypeVar
+from urllib.parse import urljoin
 
+from pydantic import BaseModel
 import requests
+from requests.adapters import HTTPAdapter
 
-def post_request(url : str, data : Dict[str, Any], session : Optional[requests.Session] = None) -> requests.Response:
+from ..exceptions import RosettaError
+from ..models import construct_model
+from .codec import decode_response, get_codec
+from .coalescing import SingleFlight
+from .concurrency import ordered_map
+from . import deadline
+from .deadline import DEFAULT_TIMEOUT, Timeout
+from .hedging import HedgePolicy, hedged
+from .retry import DEFAULT_RETRY, NO_RETRY, RetryPolicy
+from .store import BlockStore
+from .throttle import Throttle
+
+M = TypeVar('M', bound=BaseModel)
+
+_NO_THROTTLE = Throttle()
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+class RosettaSession(requests.Session):
+    """
+    A requests session that also carries the options of how the
+    responses of a Rosetta node should be handled. Any plain
+    requests.Session can be used in its place, and behaves as
+    a RosettaSession with the default options, see `session_option`.
+
+    Attributes
+    ----------
+    validate: bool
+        Whether responses are validated into their models. If False
+        the models are built without validation, see `construct_model`,
+        which is much faster but only safe against a trusted node.
+        Defaults to True.
+    lazy_blocks: bool
+        Whether /block responses hold a LazyBlock, whose transactions are
+        only built when accessed. Defaults to False.
+    retry: RetryPolicy, optional
+        When and how failed requests are retried. None disables
+        retries. Defaults to `RetryPolicy()`, see `utils.retry`.
+    hedge: HedgePolicy, optional
+        When slow read-only requests are sent again on another connection,
+        see `utils.hedging`. None, the default, disables hedging.
+    single_flight: SingleFlight, optional
+        Shares one call, and its parsed result, between identical read requests
+        made concurrently, see `utils.coalescing`. Set by passing `coalesce=True`.
+        Defaults to None, no coalescing.
+    throttle: Throttle, optional
+        Limits the rate and the concurrency of the requests, see
+        `utils.throttle`. Defaults to None, no limits.
+    timeout: float | tuple[float, float], optional
+        The (connect, read) timeout of every request, in seconds, shortened to
+        the deadline around the call if any, see `utils.deadline`. None waits
+        forever. Defaults to (10, 60).
+    block_store: BlockStore, optional
+        Persists the /block and /block/transaction responses of final blocks,
+        which are then read from disk rather than requested again, see
+        `utils.store`. Defaults to None.
+    """
+    validate = True
+    lazy_blocks = False
+    retry = DEFAULT_RETRY
+    hedge = None
+    single_flight = None
+    throttle = None
+    timeout = DEFAULT_TIMEOUT
+    block_store = None
+
+    def __init__(self, validate : bool = True, lazy_blocks : bool = False, retry : Optional[RetryPolicy] = DEFAULT_RETRY,
+                 hedge : Optional[HedgePolicy] = None, coalesce : bool = False, throttle : Optional[Throttle] = None,
+                 timeout : Optional[Timeout] = DEFAULT_TIMEOUT, block_store : Optional[BlockStore] = None) -> None:
+        super().__init__()
+        self.validate = validate
+        self.lazy_blocks = lazy_blocks
+        self.retry = retry
+        self.hedge = hedge
+        self.single_flight = SingleFlight() if coalesce else None
+        self.throttle = throttle
+        self.timeout = timeout
+        self.block_store = block_store
+
+def session_option(session : Optional[requests.Session], name : str):
+    """
+    Get an option of a RosettaSession, falling back to its default
+    for plain requests sessions or no session at all.
+
+    Parameters
+    ----------
+    session: requests.Session, optional
+    name: str
+        The name of the RosettaSession attribute.
+    """
+    return getattr(session, name, getattr(RosettaSession, name))
+
+def make_session(pool_connections : int = 10, pool_maxsize : int = 10, keep_alive : bool = True,
+                 validate : bool = True, lazy_blocks : bool = False,
+                 retry : Optional[RetryPolicy] = DEFAULT_RETRY, hedge : Optional[HedgePolicy] = None,
+                 coalesce : bool = False, throttle : Optional[Throttle] = None,
+                 timeout : Optional[Timeout] = DEFAULT_TIMEOUT, block_store : Optional[BlockStore] = None) -> RosettaSession:
+    """
+    Create a session with a connection pool sized for
+    concurrent use.
+
+    Parameters
+    ----------
+    pool_connections: int
+        The number of hosts to keep a connection pool for.
+    pool_maxsize: int
+        The maximum number of connections kept open to a single host.
+        This should be at least the number of requests expected to be
+        in flight at once.
+    keep_alive: bool
+        Whether connections are reused across requests. If False every
+        request asks the node to close its connection afterwards.
+    validate: bool
+        Whether responses are validated into their models. See `RosettaSession`.
+    lazy_blocks: bool
+        Whether /block responses hold a LazyBlock. See `RosettaSession`.
+    retry: RetryPolicy, optional
+        When and how failed requests are retried. See `RosettaSession`.
+    hedge: HedgePolicy, optional
+        When slow read-only requests are hedged. See `RosettaSession`.
+    coalesce: bool
+        Whether identical concurrent read requests share one call. See `RosettaSession`.
+    throttle: Throttle, optional
+        Limits the rate and the concurrency of the requests. See `RosettaSession`.
+    timeout: float | tuple[float, float], optional
+        The (connect, read) timeout of every request. See `RosettaSession`.
+    block_store: BlockStore, optional
+        Persists the responses of final blocks. See `RosettaSession`.
+
+    Returns
+    -------
+    RosettaSession
+    """
+    session = RosettaSession(validate, lazy_blocks, retry, hedge, coalesce, throttle, timeout, block_store)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+def shared_session() -> RosettaSession:
+    """
+    The pooled session used by any request made without a session,
+    so that repeated module level calls reuse their connections.
+
+    Returns
+    -------
+    RosettaSession
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_session_lock:
+            if _shared_session is None:
+                _shared_session = make_session()
+    return _shared_session
+
+def prewarm(api_url : str, connections : int, session : Optional[requests.Session] = None) -> None:
+    """
+    Open up to `connections` connections to the node ahead of time by making
+    that many concurrent /network/list requests. This is best effort, any
+    failure is ignored and left to surface on the first real request.
+
+    Parameters
+    ----------
+    api_url: str
+        The url to the node's api.
+    connections: int
+        The number of connections to open.
+    session: requests.Session, optional
+        The session whose pool should be warmed, if None is provided
+        the shared session is used.
+    """
+    if connections < 1:
+        return
+    url = urljoin(api_url, 'network/list')
+
+    def _open(_):
+        try:
+            post_request(url, b'{}', session).close()
+        except (requests.RequestException, RosettaError, TimeoutError):
+            pass
+
+    for _ in ordered_map(_open, range(connections), connections):
+        pass
+
+def post_request(url : str, data : bytes, session : Optional[requests.Session] = None, stream : bool = False) -> requests.Response:
     """
     Post a request to the url with the given data,
     optionally using a provided session.
 
+    Failed requests are retried following the `retry` policy of the
+    session, and slow ones hedged following its `hedge` policy, see
+    `RosettaSession`. Every attempt times out following its `timeout`,
+    and none goes past the deadline around the call, see `utils.deadline`.
+
     Parameters
     ----------
     url: str
         The url to post to.
-    data: dict[str, Any]
-        The json data to include in the post request.
+    data: bytes
+        The serialized json data to include in the post request.
+        See `codec.encode_request`.
     session: requests.Session, optional
         The persistent session to use, if None is provided
-        a new one will be created and destroyed for the
-        individual call.
+        the pooled session shared by the whole process is used.
+    stream: bool
+        If True, the body isn't downloaded until it is read, ex: through
+        `iter_content`. The response must then be closed by the caller.
+
+    Returns
+    -------
+    requests.Response
+        A successful response.
+
+    Raises
+    ------
+    RosettaError: If the node answered with an `Error`.
+    DeadlineExceeded: If the deadline around the call passed.
+    requests.RequestException: If the request failed otherwise.
+    """
+    if session is None:
+        session = shared_session()
+    hedge = session_option(session, 'hedge')
+    endpoint = None if hedge is None or stream else hedge.endpoint(url)
+    if endpoint is None:
+        return _send(url, data, session, stream)
+    return hedged(lambda: _send(url, data, session, stream), 1 + hedge.max_hedges, hedge.delay(endpoint),
+                  discard=lambda resp: resp.close(), observe=lambda latency: hedge.observe(endpoint, latency))
+
+def _send(url : str, data : bytes, session : requests.Session, stream : bool) -> requests.Response:
+    """
+    Post the request, retrying it following the retry policy of the session,
+    and within the limits of its throttle.
     """
     headers = {
             'Content-Type': 'application/json'
     }
-    if session is not None:
-        return session.post(url, headers=headers, data=data)
-    return requests.post(url, headers=headers, data=data)
+    policy = session_option(session, 'retry') or NO_RETRY
+    throttle = session_option(session, 'throttle') or _NO_THROTTLE
+    timeout = session_option(session, 'timeout')
+    attempt = 0
+    while True:
+        attempt += 1
+        token = throttle.acquire()
+        try:
+            request_timeout = deadline.request_timeout(timeout)
+            resp = session.post(url, headers=headers, data=data, stream=stream, timeout=request_timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            throttle.release(token)
+            deadline.check()
+            delay = policy.delay(attempt)
+            if not policy.should_retry(url, attempt) or not deadline.allows(delay):
+                raise
+            time.sleep(delay)
+            continue
+        except BaseException:
+            throttle.cancel(token)
+            raise
+        if resp.ok:
+            throttle.release(token, resp.status_code)
+            return resp
+        error = response_error(resp)
+        retriable = error.retriable if isinstance(error, RosettaError) else None
+        throttle.release(token, resp.status_code, retriable)
+        delay = policy.delay(attempt, resp.headers.get('Retry-After'))
+        if not policy.should_retry(url, attempt, resp.status_code, retriable) or not deadline.allows(delay):
+            raise error
+        resp.close()
+        time.sleep(delay)
+
+def response_error(resp : requests.Response) -> Exception:
+    """
+    The exception describing an unsuccessful response.
+
+    Parameters
+    ----------
+    resp: requests.Response
+
+    Returns
+    -------
+    RosettaError
+        If the body is a Rosetta `Error`.
+    requests.HTTPError
+        Otherwise.
+    """
+    try:
+        body = get_codec().loads(resp.content)
+    except ValueError:
+        body = None
+    error = RosettaError.from_body(body, resp.status_code, resp.url)
+    if error is not None:
+        return error
+    try:
+        resp.raise_for_status()
+    except requests.HTTPError as e:
+        return e
+    return requests.HTTPError("{} from {}".format(resp.status_code, resp.url), response=resp)
+
+def parse_response(response_model : Type[M], resp : requests.Response, session : Optional[requests.Session] = None) -> M:
+    """
+    Decode the body of a response into the response model, validating
+    it unless the session was made with `validate=False`.
+
+    Parameters
+    ----------
+    response_model: Type[BaseModel]
+    resp: requests.Response
+    session: requests.Session, optional
+        The session the request was made with.
+
+    Returns
+    -------
+    An instance of `response_model`.
+    """
+    return load_model(response_model, decode_response(resp), session)
+
+def load_model(model : Type[M], data : Any, session : Optional[requests.Session] = None) -> M:
+    """
+    Build the model out of decoded json, validating it unless
+    the session was made with `validate=False`.
+
+    Parameters
+    ----------
+    model: Type[BaseModel]
+    data: Any
+    session: requests.Session, optional
+
+    Returns
+    -------
+    An instance of `model`.
+    """
+    if session_option(session, 'validate'):
+        return model(**data)
+    return construct_model(model, data)
@@ -0,0 +1,57 @@
+"""
+Helpers for keeping a bounded number of blocking requests in flight.
+"""
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+def ordered_map(fn : Callable[[T], R], items : Iterable[T], concurrency : int = 8) -> Iterator[R]:
+    """
+    Lazily apply `fn` to every item on a pool of threads, keeping at most
+    `concurrency` calls in flight, and yield the results in the order of
+    the items.
+
+    Items are only pulled from `items` as room frees up, so this is safe
+    to use with very long or unbounded iterables. If the consumer stops
+    early, any calls that haven't started are cancelled.
+
+    Each call runs in a copy of the context it was submitted from, so
+    context variables, ex: a deadline, carry over to the threads.
+
+    Parameters
+    ----------
+    fn: Callable[[T], R]
+    items: Iterable[T]
+    concurrency: int
+        The maximum number of calls to `fn` in flight at once.
+
+    Yields
+    ------
+    R
+
+    Raises
+    ------
+    ValueError: If concurrency is less than 1.
+    """
+    if concurrency < 1:
+        raise ValueError("`concurrency` must be at least 1.")
+    items = iter(items)
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    pending = deque()
+    try:
+        for item in islice(items, concurrency):
+            pending.append(pool.submit(contextvars.copy_context().run, fn, item))
+        while pending:
+            result = pending.popleft().result()
+            for item in islice(items, 1):
+                pending.append(pool.submit(contextvars.copy_context().run, fn, item))
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False)
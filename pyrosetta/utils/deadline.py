@@ -0,0 +1,114 @@
+"""
+Timeouts of single requests, and deadlines bounding how long a block
+of calls can take end to end.
+
+A deadline is set for the current context, so every request made within it,
+including the sub-calls of helpers such as `network.discover` and the
+requests made on worker threads by `concurrency.ordered_map`, shares it.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Tuple, TypeVar, Union
+
+from ..exceptions import DeadlineExceeded
+
+T = TypeVar('T')
+
+Timeout = Union[float, Tuple[float, float]]
+
+DEFAULT_TIMEOUT = (10.0, 60.0)
+
+_deadline : contextvars.ContextVar = contextvars.ContextVar('pyrosetta_deadline', default=None)
+
+@contextmanager
+def deadline(seconds : float) -> Iterator[None]:
+    """
+    Bound every request made within the block, ex:
+
+        with deadline(2.5):
+            status = api.current_network_status()
+            block = api.block_on_current_network(status.current_block_identifier.index)
+
+    Once the deadline passes, requests in flight time out and new ones raise
+    DeadlineExceeded. Nested deadlines can only shorten the outer one.
+
+    Parameters
+    ----------
+    seconds: float
+        How long from now the calls can take.
+    """
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """
+    The time left, in seconds, before the deadline of the current
+    context, or None if there is no deadline.
+    """
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - time.monotonic()
+
+def check() -> None:
+    """
+    Raises
+    ------
+    DeadlineExceeded: If the deadline of the current context has passed.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("The deadline passed {:.3f}s ago.".format(-left))
+
+def request_timeout(timeout : Optional[Timeout]) -> Optional[Tuple[Optional[float], Optional[float]]]:
+    """
+    The (connect, read) timeout of the next request, shortened to the
+    time left before the deadline.
+
+    Parameters
+    ----------
+    timeout: float | tuple[float, float], optional
+        The timeout configured for the session.
+
+    Returns
+    -------
+    tuple[float, float], optional
+
+    Raises
+    ------
+    DeadlineExceeded: If the deadline has passed.
+    """
+    if timeout is None or isinstance(timeout, tuple):
+        connect, read = timeout or (None, None)
+    else:
+        connect = read = timeout
+    left = remaining()
+    if left is None:
+        return None if timeout is None else (connect, read)
+    check()
+    return (left if connect is None else min(connect, left), left if read is None else min(read, left))
+
+def allows(delay : float) -> bool:
+    """
+    Whether there is more than `delay` seconds left before the deadline
+    of the current context, ex: to wait before retrying a request.
+    """
+    left = remaining()
+    return left is None or left > delay
+
+def bounded(items : Iterable[T]) -> Iterator[T]:
+    """
+    Yield the items, ex: the chunks of a streamed response, checking
+    the deadline of the current context before each one.
+    """
+    for item in items:
+        check()
+        yield item
@@ -0,0 +1,198 @@
+"""
+Hedged requests: when a read hasn't been answered within a delay, send
+the same request again and keep whichever answer comes first.
+"""
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+
+R = TypeVar('R')
+
+HEDGEABLE_ENDPOINTS = ('block', 'block/transaction', 'account/balance', 'network/status')
+
+class HedgePolicy(object):
+    """
+    When and how often read-only requests are hedged.
+
+    The delay before a hedge is the `percentile` of the recent latencies of
+    the endpoint, so only the slowest requests get hedged, ex: at the 95th
+    percentile about 5% of requests are sent twice. Until `min_samples`
+    latencies have been seen, `initial_delay` is used instead.
+
+    Only read-only endpoints can be hedged, construction endpoints never are.
+    """
+
+    def __init__(self, percentile : float = 0.95, initial_delay : float = 0.5, min_delay : float = 0.01,
+                 max_delay : float = 5.0, max_hedges : int = 1, endpoints : Iterable[str] = HEDGEABLE_ENDPOINTS,
+                 window : int = 1000, min_samples : int = 20) -> None:
+        """
+        Parameters
+        ----------
+        percentile: float
+            The percentile, from 0 to 1, of the latencies of an endpoint
+            after which its requests are hedged. Defaults to 0.95.
+        initial_delay: float
+            The delay, in seconds, used until enough latencies have been seen.
+            Defaults to 0.5.
+        min_delay: float
+            The shortest delay, in seconds. Defaults to 0.01.
+        max_delay: float
+            The longest delay, in seconds. Defaults to 5.
+        max_hedges: int
+            The maximum number of extra requests sent for a request. Each one is
+            sent after another delay without an answer. Defaults to 1.
+        endpoints: Iterable[str]
+            The endpoints whose requests are hedged. Defaults to /block,
+            /block/transaction, /account/balance and /network/status.
+        window: int
+            The number of recent latencies kept per endpoint. Defaults to 1000.
+        min_samples: int
+            The number of latencies needed before the percentile is used.
+            Defaults to 20.
+
+        Raises
+        ------
+        ValueError: If a construction endpoint is given, or `percentile` isn't within [0, 1].
+        """
+        endpoints = tuple(endpoint.strip('/') for endpoint in endpoints)
+        if any(endpoint.startswith('construction') for endpoint in endpoints):
+            raise ValueError("Construction endpoints can't be hedged.")
+        if not 0 <= percentile <= 1:
+            raise ValueError("`percentile` needs to be within [0, 1].")
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_hedges = max_hedges
+        self.endpoints = endpoints
+        self.window = window
+        self.min_samples = min_samples
+        self._latencies : Dict[str, deque] = {endpoint: deque(maxlen=window) for endpoint in endpoints}
+
+    def endpoint(self, url : str) -> Optional[str]:
+        """
+        The hedged endpoint the url points to, if any.
+
+        Parameters
+        ----------
+        url: str
+            The full url of the endpoint, ex: 'http://node:8080/block'.
+        """
+        url = url.rstrip('/')
+        for endpoint in self.endpoints:
+            if url.endswith('/' + endpoint):
+                return endpoint
+        return None
+
+    def observe(self, endpoint : str, latency : float) -> None:
+        """
+        Record how long, in seconds, a request to the endpoint took to be answered.
+        """
+        self._latencies[endpoint].append(latency)
+
+    def delay(self, endpoint : str) -> float:
+        """
+        How long, in seconds, to wait for an answer before hedging a request to the endpoint.
+        """
+        latencies = list(self._latencies[endpoint])
+        if len(latencies) < self.min_samples:
+            delay = self.initial_delay
+        else:
+            latencies.sort()
+            delay = latencies[min(len(latencies) - 1, int(self.percentile * len(latencies)))]
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    def __repr__(self) -> str:
+        return "HedgePolicy(percentile={}, max_hedges={}, endpoints={})".format(self.percentile, self.max_hedges, self.endpoints)
+
+def hedged(attempt : Callable[[], R], attempts : int, delay : float,
+           discard : Optional[Callable[[R], None]] = None,
+           observe : Optional[Callable[[float], None]] = None) -> R:
+    """
+    Call `attempt` on a thread, and call it again on another thread every
+    `delay` seconds without an answer, up to `attempts` calls in total. A
+    failed call also starts the next one straight away.
+
+    The first successful call wins. Blocking calls can't be interrupted, so the
+    others are left to finish in the background and their results are passed
+    to `discard`, ex: to close a response.
+
+    Parameters
+    ----------
+    attempt: Callable[[], R]
+    attempts: int
+        The maximum number of calls.
+    delay: float
+        In seconds.
+    discard: Callable[[R], None], optional
+        Called with the result of every successful call that didn't win.
+    observe: Callable[[float], None], optional
+        Called with how long the first successful call took to answer,
+        counting from the start of the first call.
+
+    Returns
+    -------
+    R
+        The result of the first successful call.
+
+    Raises
+    ------
+    The error of the last call, if every call failed.
+    """
+    results = queue.Queue()
+    lock = threading.Lock()
+    won = []
+
+    def _run():
+        try:
+            result = attempt()
+        except BaseException as e:
+            results.put((False, e))
+            return
+        with lock:
+            if won:
+                if discard is not None:
+                    discard(result)
+                return
+            results.put((True, result))
+
+    def _start():
+        # Each call runs in a copy of the caller's context, ex: its deadline.
+        threading.Thread(target=contextvars.copy_context().run, args=(_run,), daemon=True).start()
+
+    # Start the first call, then wait for an answer, starting another call
+    # whenever the delay passes or a call fails.
+    start = time.monotonic()
+    _start()
+    started = 1
+    finished = 0
+    while True:
+        try:
+            ok, value = results.get(timeout=delay if started < attempts else None)
+        except queue.Empty:
+            _start()
+            started += 1
+            continue
+        finished += 1
+        if ok:
+            with lock:
+                won.append(value)
+                leftovers = []
+                while not results.empty():
+                    leftovers.append(results.get_nowait())
+            if discard is not None:
+                for ok, other in leftovers:
+                    if ok:
+                        discard(other)
+            if observe is not None:
+                observe(time.monotonic() - start)
+            return value
+        error = value
+        if started < attempts:
+            _start()
+            started += 1
+        elif finished == started:
+            raise error
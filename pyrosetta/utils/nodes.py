@@ -0,0 +1,242 @@
+"""
+Health tracking and selection of the nodes of a multi-node client.
+"""
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+class Node(object):
+    """
+    A node of a NodePool, and what is known about its health.
+
+    Attributes
+    ----------
+    url: str
+        The url where the node is located.
+    latency: float
+        Moving average of the duration of its successful requests, in seconds.
+    error_rate: float
+        Moving average of the share of its requests that failed, from 0 to 1.
+    failures: int
+        The number of its requests that failed in a row.
+    ejections: int
+        The number of times in a row it was ejected.
+    ejected_until: float
+        When it can be sent requests again, on the clock of the pool.
+    in_flight: int
+        The number of its requests currently in flight.
+    """
+
+    def __init__(self, url : str) -> None:
+        self.url = url
+        self.latency = 0.0
+        self.error_rate = 0.0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.in_flight = 0
+        # network key -> (tip height, when it was seen)
+        self.tips = {}
+
+    def score(self) -> float:
+        """
+        The cost of sending the node one more request, lower is better.
+        """
+        return (self.latency + 0.001) * (1 + self.in_flight) * (1 + 4 * self.error_rate)
+
+    def __repr__(self) -> str:
+        return "Node({!r}, latency={:.3f}, error_rate={:.2f}, in_flight={})".format(
+            self.url, self.latency, self.error_rate, self.in_flight)
+
+class NodePool(object):
+    """
+    Keeps a health score for each node of a multi-node client and picks which
+    node a request is sent to.
+
+    Requests go to the better scored of two random nodes, so load spreads across
+    healthy nodes while slow or failing ones get less of it. A node that fails
+    `eject_after` requests in a row is ejected for `eject_for` seconds, doubled
+    for every ejection in a row up to `max_eject_for`. Once that time has passed
+    it is re-admitted on probation: one more failure ejects it again, while a
+    success fully re-admits it.
+
+    The pool also remembers the tip of every node per network, so block reads
+    can be limited to the nodes that have reached the requested height.
+    """
+
+    def __init__(self, urls : Iterable[str], eject_after : int = 3, eject_for : float = 5.0,
+                 max_eject_for : float = 60.0, tip_ttl : float = 5.0, smoothing : float = 0.2,
+                 clock : Callable[[], float] = time.monotonic) -> None:
+        """
+        Parameters
+        ----------
+        urls: Iterable[str]
+            The urls of the nodes.
+        eject_after: int
+            The number of failures in a row that eject a node. Defaults to 3.
+        eject_for: float
+            How long, in seconds, a node is first ejected for. Defaults to 5.
+        max_eject_for: float
+            The longest, in seconds, a node is ejected for. Defaults to 60.
+        tip_ttl: float
+            How long, in seconds, the tip of a node is trusted before it is
+            checked again. Defaults to 5.
+        smoothing: float
+            The weight of the latest request in the latency and error rate
+            moving averages. Defaults to 0.2.
+        clock: Callable[[], float]
+            The clock the times are measured on.
+
+        Raises
+        ------
+        ValueError: If no url is given.
+        """
+        self.nodes = [Node(url) for url in urls]
+        if not self.nodes:
+            raise ValueError("At least one node url is needed.")
+        self.eject_after = eject_after
+        self.eject_for = eject_for
+        self.max_eject_for = max_eject_for
+        self.tip_ttl = tip_ttl
+        self.smoothing = smoothing
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    def candidates(self, exclude : Iterable[Node] = ()) -> List[Node]:
+        """
+        The nodes requests can be sent to, ie. the ones that aren't ejected. If
+        every node is ejected, the one whose ejection ends first is used rather
+        than failing outright.
+
+        Parameters
+        ----------
+        exclude: Iterable[Node]
+            Nodes to leave out, ex: the ones a request already failed on.
+
+        Returns
+        -------
+        list[Node]
+            Empty only if every node is excluded.
+        """
+        exclude = set(id(node) for node in exclude)
+        nodes = [node for node in self.nodes if id(node) not in exclude]
+        now = self._clock()
+        available = [node for node in nodes if node.ejected_until <= now]
+        if available or not nodes:
+            return available
+        return [min(nodes, key=lambda node: node.ejected_until)]
+
+    def choose(self, nodes : List[Node]) -> Node:
+        """
+        The better scored of two random nodes.
+
+        Parameters
+        ----------
+        nodes: list[Node]
+            The candidates, see `candidates`.
+
+        Returns
+        -------
+        Node
+        """
+        if len(nodes) == 1:
+            return nodes[0]
+        a, b = random.sample(nodes, 2)
+        return a if a.score() <= b.score() else b
+
+    def tip(self, node : Node, network : bytes) -> Optional[int]:
+        """
+        The last known tip height of a node on a network.
+        """
+        tip = node.tips.get(network)
+        return None if tip is None else tip[0]
+
+    def set_tip(self, url : str, network : bytes, height : int) -> None:
+        """
+        Record the tip height of the node at the url on a network.
+        """
+        for node in self.nodes:
+            if node.url == url:
+                node.tips[network] = (height, self._clock())
+
+    def covering(self, nodes : List[Node], network : bytes, height : int) -> List[Node]:
+        """
+        The nodes whose known tip on the network is at least `height`.
+        """
+        return [node for node in nodes if (self.tip(node, network) or -1) >= height]
+
+    def stale(self, nodes : List[Node], network : bytes) -> List[Node]:
+        """
+        The nodes whose tip on the network is unknown or older than `tip_ttl`.
+        """
+        now = self._clock()
+        return [node for node in nodes if network not in node.tips or now - node.tips[network][1] >= self.tip_ttl]
+
+    def highest(self, nodes : List[Node], network : bytes) -> Node:
+        """
+        The node with the highest known tip on the network.
+        """
+        return max(nodes, key=lambda node: self.tip(node, network) or -1)
+
+    def begin(self, node : Node) -> float:
+        """
+        Record the start of a request to the node.
+
+        Returns
+        -------
+        float
+            The start time, to pass on to `success` or `failure`.
+        """
+        with self._lock:
+            node.in_flight += 1
+        return self._clock()
+
+    def success(self, node : Node, start : float) -> None:
+        """
+        Record that a request to the node succeeded, fully re-admitting it if it was ejected.
+        """
+        now = self._clock()
+        with self._lock:
+            node.in_flight -= 1
+            node.latency += self.smoothing * ((now - start) - node.latency)
+            node.error_rate -= self.smoothing * node.error_rate
+            node.failures = 0
+            node.ejections = 0
+
+    def failure(self, node : Node, start : float) -> None:
+        """
+        Record that a request to the node failed, ejecting it if it failed
+        `eject_after` requests in a row, or if it was on probation.
+        """
+        now = self._clock()
+        with self._lock:
+            node.in_flight -= 1
+            node.error_rate += self.smoothing * (1 - node.error_rate)
+            node.failures += 1
+            if node.failures >= self.eject_after and node.ejected_until <= now:
+                node.ejections += 1
+                node.ejected_until = now + min(self.max_eject_for, self.eject_for * 2 ** (node.ejections - 1))
+
+    def cancel(self, node : Node) -> None:
+        """
+        Record that a request to the node was given up on by the caller, ex: its
+        deadline passed, which says nothing about the health of the node.
+        """
+        with self._lock:
+            node.in_flight -= 1
+
+    def health(self) -> Dict[str, Dict[str, float]]:
+        """
+        A snapshot of the health of every node, keyed by url.
+        """
+        now = self._clock()
+        return {
+            node.url: {
+                'latency': node.latency,
+                'error_rate': node.error_rate,
+                'in_flight': node.in_flight,
+                'ejected': node.ejected_until > now
+            }
+            for node in self.nodes
+        }
@@ -0,0 +1,138 @@
+"""
+When and how long to wait before retrying a request to a node.
+"""
+import random
+from typing import Dict, Iterable, Optional
+
+RETRY_STATUSES = (429, 502, 503, 504)
+
+# A submitted transaction may have reached the node even though the request
+# timed out or the proxy answered 502/503/504, and resending it isn't always
+# harmless, so it is only sent once unless a budget says otherwise.
+DEFAULT_BUDGETS = {'construction/submit': 1}
+
+class RetryPolicy(object):
+    """
+    Retry a request when the node reports a retriable `Error`, answers with
+    one of `statuses` (ex: 503 from an overloaded node or its proxy), or the
+    connection fails. Retries back off exponentially with full jitter, ie.
+    the n-th retry waits a random time between 0 and
+    `min(max_backoff, backoff * 2 ** (n - 1))`, so that many clients
+    retrying at once don't hit the node in lockstep.
+
+    Errors the node doesn't mark as retriable are never retried, and
+    neither is /construction/submit unless given a budget, see `DEFAULT_BUDGETS`.
+    """
+
+    def __init__(self, max_attempts : int = 4, backoff : float = 0.25, max_backoff : float = 10.0,
+                 statuses : Iterable[int] = RETRY_STATUSES, budgets : Optional[Dict[str, int]] = None,
+                 retry_connection_errors : bool = True) -> None:
+        """
+        Parameters
+        ----------
+        max_attempts: int
+            The maximum number of times a request is sent, including
+            the first one. Defaults to 4.
+        backoff: float
+            The upper bound, in seconds, of the wait before the first retry.
+            It doubles with every retry. Defaults to 0.25.
+        max_backoff: float
+            The cap, in seconds, of any single wait, including
+            waits asked for through a Retry-After header. Defaults to 10.
+        statuses: Iterable[int]
+            The HTTP statuses retried even without a retriable `Error`
+            in the body. Defaults to 429, 502, 503 and 504.
+        budgets: dict[str, int], optional
+            The maximum number of attempts of individual endpoints, overriding
+            `max_attempts`. Ex: {'block': 8}. They are added to `DEFAULT_BUDGETS`,
+            so /construction/submit is attempted once unless it is given its own,
+            ex: {'construction/submit': 3}.
+        retry_connection_errors: bool
+            Whether requests that failed to connect or timed out are retried.
+            Defaults to True.
+
+        Raises
+        ------
+        ValueError: If `max_attempts` or a budget is lower than 1.
+        """
+        budgets = {endpoint.strip('/'): attempts for endpoint, attempts in dict(DEFAULT_BUDGETS, **(budgets or {})).items()}
+        if max_attempts < 1 or any(attempts < 1 for attempts in budgets.values()):
+            raise ValueError("Every request needs to be attempted at least once.")
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.budgets = budgets
+        self.retry_connection_errors = retry_connection_errors
+
+    def attempts(self, url : str) -> int:
+        """
+        The maximum number of attempts of a request to the url.
+
+        Parameters
+        ----------
+        url: str
+            The full url of the endpoint, ex: 'http://node:8080/block'.
+        """
+        for endpoint, attempts in self.budgets.items():
+            if url.rstrip('/').endswith('/' + endpoint):
+                return attempts
+        return self.max_attempts
+
+    def should_retry(self, url : str, attempt : int, status_code : Optional[int] = None, retriable : Optional[bool] = None) -> bool:
+        """
+        Whether a failed attempt should be retried.
+
+        Parameters
+        ----------
+        url: str
+        attempt: int
+            The number of the attempt that failed, starting at 1.
+        status_code: int, optional
+            The HTTP status of the response, None if no response was received.
+        retriable: bool, optional
+            The `retriable` flag of the `Error` in the response, None if the
+            response didn't hold one.
+
+        Returns
+        -------
+        bool
+        """
+        if attempt >= self.attempts(url):
+            return False
+        if status_code is None:
+            return self.retry_connection_errors
+        if retriable is not None:
+            return retriable
+        return status_code in self.statuses
+
+    def delay(self, attempt : int, retry_after : Optional[str] = None) -> float:
+        """
+        The time to wait before the next attempt.
+
+        Parameters
+        ----------
+        attempt: int
+            The number of the attempt that failed, starting at 1.
+        retry_after: str, optional
+            The Retry-After header of the response, if any. Only the
+            delay in seconds form is supported.
+
+        Returns
+        -------
+        float
+            In seconds.
+        """
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_backoff)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def __repr__(self) -> str:
+        return "RetryPolicy(max_attempts={}, backoff={}, max_backoff={}, statuses={}, budgets={})".format(
+            self.max_attempts, self.backoff, self.max_backoff, sorted(self.statuses), self.budgets)
+
+DEFAULT_RETRY = RetryPolicy()
+NO_RETRY = RetryPolicy(max_attempts=1)
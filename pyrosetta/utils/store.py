@@ -0,0 +1,231 @@
+"""
+A persistent, on-disk store of final blocks, so that repeated passes over
+a historical range of blocks only download each block once.
+"""
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Optional
+
+from ..models import BlockIdentifier, NetworkIdentifier, PartialBlockIdentifier, TransactionIdentifier
+from .codec import get_codec
+from .coalescing import request_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    network TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (network, hash)
+);
+CREATE TABLE IF NOT EXISTS heights (
+    network TEXT NOT NULL,
+    height INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (network, height)
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    network TEXT NOT NULL,
+    block_hash TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    body BLOB NOT NULL,
+    PRIMARY KEY (network, block_hash, hash)
+);
+"""
+
+class BlockStore(object):
+    """
+    A SQLite database of the raw /block and /block/transaction responses of
+    final blocks, indexed by network, height and hash. Plugged into a session,
+    see `communication.RosettaSession`, it is read before and written after
+    every /block and /block/transaction request.
+
+    Only blocks at least `finality_depth` blocks below the tip of their network
+    are stored, since anything closer could still be reorganized away. The tip
+    is the highest height seen in /network/status responses or in the blocks.
+    A block requested by hash may be an orphan, so it is only found by height
+    once the block at that height has been requested by index.
+
+    It can be shared by threads, each call holding the database for its duration.
+    """
+
+    def __init__(self, path : str, finality_depth : int = 10, compress : bool = True) -> None:
+        """
+        Parameters
+        ----------
+        path: str
+            The path to the database file, created if it doesn't exist.
+            ':memory:' keeps the store in memory.
+        finality_depth: int
+            How many blocks below the tip a block needs to be to be stored.
+            Defaults to 10, set it for the chain, ex: 6 on Bitcoin.
+        compress: bool
+            Whether the responses are compressed with zlib, which shrinks
+            blocks several times over at a small cost. Defaults to True.
+        """
+        self.path = path
+        self.finality_depth = finality_depth
+        self.compress = compress
+        self._tips : Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.executescript(_SCHEMA)
+
+    def _encode(self, body : bytes) -> bytes:
+        return zlib.compress(body, 1) if self.compress else body
+
+    def _decode(self, body : bytes) -> Any:
+        # Compressed bodies always start with the zlib header, while json can't
+        # start with 0x78, so stores written either way can be read back.
+        if body[:1] == b'\x78':
+            body = zlib.decompress(body)
+        return get_codec().loads(body)
+
+    def observe_tip(self, network_id : NetworkIdentifier, index : int) -> None:
+        """
+        Record a height the network has reached, ex: the current block of a
+        /network/status response.
+        """
+        network = request_key(network_id)
+        with self._lock:
+            if index > self._tips.get(network, -1):
+                self._tips[network] = index
+
+    def has_tip(self, network_id : NetworkIdentifier) -> bool:
+        """
+        Whether any height of the network has been seen.
+        """
+        return request_key(network_id) in self._tips
+
+    def final(self, network_id : NetworkIdentifier, index : int) -> bool:
+        """
+        Whether the block at the height is deep enough below the tip to be stored.
+        """
+        return self._tips.get(request_key(network_id), -1) - index >= self.finality_depth
+
+    def get_block(self, network_id : NetworkIdentifier, block_id : PartialBlockIdentifier) -> Optional[Dict[str, Any]]:
+        """
+        The decoded /block response of the block, if it is stored.
+
+        Parameters
+        ----------
+        network_id: NetworkIdentifier
+        block_id: PartialBlockIdentifier
+            By index, hash or both.
+
+        Returns
+        -------
+        dict[str, Any], optional
+        """
+        network = request_key(network_id)
+        if block_id.hash_ is not None:
+            query = 'SELECT height, body FROM blocks WHERE network = ? AND hash = ?'
+            args = (network, block_id.hash_)
+        elif block_id.index is not None:
+            query = ('SELECT blocks.height, blocks.body FROM heights JOIN blocks ON blocks.network = heights.network '
+                     'AND blocks.hash = heights.hash WHERE heights.network = ? AND heights.height = ?')
+            args = (network, block_id.index)
+        else:
+            return None
+        with self._lock:
+            row = self._db.execute(query, args).fetchone()
+        if row is None or (block_id.index is not None and row[0] != block_id.index):
+            return None
+        return self._decode(row[1])
+
+    def put_block(self, network_id : NetworkIdentifier, block_id : BlockIdentifier, body : bytes, canonical : bool = False) -> bool:
+        """
+        Store the raw /block response of the block, if it is final.
+
+        Parameters
+        ----------
+        network_id: NetworkIdentifier
+        block_id: BlockIdentifier
+            The identifier of the block in the response.
+        body: bytes
+            The json body of the response.
+        canonical: bool
+            Whether the block is the one the node holds at its height, ie. it was
+            requested by index alone, so it can be looked up by height. Defaults to False.
+
+        Returns
+        -------
+        bool
+            Whether the block was stored.
+        """
+        self.observe_tip(network_id, block_id.index)
+        if not self.final(network_id, block_id.index):
+            return False
+        body = self._encode(body)
+        network = request_key(network_id)
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO blocks VALUES (?, ?, ?, ?)', (network, block_id.index, block_id.hash_, body))
+            if canonical:
+                self._db.execute('INSERT OR REPLACE INTO heights VALUES (?, ?, ?)', (network, block_id.index, block_id.hash_))
+        return True
+
+    def get_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier,
+                        transaction_id : TransactionIdentifier) -> Optional[Dict[str, Any]]:
+        """
+        The decoded /block/transaction response of the transaction, if it or
+        its whole block is stored.
+
+        Returns
+        -------
+        dict[str, Any], optional
+        """
+        network = request_key(network_id)
+        with self._lock:
+            row = self._db.execute('SELECT body FROM transactions WHERE network = ? AND block_hash = ? AND hash = ?',
+                                   (network, block_id.hash_, transaction_id.hash_)).fetchone()
+        if row is not None:
+            return self._decode(row[0])
+        block = self.get_block(network_id, PartialBlockIdentifier(index=block_id.index, hash=block_id.hash_))
+        if block is None:
+            return None
+        for transaction in (block.get('block') or {}).get('transactions') or ():
+            if transaction['transaction_identifier']['hash'] == transaction_id.hash_:
+                return {'transaction': transaction}
+        return None
+
+    def put_transaction(self, network_id : NetworkIdentifier, block_id : BlockIdentifier,
+                        transaction_id : TransactionIdentifier, body : bytes) -> bool:
+        """
+        Store the raw /block/transaction response of the transaction, if its block is final.
+
+        Returns
+        -------
+        bool
+            Whether the transaction was stored.
+        """
+        self.observe_tip(network_id, block_id.index)
+        if not self.final(network_id, block_id.index):
+            return False
+        body = self._encode(body)
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?)',
+                             (request_key(network_id), block_id.hash_, transaction_id.hash_, body))
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self) -> 'BlockStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        The number of blocks stored.
+        """
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM blocks').fetchone()[0]
+
+    def __repr__(self) -> str:
+        return "BlockStore({!r})".format(self.path)
@@ -0,0 +1,241 @@
+"""
+Incrementally pull the items of one array out of a json document,
+without ever holding the whole document in memory.
+"""
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+
+_TOKENS = re.compile(rb'[{}\[\]",:\\]')
+_STRING_TOKENS = re.compile(rb'["\\]')
+
+_QUOTE = ord('"')
+_BACKSLASH = ord('\\')
+_OPEN_OBJECT = ord('{')
+_OPEN_ARRAY = ord('[')
+_CLOSE = (ord('}'), ord(']'))
+_COLON = ord(':')
+_COMMA = ord(',')
+
+_WHITESPACE = ' \t\r\n'
+_SEPARATORS = _WHITESPACE + ','
+
+class JSONArrayScanner(object):
+    """
+    Scans a json document fed to it in chunks, and returns the decoded items of
+    the array at `path`, ex: ('block', 'transactions') for the transactions of a
+    /block response, as soon as each of them is complete. Memory use is bounded
+    by the size of the largest item and the chunks, rather than the size of the
+    document.
+
+    Everything up to the array is only tokenized to track where in the document
+    the scanner is, and everything after the array is ignored.
+    """
+
+    def __init__(self, path : Sequence[str]) -> None:
+        """
+        Parameters
+        ----------
+        path: Sequence[str]
+            The keys of the nested objects leading to the array.
+        """
+        self._path = [key.encode('utf-8') for key in path]
+        # [is object, last key seen] for every open container.
+        self._stack = []
+        self._expect_key = False
+        self._in_string = False
+        self._escaped = False
+        self._key = None
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = None
+        self._retry_at = 0
+        self._done = False
+
+    @property
+    def found(self) -> bool:
+        """
+        Whether the start of the array has been seen.
+        """
+        return self._buffer is not None
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the end of the array has been seen.
+        """
+        return self._done
+
+    def feed(self, chunk : bytes) -> List[Any]:
+        """
+        Parameters
+        ----------
+        chunk: bytes
+            The next part of the document.
+
+        Returns
+        -------
+        list[Any]
+            The items of the array completed by this chunk.
+        """
+        if self._done:
+            return []
+        if self._buffer is None:
+            start = self._find_array(chunk)
+            if start is None:
+                return []
+            self._buffer = ''
+            chunk = chunk[start:]
+        self._buffer += self._text.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        """
+        Signal the end of the document.
+
+        Returns
+        -------
+        list[Any]
+            Any items of the array still held back.
+
+        Raises
+        ------
+        ValueError: If the document ended inside the array.
+        """
+        items = []
+        if self._buffer is not None and not self._done:
+            self._retry_at = 0
+            items = self._drain(final=True)
+            if not self._done:
+                raise ValueError("The json document ended before the end of the array at {}.".format('.'.join(key.decode('utf-8') for key in self._path)))
+        return items
+
+    def _drain(self, final : bool = False) -> List[Any]:
+        items = []
+        buf = self._buffer
+        end = len(buf)
+        i = 0
+        while True:
+            while i < end and buf[i] in _SEPARATORS:
+                i += 1
+            if i >= end:
+                break
+            if buf[i] == ']':
+                self._done = True
+                break
+            if end < self._retry_at:
+                break
+            try:
+                item, item_end = self._decoder.raw_decode(buf, i)
+            except ValueError:
+                item_end = None
+            if item_end is not None and not final and not isinstance(item, (dict, list)):
+                # A number can stop anywhere, ex: `0.` or `2e`, so scalars are only
+                # complete once followed by the next item or the end of the array.
+                j = item_end
+                while j < end and buf[j] in _WHITESPACE:
+                    j += 1
+                if j == end or buf[j] not in ',]':
+                    item_end = None
+            if item_end is None:
+                # The item isn't complete yet. Wait for the buffer to double before
+                # trying again, so large items don't get decoded over and over.
+                self._retry_at = 2 * (end - i)
+                break
+            items.append(item)
+            i = item_end
+            self._retry_at = 0
+        self._buffer = '' if self._done else buf[i:]
+        return items
+
+    def _at_target(self) -> bool:
+        if len(self._stack) != len(self._path):
+            return False
+        return all(is_object and key == wanted for (is_object, key), wanted in zip(self._stack, self._path))
+
+    def _find_array(self, chunk : bytes) -> Optional[int]:
+        """
+        Tokenize the chunk until the start of the array.
+
+        Returns
+        -------
+        int, optional
+            The offset just past the opening bracket of the array, if
+            it is in the chunk.
+        """
+        stack = self._stack
+        pos = 0
+        if self._escaped:
+            self._escaped = False
+            pos = 1
+        key_start = 0
+        while True:
+            if self._in_string:
+                match = _STRING_TOKENS.search(chunk, pos)
+            else:
+                match = _TOKENS.search(chunk, pos)
+            if match is None:
+                break
+            start = match.start()
+            pos = start + 1
+            c = chunk[start]
+            if self._in_string:
+                if c == _BACKSLASH:
+                    if pos >= len(chunk):
+                        self._escaped = True
+                    pos += 1
+                else:
+                    self._in_string = False
+                    if self._key is not None:
+                        self._key += chunk[key_start:start]
+                        stack[-1][1] = bytes(self._key)
+                        self._key = None
+                continue
+            if c == _QUOTE:
+                self._in_string = True
+                if self._expect_key and len(stack) <= len(self._path):
+                    self._key = bytearray()
+                    key_start = pos
+            elif c == _OPEN_OBJECT or c == _OPEN_ARRAY:
+                if c == _OPEN_ARRAY and self._at_target():
+                    return pos
+                stack.append([c == _OPEN_OBJECT, None])
+                self._expect_key = c == _OPEN_OBJECT
+            elif c in _CLOSE:
+                stack.pop()
+                self._expect_key = False
+            elif c == _COLON:
+                self._expect_key = False
+            elif c == _COMMA:
+                self._expect_key = bool(stack) and stack[-1][0]
+        if self._key is not None:
+            self._key += chunk[key_start:]
+        return None
+
+def iter_json_array(chunks : Iterable[bytes], path : Sequence[str]) -> Iterator[Any]:
+    """
+    Yield the decoded items of the array at `path` of the json
+    document made of `chunks`. See `JSONArrayScanner`.
+
+    Parameters
+    ----------
+    chunks: Iterable[bytes]
+        The document, ex: `requests.Response.iter_content()`.
+    path: Sequence[str]
+        The keys of the nested objects leading to the array.
+
+    Yields
+    ------
+    Any
+
+    Raises
+    ------
+    ValueError: If the document ends inside the array.
+    """
+    scanner = JSONArrayScanner(path)
+    for chunk in chunks:
+        yield from scanner.feed(chunk)
+        if scanner.done:
+            return
+    yield from scanner.close()
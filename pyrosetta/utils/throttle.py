@@ -0,0 +1,373 @@
+"""
+Client side limits on how hard a node is hit: a token bucket for the rate
+of requests, and an adaptive limit on the number of requests in flight.
+"""
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+from . import deadline
+from ..exceptions import DeadlineExceeded
+
+OVERLOAD_STATUSES = (429, 502, 503, 504)
+
+class TokenBucket(object):
+    """
+    Limits the rate of requests to `rate` per second on average, allowing
+    bursts of up to `burst` requests.
+    """
+
+    def __init__(self, rate : float, burst : Optional[float] = None) -> None:
+        """
+        Parameters
+        ----------
+        rate: float
+            The number of requests allowed per second.
+        burst: float, optional
+            The number of requests that can be made at once after being idle.
+            Defaults to one second worth of requests.
+
+        Raises
+        ------
+        ValueError: If `rate` isn't positive.
+        """
+        if rate <= 0:
+            raise ValueError("`rate` needs to be positive.")
+        self.rate = rate
+        self.burst = max(1.0, rate if burst is None else burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, timeout : Optional[float] = None) -> Optional[float]:
+        """
+        Take a token, possibly ahead of time.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The longest, in seconds, the caller can wait. None for no limit.
+
+        Returns
+        -------
+        float, optional
+            How long, in seconds, the caller needs to wait before using it,
+            or None, without taking a token, if that is longer than `timeout`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if timeout is not None and wait > timeout:
+                return None
+            self._tokens -= 1
+            return wait
+
+class AdaptiveConcurrency(object):
+    """
+    An AIMD (additive increase, multiplicative decrease) limit on the number
+    of requests in flight, which settles near what the node can handle.
+
+    While the average recent latency stays within `tolerance` times the
+    baseline, a slowly moving estimate of the latency of an unloaded node,
+    the limit grows by about one for every `limit` successful requests. When
+    a request is dropped, ie. the node is overloaded (429, 502, 503, 504 or
+    a retriable error) or can't be reached, the limit is multiplied by
+    `backoff`, and when latency rises past the tolerance, by `latency_backoff`.
+    Only requests started after the last decrease can decrease the limit
+    again, so a burst of failures from the same window only counts once.
+
+    It can be shared by threads and asyncio tasks alike.
+    """
+
+    def __init__(self, initial : int = 4, min_limit : int = 1, max_limit : int = 64, backoff : float = 0.5,
+                 latency_backoff : float = 0.9, tolerance : float = 2.0, smoothing : float = 0.01) -> None:
+        """
+        Parameters
+        ----------
+        initial: int
+            The starting limit. Defaults to 4.
+        min_limit: int
+            The lowest the limit goes. Defaults to 1.
+        max_limit: int
+            The highest the limit goes. Defaults to 64.
+        backoff: float
+            The factor applied to the limit when a request is dropped. Defaults to 0.5.
+        latency_backoff: float
+            The factor applied to the limit when latency rises. Defaults to 0.9.
+        tolerance: float
+            How many times the baseline the average recent latency can reach before
+            latency is considered to be rising. Defaults to 2.
+        smoothing: float
+            How fast the baseline follows latencies back up. Defaults to 0.01.
+
+        Raises
+        ------
+        ValueError: If the limits aren't ordered as `1 <= min_limit <= initial <= max_limit`.
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("The limits need to be ordered as `1 <= min_limit <= initial <= max_limit`.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_backoff = latency_backoff
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline = None
+        self.latency = None
+        self.in_flight = 0
+        self._limit = float(initial)
+        self._started = 0
+        self._last_decrease = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """
+        The current maximum number of requests in flight.
+        """
+        return max(self.min_limit, int(self._limit))
+
+    def _token(self) -> Tuple[int, float]:
+        self._started += 1
+        return self._started, time.monotonic()
+
+    def _wake(self) -> None:
+        # Hand the free slots over to the waiters in order.
+        while self._waiters and self.in_flight < self.limit:
+            self.in_flight += 1
+            self._waiters.popleft()()
+
+    def acquire(self, timeout : Optional[float] = None) -> Optional[Tuple[int, float]]:
+        """
+        Wait for a free slot, blocking the thread.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The longest, in seconds, to wait. None for no limit.
+
+        Returns
+        -------
+        tuple[int, float], optional
+            The token to pass on to `release`, or None if no slot
+            freed up within `timeout`.
+        """
+        with self._lock:
+            if not self._waiters and self.in_flight < self.limit:
+                self.in_flight += 1
+                return self._token()
+            event = threading.Event()
+            self._waiters.append(event.set)
+        if not event.wait(None if timeout is None else max(0.0, timeout)):
+            with self._lock:
+                if event.set in self._waiters:
+                    self._waiters.remove(event.set)
+                    return None
+                # The slot was handed over just as the wait timed out.
+                self.in_flight -= 1
+                self._wake()
+                return None
+        with self._lock:
+            return self._token()
+
+    async def acquire_async(self, timeout : Optional[float] = None) -> Optional[Tuple[int, float]]:
+        """
+        Wait for a free slot without blocking the event loop.
+
+        Parameters
+        ----------
+        timeout: float, optional
+            The longest, in seconds, to wait. None for no limit.
+
+        Returns
+        -------
+        tuple[int, float], optional
+            The token to pass on to `release`, or None if no slot
+            freed up within `timeout`.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if not self._waiters and self.in_flight < self.limit:
+                self.in_flight += 1
+                return self._token()
+            future = loop.create_future()
+
+            def _wake():
+                loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+            self._waiters.append(_wake)
+        try:
+            await asyncio.wait_for(future, None if timeout is None else max(0.0, timeout))
+        except (asyncio.CancelledError, asyncio.TimeoutError) as e:
+            with self._lock:
+                if _wake in self._waiters:
+                    self._waiters.remove(_wake)
+                else:
+                    # The slot was handed over just as the wait was cancelled.
+                    self.in_flight -= 1
+                    self._wake()
+            if isinstance(e, asyncio.TimeoutError):
+                return None
+            raise
+        with self._lock:
+            return self._token()
+
+    def release(self, token : Tuple[int, float], latency : Optional[float] = None, dropped : bool = False) -> None:
+        """
+        Free the slot of a request and adjust the limit to its outcome.
+
+        Parameters
+        ----------
+        token: tuple[int, float]
+            The token returned when the slot was acquired.
+        latency: float, optional
+            How long the request took, in seconds, if it succeeded.
+        dropped: bool
+            Whether the node was overloaded or couldn't be reached.
+            Requests neither dropped nor with a latency, ex: a request
+            for an unknown block, leave the limit as is.
+        """
+        started, _ = token
+        with self._lock:
+            in_flight = self.in_flight
+            self.in_flight -= 1
+            if dropped:
+                self._decrease(started, self.backoff)
+            elif latency is not None:
+                self._observe(latency)
+                if self.latency > self.baseline * self.tolerance:
+                    self._decrease(started, self.latency_backoff)
+                elif 2 * in_flight >= self.limit:
+                    # Only grow while the limit is actually being used.
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._wake()
+
+    def _observe(self, latency : float) -> None:
+        # The recent latency is a moving average, so a single slow request
+        # doesn't count as rising latency, while the baseline falls quickly
+        # to faster latencies and only slowly follows slower ones.
+        if self.baseline is None:
+            self.baseline = self.latency = latency
+            return
+        self.latency += 0.2 * (latency - self.latency)
+        if latency < self.baseline:
+            self.baseline += 0.2 * (latency - self.baseline)
+        else:
+            self.baseline += self.smoothing * (latency - self.baseline)
+
+    def _decrease(self, started : int, factor : float) -> None:
+        if started > self._last_decrease:
+            self._limit = max(self.min_limit, self._limit * factor)
+            self._last_decrease = self._started
+
+    def __repr__(self) -> str:
+        return "AdaptiveConcurrency(limit={}, in_flight={})".format(self.limit, self.in_flight)
+
+class Throttle(object):
+    """
+    Applies a TokenBucket and an AdaptiveConcurrency, both optional,
+    to every request of a client.
+    """
+
+    def __init__(self, rate : Optional[float] = None, burst : Optional[float] = None,
+                 concurrency : Optional[AdaptiveConcurrency] = None) -> None:
+        """
+        Parameters
+        ----------
+        rate: float, optional
+            The maximum number of requests per second. None for no limit.
+        burst: float, optional
+            The burst allowed above `rate`, see `TokenBucket`.
+        concurrency: AdaptiveConcurrency, optional
+            The limit on requests in flight. None for no limit.
+        """
+        self.bucket = None if rate is None else TokenBucket(rate, burst)
+        self.concurrency = concurrency
+
+    def acquire(self) -> Optional[Tuple[int, float]]:
+        """
+        Wait until a request can be sent, blocking the thread,
+        but not past the deadline of the current context.
+
+        Returns
+        -------
+        The token to pass on to `release`.
+
+        Raises
+        ------
+        DeadlineExceeded: If the request can't be sent before the deadline.
+        """
+        if self.bucket is not None:
+            delay = self._reserve()
+            if delay > 0:
+                time.sleep(delay)
+        if self.concurrency is not None:
+            return self._slot(self.concurrency.acquire(deadline.remaining()))
+        return None
+
+    async def acquire_async(self) -> Optional[Tuple[int, float]]:
+        """
+        Wait until a request can be sent without blocking the event loop,
+        but not past the deadline of the current context.
+
+        Returns
+        -------
+        The token to pass on to `release`.
+
+        Raises
+        ------
+        DeadlineExceeded: If the request can't be sent before the deadline.
+        """
+        if self.bucket is not None:
+            delay = self._reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        if self.concurrency is not None:
+            return self._slot(await self.concurrency.acquire_async(deadline.remaining()))
+        return None
+
+    def _reserve(self) -> float:
+        deadline.check()
+        delay = self.bucket.reserve(deadline.remaining())
+        if delay is None:
+            raise DeadlineExceeded("The rate limit doesn't allow another request before the deadline.")
+        return delay
+
+    @staticmethod
+    def _slot(token : Optional[Tuple[int, float]]) -> Tuple[int, float]:
+        if token is None:
+            raise DeadlineExceeded("No request slot freed up before the deadline.")
+        return token
+
+    def release(self, token : Optional[Tuple[int, float]], status_code : Optional[int] = None, retriable : Optional[bool] = None) -> None:
+        """
+        Report the outcome of a request, see `AdaptiveConcurrency.release`.
+
+        Parameters
+        ----------
+        token: tuple[int, float], optional
+            The token returned by `acquire`.
+        status_code: int, optional
+            The HTTP status of the response, None if the node couldn't be reached.
+        retriable: bool, optional
+            The `retriable` flag of the `Error` in the response, if any.
+        """
+        if token is None:
+            return
+        if status_code is not None and status_code < 400:
+            self.concurrency.release(token, latency=time.monotonic() - token[1])
+        else:
+            dropped = status_code is None or status_code in OVERLOAD_STATUSES or bool(retriable)
+            self.concurrency.release(token, dropped=dropped)
+
+    def cancel(self, token : Optional[Tuple[int, float]]) -> None:
+        """
+        Free the slot of a request that was abandoned without an outcome.
+        """
+        if token is not None:
+            self.concurrency.release(token)
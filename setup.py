@@ -21,6 +21,8 @@ setuptools.setup(
         'pyyaml'
     ],
     extras_require = {
+        'async' : ['aiohttp'],
+        'fast' : ['orjson'],
         'dev' : ['datamodel-code-generator', 'sphinx', 'sphinx-rtd-theme', 'm2r2']
     }
 )
@@ -0,0 +1,22 @@
+from pyrosetta.account import AccountBalance, currency_key
+from pyrosetta.models import AccountBalanceResponse, AccountIdentifier, Currency
+
+def test_balances_keyed_by_full_currency():
+    resp = AccountBalanceResponse.parse_obj({
+        'block_identifier': {'index': 7, 'hash': 'h7'},
+        'balances': [
+            {'value': '10', 'currency': {'symbol': 'ETH', 'decimals': 18}},
+            {'value': '20', 'currency': {'symbol': 'USDC', 'decimals': 6, 'metadata': {'contract': '0xa', 'chain': 1}}},
+            {'value': '30', 'currency': {'symbol': 'USDC', 'decimals': 6, 'metadata': {'contract': '0xb'}}},
+        ]
+    })
+    balance = AccountBalance.from_response(AccountIdentifier(address='a'), resp)
+    assert (balance.block_index, balance.block_hash) == (7, 'h7')
+    assert balance.balances == {
+        ('ETH', 18, None): 10,
+        ('USDC', 6, '{"chain":1,"contract":"0xa"}'): 20,
+        ('USDC', 6, '{"contract":"0xb"}'): 30,
+    }
+    usdc = Currency(symbol='USDC', decimals=6, metadata={'chain': 1, 'contract': '0xa'})
+    assert balance.balances[currency_key(usdc)] == 20
+    assert currency_key(Currency(symbol='ETH', decimals=18, metadata={})) == ('ETH', 18, None)
@@ -0,0 +1,149 @@
+from pyrosetta.api import RosettaAPI
+from pyrosetta.models import BlockIdentifier, BlockResponse, NetworkIdentifier, PartialBlockIdentifier, TransactionIdentifier, lazy_block_response
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.cache import BlockCache, TransactionIndex, estimate_size, index_transactions
+
+NETWORK = NetworkIdentifier(blockchain='synthetic', network='testnet')
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def block(chain, index):
+    return BlockResponse.parse_obj(chain.block(index))
+
+def by_index(index):
+    return PartialBlockIdentifier(index=index)
+
+def by_hash(resp):
+    return PartialBlockIdentifier(hash=resp.block.block_identifier.hash_)
+
+def test_blocks_near_tip_expire_by_height():
+    chain = SyntheticChain(height=20, transactions=2)
+    clock = Clock()
+    cache = BlockCache(finality_depth=5, tip_ttl=2.0, clock=clock)
+    cache.observe_tip(NETWORK, 20)
+    near, final = block(chain, 18), block(chain, 10)
+    cache.put(NETWORK, near)
+    cache.put(NETWORK, final)
+    assert cache.get(NETWORK, by_index(18)) is near
+    clock.now = 3.0
+    assert cache.get(NETWORK, by_index(18)) is None
+    assert cache.get(NETWORK, by_hash(near)) is near
+    assert cache.get(NETWORK, by_index(10)) is final
+
+def test_blocks_become_final_as_tip_moves():
+    chain = SyntheticChain(height=20, transactions=2)
+    clock = Clock()
+    cache = BlockCache(finality_depth=5, tip_ttl=2.0, clock=clock)
+    resp = block(chain, 18)
+    cache.put(NETWORK, resp)
+    assert not cache.final(NETWORK, 18)
+    cache.observe_tip(NETWORK, 23)
+    assert cache.final(NETWORK, 18)
+    clock.now = 100.0
+    assert cache.get(NETWORK, by_index(18)) is resp
+
+def test_hash_and_index_must_agree():
+    chain = SyntheticChain(height=20, transactions=2)
+    cache = BlockCache()
+    resp = block(chain, 10)
+    cache.put(NETWORK, resp)
+    assert cache.get(NETWORK, PartialBlockIdentifier(index=10, hash=resp.block.block_identifier.hash_)) is resp
+    assert cache.get(NETWORK, PartialBlockIdentifier(index=11, hash=resp.block.block_identifier.hash_)) is None
+    assert cache.get(NETWORK, PartialBlockIdentifier()) is None
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 2
+
+def test_least_recently_used_evicted():
+    chain = SyntheticChain(height=20, transactions=2)
+    cache = BlockCache(max_blocks=2)
+    blocks = [block(chain, index) for index in range(3)]
+    cache.put(NETWORK, blocks[0])
+    cache.put(NETWORK, blocks[1])
+    cache.get(NETWORK, by_index(0))
+    cache.put(NETWORK, blocks[2])
+    assert len(cache) == 2
+    assert cache.get(NETWORK, by_index(1)) is None
+    assert cache.get(NETWORK, by_index(0)) is blocks[0]
+    assert cache.size == estimate_size(blocks[0]) + estimate_size(blocks[2])
+
+def test_bytes_bounded():
+    chain = SyntheticChain(height=20, transactions=10)
+    size = estimate_size(block(chain, 0))
+    cache = BlockCache(max_bytes=3 * size)
+    for index in range(10):
+        cache.put(NETWORK, block(chain, index))
+    assert len(cache) == 3 and cache.size <= 3 * size
+    small = BlockCache(max_bytes=size - 1)
+    small.put(NETWORK, block(chain, 0))
+    assert len(small) == 0
+
+def test_reorged_tip_refetched():
+    chain = SyntheticChain(height=20, transactions=2)
+    clock = Clock()
+    with StandInServer(chain) as server:
+        api = RosettaAPI(server.url, block_cache=BlockCache(finality_depth=5, tip_ttl=2.0, clock=clock))
+        api.select_network('synthetic', 'testnet')
+        before = api.block_on_current_network(20).block
+        assert api.block_on_current_network(20).block is before
+        chain.reorg(2)
+        clock.now = 3.0
+        after = api.block_on_current_network(20).block
+    assert after.block_identifier.hash_ != before.block_identifier.hash_
+
+def transaction_ids(resp, position):
+    block_id = resp.block.block_identifier
+    return (BlockIdentifier(index=block_id.index, hash=block_id.hash_),
+            TransactionIdentifier(hash=resp.block.transactions[position].transaction_identifier.hash_))
+
+def test_transactions_indexed():
+    chain = SyntheticChain(height=20, transactions=5)
+    index = TransactionIndex(max_blocks=2)
+    resp = block(chain, 3)
+    index.add(NETWORK, resp)
+    block_id, transaction_id = transaction_ids(resp, 4)
+    assert index.get(NETWORK, block_id, transaction_id) is resp.block.transactions[4]
+    assert index.get(NETWORK, BlockIdentifier(index=4, hash=block_id.hash_), transaction_id) is None
+    assert index.get(NETWORK, block_id, TransactionIdentifier(hash='unknown')) is None
+    assert index.get(NetworkIdentifier(blockchain='synthetic', network='other'), block_id, transaction_id) is None
+
+def test_transaction_index_bounded():
+    chain = SyntheticChain(height=20, transactions=2)
+    index = TransactionIndex(max_blocks=2)
+    blocks = [block(chain, height) for height in range(3)]
+    for resp in blocks:
+        index.add(NETWORK, resp)
+    assert len(index) == 2
+    assert index.get(NETWORK, *transaction_ids(blocks[0], 0)) is None
+    assert index.get(NETWORK, *transaction_ids(blocks[2], 1)) is not None
+    assert len(TransactionIndex(max_blocks=0)) == 0
+
+def test_lazy_transactions_indexed_from_raw_json():
+    chain = SyntheticChain(height=20, transactions=5)
+    resp = lazy_block_response(chain.block(3))
+    hashes = [transaction['transaction_identifier']['hash'] for transaction in chain.block(3)['block']['transactions']]
+    assert index_transactions(resp.block.transactions) == {hash_: i for i, hash_ in enumerate(hashes)}
+    index = TransactionIndex()
+    index.add(NETWORK, resp)
+    block_id = resp.block.block_identifier
+    transaction = index.get(NETWORK, BlockIdentifier(index=block_id.index, hash=block_id.hash_), TransactionIdentifier(hash=hashes[2]))
+    assert transaction.transaction_identifier.hash_ == hashes[2]
+
+def test_block_transactions_read_from_fetched_blocks():
+    chain = SyntheticChain(height=20, transactions=4, other_transactions=1)
+    with StandInServer(chain) as server:
+        api = RosettaAPI(server.url)
+        api.select_network('synthetic', 'testnet')
+        resp = api.block_on_current_network(5)
+        block_id = resp.block.block_identifier
+        before = server.requests
+        for transaction in resp.block.transactions:
+            assert api.block_transaction_on_current_network(5, block_id.hash_, transaction.transaction_identifier.hash_) is transaction
+        assert server.requests == before
+        other = resp.other_transactions[0].hash_
+        assert api.block_transaction_on_current_network(5, block_id.hash_, other).transaction_identifier.hash_ == other
+        assert server.requests == before + 1
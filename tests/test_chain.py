@@ -0,0 +1,130 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from pyrosetta.api import RosettaAPI
+from pyrosetta.async_api import AsyncRosettaAPI
+from pyrosetta.exceptions import ReorgTooDeep
+from pyrosetta.testing import StandInServer, SyntheticChain
+
+class LaggingServer(StandInServer):
+    """
+    Answers the first `missing` /block requests without a block, like a node
+    behind a load balancer reporting a tip another replica doesn't have yet.
+    """
+
+    def __init__(self, *args, missing=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.missing = missing
+        self.status_calls = 0
+
+    def handle(self, path, body):
+        if path == '/network/status':
+            self.status_calls += 1
+        if path == '/block' and self.missing:
+            self.missing -= 1
+            return 200, b'{}'
+        return super().handle(path, body)
+
+def follower(server, **kwargs):
+    api = RosettaAPI(server.url)
+    api.select_network('synthetic', 'testnet')
+    return api.follow_chain(**kwargs)
+
+def test_follow_chain_backs_off_on_missing_blocks():
+    with LaggingServer(SyntheticChain(height=5), missing=3) as server:
+        events = follower(server, start=0, concurrency=1, poll_interval=0.05, max_poll_interval=1)
+        start = time.monotonic()
+        event = next(events)
+        elapsed = time.monotonic() - start
+        events.close()
+    assert event.added and event.block.block_identifier.index == 0
+    # Every poll of the tip after the first waited twice as long as the one before.
+    assert server.status_calls >= 2
+    assert elapsed >= sum(0.05 * 2 ** i for i in range(server.status_calls - 1))
+
+def test_follow_chain_backs_off_on_missing_blocks_async():
+    async def main(server):
+        async with AsyncRosettaAPI(server.url) as api:
+            api.select_network('synthetic', 'testnet')
+            events = api.follow_chain(start=0, concurrency=1, poll_interval=0.05, max_poll_interval=1)
+            start = time.monotonic()
+            event = await events.__anext__()
+            elapsed = time.monotonic() - start
+            await events.aclose()
+            return event, elapsed
+
+    with LaggingServer(SyntheticChain(height=5), missing=3) as server:
+        event, elapsed = asyncio.run(main(server))
+    assert event.added and event.block.block_identifier.index == 0
+    assert server.status_calls >= 2
+    assert elapsed >= sum(0.05 * 2 ** i for i in range(server.status_calls - 1))
+
+def describe(events):
+    return [('+' if event.added else '-', event.block.block_identifier.index) for event in events]
+
+def assert_linked(events):
+    added = [event.block for event in events if event.added]
+    for parent, child in zip(added, added[1:]):
+        assert child.parent_block_identifier.hash_ == parent.block_identifier.hash_
+
+@pytest.mark.parametrize('length, expected', [
+    (None, [('-', 10), ('-', 9), ('+', 9), ('+', 10), ('+', 11)]),
+    # The tip doesn't move, the fork is only seen through its hash.
+    (2, [('-', 10), ('-', 9), ('+', 9), ('+', 10)]),
+])
+def test_follow_chain_through_reorg(length, expected):
+    chain = SyntheticChain(height=10, transactions=1)
+    with StandInServer(chain) as server:
+        events = follower(server, start=0, poll_interval=0.01)
+        before = list(itertools.islice(events, 11))
+        orphaned = [event.block.block_identifier.hash_ for event in before[9:]]
+        chain.reorg(2, length)
+        after = list(itertools.islice(events, len(expected)))
+        events.close()
+    assert describe(before) == [('+', index) for index in range(11)]
+    assert describe(after) == expected
+    assert [event.block.block_identifier.hash_ for event in after[:2]] == orphaned[::-1]
+    assert after[2].block.parent_block_identifier.hash_ == before[8].block.block_identifier.hash_
+    assert_linked(before[:9] + after[2:])
+
+def test_follow_chain_through_reorg_async():
+    chain = SyntheticChain(height=10, transactions=1)
+
+    async def main(server):
+        async with AsyncRosettaAPI(server.url) as api:
+            api.select_network('synthetic', 'testnet')
+            events = api.follow_chain(start=0, poll_interval=0.01)
+            before = [await events.__anext__() for _ in range(11)]
+            chain.reorg(3)
+            after = [await events.__anext__() for _ in range(7)]
+            await events.aclose()
+            return before, after
+
+    with StandInServer(chain) as server:
+        before, after = asyncio.run(main(server))
+    assert describe(after) == [('-', 10), ('-', 9), ('-', 8), ('+', 8), ('+', 9), ('+', 10), ('+', 11)]
+    assert_linked(before[:8] + after[3:])
+
+def test_follow_chain_with_confirmations_skips_shallow_reorgs():
+    chain = SyntheticChain(height=10, transactions=1)
+    with StandInServer(chain) as server:
+        events = follower(server, start=0, confirmations=3, poll_interval=0.01)
+        before = list(itertools.islice(events, 8))
+        chain.reorg(2)
+        chain.advance(3)
+        after = list(itertools.islice(events, 4))
+        events.close()
+    assert describe(before + after) == [('+', index) for index in range(12)]
+    assert_linked(before + after)
+
+def test_reorg_deeper_than_kept():
+    chain = SyntheticChain(height=10, transactions=1)
+    with StandInServer(chain) as server:
+        events = follower(server, start=0, poll_interval=0.01, max_reorg_depth=3)
+        list(itertools.islice(events, 11))
+        chain.reorg(5)
+        with pytest.raises(ReorgTooDeep):
+            next(events)
@@ -0,0 +1,113 @@
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyrosetta.api import RosettaAPI
+from pyrosetta.async_api import AsyncRosettaAPI
+from pyrosetta.models import NetworkIdentifier, NetworkRequest
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils import _async as comm_async
+from pyrosetta.utils.coalescing import SingleFlight, request_key
+
+def test_request_key_ignores_metadata_order():
+    a = NetworkRequest(network_identifier=NetworkIdentifier(blockchain='b', network='n'), metadata={'x': 1, 'y': [1, 2]})
+    b = NetworkRequest(network_identifier=NetworkIdentifier(blockchain='b', network='n'), metadata={'y': [1, 2], 'x': 1})
+    c = NetworkRequest(network_identifier=NetworkIdentifier(blockchain='b', network='n'), metadata={'x': 2, 'y': [1, 2]})
+    assert request_key(a) == request_key(b) != request_key(c)
+
+def test_concurrent_calls_shared():
+    flight = SingleFlight()
+    calls = itertools.count()
+    barrier = threading.Barrier(8)
+
+    def fn():
+        time.sleep(0.2)
+        return [next(calls)]
+
+    def call(_):
+        barrier.wait()
+        return flight.do('key', fn)
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(call, range(8)))
+    assert all(result is results[0] for result in results)
+    assert len(flight) == 0
+    assert flight.do('key', fn) == [1]
+
+def test_errors_shared():
+    flight = SingleFlight()
+    barrier = threading.Barrier(4)
+
+    def fn():
+        time.sleep(0.2)
+        raise ValueError()
+
+    def call(_):
+        barrier.wait()
+        try:
+            flight.do('key', fn)
+        except ValueError as e:
+            return e
+
+    with ThreadPoolExecutor(4) as pool:
+        errors = list(pool.map(call, range(4)))
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert len(flight) == 0
+
+def test_concurrent_calls_shared_async():
+    calls = itertools.count()
+
+    async def fn():
+        await asyncio.sleep(0.1)
+        return next(calls)
+
+    async def main():
+        flight = comm_async.SingleFlight()
+        results = await asyncio.gather(*[flight.do('key', fn) for _ in range(8)])
+        return results, len(flight), await flight.do('key', fn)
+
+    assert asyncio.run(main()) == ([0] * 8, 0, 1)
+
+def test_cancelled_caller_leaves_call_running():
+    async def fn():
+        await asyncio.sleep(0.1)
+        return 'done'
+
+    async def main():
+        flight = comm_async.SingleFlight()
+        first = asyncio.ensure_future(flight.do('key', fn))
+        second = asyncio.ensure_future(flight.do('key', fn))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 'done'
+
+def test_identical_requests_coalesced():
+    with StandInServer(SyntheticChain(height=5), latency=0.2) as server:
+        api = RosettaAPI(server.url, coalesce=True)
+        api.select_network('synthetic', 'testnet')
+        api.block_on_current_network(1)
+        before = server.requests
+        with ThreadPoolExecutor(8) as pool:
+            blocks = list(pool.map(lambda _: api.block_on_current_network(3), range(8)))
+        assert server.requests - before == 1
+    assert all(resp is blocks[0] for resp in blocks)
+
+def test_identical_requests_coalesced_async():
+    async def main(server):
+        async with AsyncRosettaAPI(server.url, coalesce=True) as api:
+            api.select_network('synthetic', 'testnet')
+            await api.block_on_current_network(1)
+            before = server.requests
+            await asyncio.gather(*[api.block_on_current_network(3) for _ in range(8)])
+            return server.requests - before
+
+    with StandInServer(SyntheticChain(height=5), latency=0.2) as server:
+        assert asyncio.run(main(server)) == 1
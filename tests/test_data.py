@@ -0,0 +1,31 @@
+import pytest
+
+from pyrosetta import RosettaError
+from pyrosetta.endpoints.data import get_block, get_block_transaction, iter_block_transactions
+from pyrosetta.models import (
+    BlockIdentifier,
+    BlockRequest,
+    BlockTransactionRequest,
+    NetworkIdentifier,
+    PartialBlockIdentifier,
+    TransactionIdentifier
+)
+from pyrosetta.testing import StandInServer, SyntheticChain
+
+UNKNOWN = NetworkIdentifier(blockchain='synthetic', network='unknown')
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInServer(SyntheticChain(height=5)) as server:
+        yield server
+
+def test_errors_raised_as_rosetta_errors(server):
+    block_req = BlockRequest(network_identifier=UNKNOWN, block_identifier=PartialBlockIdentifier(index=1))
+    with pytest.raises(RosettaError):
+        get_block(server.url, block_req)
+    with pytest.raises(RosettaError):
+        list(iter_block_transactions(server.url, block_req))
+    transaction_req = BlockTransactionRequest(network_identifier=UNKNOWN, block_identifier=BlockIdentifier(index=1, hash='h'),
+                                              transaction_identifier=TransactionIdentifier(hash='t'))
+    with pytest.raises(RosettaError):
+        get_block_transaction(server.url, transaction_req)
@@ -0,0 +1,149 @@
+import asyncio
+import itertools
+import json
+
+from pyrosetta.api import RosettaAPI
+from pyrosetta.async_api import AsyncRosettaAPI
+from pyrosetta.events import EventCursor, iter_events, iter_pages
+from pyrosetta.models import EventsBlocksResponse, NetworkIdentifier
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.checkpoint import FileCheckpoint
+
+NETWORK = NetworkIdentifier(blockchain='synthetic', network='testnet')
+
+class CappedServer(StandInServer):
+    """
+    Returns at most `max_limit` events per page, whatever the limit asked for.
+    """
+
+    def __init__(self, *args, max_limit=3, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_limit = max_limit
+
+    def handle(self, path, body):
+        if path == '/events/blocks':
+            req = json.loads(body)
+            req['limit'] = min(req.get('limit') or self.max_limit, self.max_limit)
+            body = json.dumps(req).encode('utf-8')
+        return super().handle(path, body)
+
+def page(offset, count, max_sequence):
+    return EventsBlocksResponse.parse_obj({
+        'max_sequence': max_sequence,
+        'events': [{'sequence': sequence, 'block_identifier': {'index': sequence, 'hash': str(sequence)}, 'type': 'block_added'}
+                   for sequence in range(offset, offset + count)]
+    })
+
+class RecordingCheckpoint(FileCheckpoint):
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.saved = []
+
+    def save(self, sequence):
+        super().save(sequence)
+        self.saved.append(sequence)
+
+def test_checkpoint_file(tmp_path):
+    checkpoint = FileCheckpoint(str(tmp_path / 'offset'))
+    assert checkpoint.load() is None
+    checkpoint.save(41)
+    assert checkpoint.load() == 41
+    for contents in ('', 'garbage'):
+        (tmp_path / 'offset').write_text(contents)
+        assert checkpoint.load() is None
+
+def test_checkpoint_saved_per_page(tmp_path):
+    checkpoint = RecordingCheckpoint(str(tmp_path / 'offset'))
+    with StandInServer(SyntheticChain(height=19)) as server:
+        api = RosettaAPI(server.url)
+        api.select_network('synthetic', 'testnet')
+        sequences = [resolved.event.sequence for resolved in api.iter_block_events(limit=5, checkpoint=checkpoint)]
+    assert sequences == list(range(20))
+    assert checkpoint.saved == [4, 9, 14, 19]
+
+def test_checkpoint_saved_when_closed(tmp_path):
+    checkpoint = RecordingCheckpoint(str(tmp_path / 'offset'))
+    with StandInServer(SyntheticChain(height=19)) as server:
+        api = RosettaAPI(server.url)
+        api.select_network('synthetic', 'testnet')
+        events = api.iter_block_events(limit=5, checkpoint=checkpoint)
+        assert [next(events).event.sequence for _ in range(8)] == list(range(8))
+        events.close()
+        assert checkpoint.saved == [4, 6]
+        resumed = [resolved.event.sequence for resolved in api.iter_block_events(limit=5, checkpoint=checkpoint)]
+    assert resumed == list(range(7, 20))
+
+def test_checkpoint_saved_when_closed_async(tmp_path):
+    checkpoint = RecordingCheckpoint(str(tmp_path / 'offset'))
+
+    async def main(server):
+        async with AsyncRosettaAPI(server.url) as api:
+            api.select_network('synthetic', 'testnet')
+            events = api.iter_block_events(limit=5, checkpoint=checkpoint)
+            first = [(await events.__anext__()).event.sequence for _ in range(8)]
+            await events.aclose()
+            return first, [resolved.event.sequence async for resolved in api.iter_block_events(limit=5, checkpoint=checkpoint)]
+
+    with StandInServer(SyntheticChain(height=19)) as server:
+        first, resumed = asyncio.run(main(server))
+    assert first == list(range(8))
+    assert checkpoint.saved[:2] == [4, 6]
+    assert resumed == list(range(7, 20))
+
+def test_cursor_plans_pages_ahead():
+    cursor = EventCursor(offset=5, limit=10)
+    assert cursor.caught_up and list(cursor.offsets()) == [5]
+    events, planned = cursor.take(5, page(5, 10, 40))
+    assert [event.sequence for event in events] == list(range(5, 15)) and planned
+    assert list(cursor.offsets()) == [15, 25, 35]
+
+def test_cursor_replans_after_short_page():
+    cursor = EventCursor(offset=0, limit=10)
+    cursor.take(0, page(0, 10, 40))
+    events, planned = cursor.take(10, page(10, 4, 40))
+    assert len(events) == 4 and not planned
+    assert cursor.limit == 4
+    assert list(cursor.offsets()) == list(range(14, 41, 4))
+
+def test_cursor_skips_events_already_read():
+    cursor = EventCursor(offset=0, limit=10)
+    cursor.take(0, page(0, 10, 20))
+    events, _ = cursor.take(5, page(5, 10, 20))
+    assert [event.sequence for event in events] == list(range(10, 15))
+
+def test_cursor_caught_up_on_empty_page():
+    cursor = EventCursor(offset=0, limit=10)
+    cursor.take(0, page(0, 10, 30))
+    events, planned = cursor.take(10, page(10, 0, 30))
+    assert events == [] and not planned
+    assert cursor.caught_up and list(cursor.offsets()) == [10]
+
+def test_pages_read_in_order_from_capped_node():
+    chain = SyntheticChain(height=30, transactions=1)
+    chain.reorg(3)
+    with CappedServer(chain, max_limit=4) as server:
+        pages = list(iter_pages(server.url, NETWORK, offset=2, limit=10, concurrency=4))
+    sequences = [event.sequence for events in pages for event in events]
+    assert sequences == list(range(2, chain.max_sequence + 1))
+    assert all(len(events) <= 10 for events in pages)
+
+def test_events_followed_as_they_come():
+    chain = SyntheticChain(height=4, transactions=1)
+    with StandInServer(chain, block_interval=0.05) as server:
+        events = iter_events(server.url, NETWORK, offset=0, limit=4, poll_interval=0.02)
+        sequences = [event.sequence for event in itertools.islice(events, 12)]
+        events.close()
+    assert sequences == list(range(12))
+
+def test_resume_after_crash(tmp_path):
+    path = str(tmp_path / 'offset')
+    with StandInServer(SyntheticChain(height=19)) as server:
+        api = RosettaAPI(server.url)
+        api.select_network('synthetic', 'testnet')
+        events = api.iter_block_events(limit=5, checkpoint=FileCheckpoint(path))
+        # Stop without closing the stream, as a crash would.
+        handled = [next(events).event.sequence for _ in range(8)]
+        resumed = [resolved.event.sequence for resolved in api.iter_block_events(limit=5, checkpoint=FileCheckpoint(path))]
+    assert handled == list(range(8))
+    assert resumed == list(range(5, 20))
@@ -0,0 +1,135 @@
+import asyncio
+import itertools
+import time
+
+import pytest
+
+from pyrosetta.api import RosettaAPI
+from pyrosetta.async_api import AsyncRosettaAPI
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils import _async as comm_async
+from pyrosetta.utils.hedging import HedgePolicy, hedged
+
+class SlowFirstServer(StandInServer):
+    """
+    Holds the first /block request for a second.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.blocks = itertools.count()
+
+    def handle(self, path, body):
+        if path == '/block' and next(self.blocks) == 0:
+            time.sleep(1.0)
+        return super().handle(path, body)
+
+def test_delay_follows_percentile():
+    policy = HedgePolicy(percentile=0.9, initial_delay=0.5, min_delay=0.01, max_delay=1.0, min_samples=10)
+    assert policy.delay('block') == 0.5
+    for latency in range(1, 11):
+        policy.observe('block', latency / 100)
+    assert policy.delay('block') == pytest.approx(0.1)
+    for _ in range(100):
+        policy.observe('block', 5.0)
+    assert policy.delay('block') == 1.0
+    assert policy.delay('account/balance') == 0.5
+
+def test_endpoints():
+    policy = HedgePolicy()
+    assert policy.endpoint('http://node:8080/block') == 'block'
+    assert policy.endpoint('http://node:8080/block/transaction/') == 'block/transaction'
+    assert policy.endpoint('http://node:8080/construction/submit') is None
+    with pytest.raises(ValueError):
+        HedgePolicy(endpoints=['/construction/submit'])
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=95)
+
+def test_slow_call_hedged():
+    calls = itertools.count()
+    discarded = []
+    latencies = []
+
+    def attempt():
+        n = next(calls)
+        time.sleep(0.5 if n == 0 else 0.01)
+        return n
+
+    start = time.monotonic()
+    assert hedged(attempt, 2, 0.05, discard=discarded.append, observe=latencies.append) == 1
+    assert time.monotonic() - start < 0.4
+    assert latencies[0] < 0.4
+    time.sleep(0.6)
+    assert discarded == [0]
+
+def test_fast_call_not_hedged():
+    calls = itertools.count()
+    assert hedged(lambda: next(calls), 3, 0.5) == 0
+    time.sleep(0.05)
+    assert next(calls) == 1
+
+def test_failed_call_hedged_at_once():
+    calls = itertools.count()
+
+    def attempt():
+        if next(calls) == 0:
+            raise ConnectionError()
+        return 'ok'
+
+    start = time.monotonic()
+    assert hedged(attempt, 2, 5.0) == 'ok'
+    assert time.monotonic() - start < 1.0
+
+def test_last_error_raised():
+    calls = itertools.count()
+
+    def attempt():
+        raise ConnectionError(next(calls))
+
+    with pytest.raises(ConnectionError):
+        hedged(attempt, 3, 0.01)
+    assert next(calls) == 3
+
+def test_slow_call_hedged_async():
+    calls = itertools.count()
+    cancelled = []
+
+    async def attempt():
+        n = next(calls)
+        try:
+            await asyncio.sleep(0.5 if n == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    async def main():
+        start = time.monotonic()
+        result = await comm_async.hedged(attempt, 2, 0.05)
+        await asyncio.sleep(0)
+        return result, time.monotonic() - start
+
+    result, elapsed = asyncio.run(main())
+    assert result == 1 and elapsed < 0.4
+    assert cancelled == [0]
+
+def test_slow_block_hedged():
+    with SlowFirstServer(SyntheticChain(height=5)) as server:
+        api = RosettaAPI(server.url, hedge=HedgePolicy(initial_delay=0.05))
+        api.select_network('synthetic', 'testnet')
+        start = time.monotonic()
+        assert api.block_on_current_network(3).block.block_identifier.index == 3
+        assert time.monotonic() - start < 0.8
+
+def test_slow_block_hedged_async():
+    async def main(server):
+        async with AsyncRosettaAPI(server.url, hedge=HedgePolicy(initial_delay=0.05)) as api:
+            api.select_network('synthetic', 'testnet')
+            start = time.monotonic()
+            resp = await api.block_on_current_network(3)
+            return resp, time.monotonic() - start
+
+    with SlowFirstServer(SyntheticChain(height=5)) as server:
+        resp, elapsed = asyncio.run(main(server))
+    assert resp.block.block_identifier.index == 3
+    assert elapsed < 0.8
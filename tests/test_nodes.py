@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+import requests
+
+from pyrosetta import AsyncMultiNodeRosettaAPI, DeadlineExceeded, MultiNodeRosettaAPI, RetryPolicy, RosettaError
+from pyrosetta.models import Error
+from pyrosetta.multinode import _is_node_failure
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.nodes import NodePool
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def http_error(status):
+    resp = requests.Response()
+    resp.status_code = status
+    return requests.HTTPError(response=resp)
+
+def rosetta_error(retriable):
+    return RosettaError(Error(code=1, message='error', retriable=retriable), 500, 'http://node/block')
+
+@pytest.mark.parametrize('error, failure', [
+    (requests.ConnectionError(), True),
+    (requests.ReadTimeout(), True),
+    (asyncio.TimeoutError(), True),
+    (aiohttp.ClientConnectionError(), True),
+    (aiohttp.ServerDisconnectedError(), True),
+    (http_error(500), True),
+    (http_error(503), True),
+    (http_error(429), True),
+    (aiohttp.ClientResponseError(None, (), status=502), True),
+    (aiohttp.ClientResponseError(None, (), status=429), True),
+    (rosetta_error(True), True),
+    (http_error(400), False),
+    (http_error(404), False),
+    (aiohttp.ClientResponseError(None, (), status=404), False),
+    (rosetta_error(False), False),
+    (DeadlineExceeded(), False),
+    (ValueError(), False),
+])
+def test_node_failures(error, failure):
+    assert _is_node_failure(error) is failure
+
+def fail(pool, node, times=1):
+    for _ in range(times):
+        pool.failure(node, pool.begin(node))
+
+def succeed(pool, node):
+    pool.success(node, pool.begin(node))
+
+def test_ejected_after_failures_in_a_row():
+    clock = Clock()
+    pool = NodePool(['a', 'b'], eject_after=3, eject_for=5.0, clock=clock)
+    a, b = pool.nodes
+    fail(pool, a, 2)
+    succeed(pool, a)
+    fail(pool, a, 2)
+    assert pool.candidates() == [a, b]
+    fail(pool, a)
+    assert pool.candidates() == [b]
+    assert pool.health()['a']['ejected'] and a.in_flight == 0
+
+def test_readmitted_on_probation():
+    clock = Clock()
+    pool = NodePool(['a', 'b'], eject_after=3, eject_for=5.0, max_eject_for=12.0, clock=clock)
+    a, b = pool.nodes
+    fail(pool, a, 3)
+    clock.now = 5.0
+    assert pool.candidates() == [a, b]
+    # On probation, a single failure ejects it again, for twice as long.
+    fail(pool, a)
+    assert pool.candidates() == [b]
+    clock.now = 14.9
+    assert pool.candidates() == [b]
+    clock.now = 15.0
+    fail(pool, a)
+    # Capped at max_eject_for.
+    assert a.ejected_until == 27.0
+    clock.now = 27.0
+    succeed(pool, a)
+    fail(pool, a, 2)
+    assert pool.candidates() == [a, b]
+    fail(pool, a)
+    assert a.ejected_until == 32.0
+
+def test_every_node_ejected():
+    clock = Clock()
+    pool = NodePool(['a', 'b'], eject_after=1, eject_for=5.0, clock=clock)
+    a, b = pool.nodes
+    fail(pool, a)
+    clock.now = 1.0
+    fail(pool, b)
+    assert pool.candidates() == [a]
+    assert pool.candidates([a]) == [b]
+    assert pool.candidates([a, b]) == []
+
+def test_cancel_leaves_health_alone():
+    pool = NodePool(['a'], eject_after=1)
+    node = pool.nodes[0]
+    pool.begin(node)
+    pool.cancel(node)
+    assert (node.in_flight, node.failures, node.error_rate) == (0, 0, 0.0)
+
+def test_better_scored_node_chosen():
+    pool = NodePool(['fast', 'slow'])
+    fast, slow = pool.nodes
+    fast.latency, slow.latency = 0.01, 0.5
+    assert all(pool.choose(pool.nodes) is fast for _ in range(20))
+    slow.latency, fast.error_rate, fast.in_flight = 0.01, 1.0, 4
+    assert all(pool.choose(pool.nodes) is slow for _ in range(20))
+
+@pytest.fixture
+def nodes():
+    chain = SyntheticChain(height=10, transactions=1)
+    with StandInServer(chain) as live:
+        dead = StandInServer(chain)
+        dead.start()
+        dead.stop()
+        yield live.url, dead.url
+
+def test_dead_node_ejected_and_readmitted(nodes):
+    live, dead = nodes
+    api = MultiNodeRosettaAPI([dead, live], retry=RetryPolicy(max_attempts=1), eject_after=1, eject_for=0.3)
+    api.select_network('synthetic', 'testnet')
+    for _ in range(10):
+        assert api.network_status('synthetic', 'testnet').current_block_identifier.index == 10
+    assert api.health()[dead]['ejected']
+    assert not api.health()[live]['ejected']
+    time.sleep(0.3)
+    assert api.nodes.candidates() == api.nodes.nodes
+    assert all(node.in_flight == 0 for node in api.nodes.nodes)
+
+def test_dead_node_ejected_async(nodes):
+    live, dead = nodes
+
+    async def main():
+        async with AsyncMultiNodeRosettaAPI([dead, live], retry=RetryPolicy(max_attempts=1), eject_after=1, eject_for=30) as api:
+            api.select_network('synthetic', 'testnet')
+            for _ in range(10):
+                await api.network_status('synthetic', 'testnet')
+            return api.health()
+
+    health = asyncio.run(main())
+    assert health[dead]['ejected'] and not health[live]['ejected']
+    assert health[live]['in_flight'] == health[dead]['in_flight'] == 0
+
+def test_bad_requests_dont_eject(nodes):
+    live, _ = nodes
+    api = MultiNodeRosettaAPI([live], eject_after=1)
+    with pytest.raises(RosettaError):
+        api.network_status('synthetic', 'unknown')
+    assert not api.health()[live]['ejected']
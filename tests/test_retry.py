@@ -0,0 +1,123 @@
+import asyncio
+import collections
+import json
+
+import pytest
+import requests
+
+from pyrosetta import AsyncRosettaAPI, RetryPolicy, RosettaError
+from pyrosetta.construction import submit
+from pyrosetta.models import NetworkIdentifier
+from pyrosetta.network import status
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.communication import make_session
+
+NETWORK = NetworkIdentifier(blockchain='synthetic', network='testnet')
+
+class FlakyServer(StandInServer):
+    """
+    Answers the first requests to a path with the statuses, or (status, body)
+    pairs, queued for it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failures = collections.defaultdict(list)
+        self.calls = collections.Counter()
+
+    def handle(self, path, body):
+        self.calls[path] += 1
+        if self.failures[path]:
+            failure = self.failures[path].pop(0)
+            status, body = failure if isinstance(failure, tuple) else (failure, {})
+            return status, json.dumps(body).encode('utf-8')
+        return super().handle(path, body)
+
+@pytest.fixture
+def server():
+    with FlakyServer(SyntheticChain(height=10)) as server:
+        yield server
+
+def test_submit_sent_once_by_default(server):
+    server.failures['/construction/submit'] = [503]
+    with pytest.raises(requests.HTTPError):
+        submit(server.url, NETWORK, 'signed', make_session(retry=RetryPolicy(backoff=0)))
+    assert server.calls['/construction/submit'] == 1
+
+def test_submit_retried_within_its_budget(server):
+    server.failures['/construction/submit'] = [503]
+    session = make_session(retry=RetryPolicy(backoff=0, budgets={'construction/submit': 2}))
+    assert submit(server.url, NETWORK, 'signed', session).transaction_identifier.hash_
+    assert server.calls['/construction/submit'] == 2
+
+def test_reads_retried_by_default(server):
+    server.failures['/network/status'] = [503, 502]
+    assert status(server.url, NETWORK, make_session(retry=RetryPolicy(backoff=0))).current_block_identifier.index == 10
+    assert server.calls['/network/status'] == 3
+
+def test_retriable_error_retried(server):
+    server.failures['/network/status'] = [(500, {'code': 2, 'message': 'busy', 'retriable': True})]
+    status(server.url, NETWORK, make_session(retry=RetryPolicy(backoff=0)))
+    assert server.calls['/network/status'] == 2
+
+def test_error_not_marked_retriable_raised(server):
+    server.failures['/network/status'] = [(503, {'code': 3, 'message': 'unknown', 'retriable': False})]
+    with pytest.raises(RosettaError) as raised:
+        status(server.url, NETWORK, make_session(retry=RetryPolicy(backoff=0)))
+    assert raised.value.error.code == 3
+    assert server.calls['/network/status'] == 1
+
+@pytest.mark.parametrize('code', [400, 404, 500])
+def test_other_statuses_not_retried(server, code):
+    server.failures['/network/status'] = [code]
+    with pytest.raises(requests.HTTPError):
+        status(server.url, NETWORK, make_session(retry=RetryPolicy(backoff=0)))
+    assert server.calls['/network/status'] == 1
+
+def test_attempts_bounded(server):
+    server.failures['/network/status'] = [429] * 5
+    with pytest.raises(requests.HTTPError):
+        status(server.url, NETWORK, make_session(retry=RetryPolicy(max_attempts=3, backoff=0)))
+    assert server.calls['/network/status'] == 3
+
+def test_budgets_override_max_attempts(server):
+    server.failures['/network/status'] = [504] * 3
+    session = make_session(retry=RetryPolicy(max_attempts=1, backoff=0, budgets={'/network/status/': 4}))
+    status(server.url, NETWORK, session)
+    assert server.calls['/network/status'] == 4
+
+def test_retried_async(server):
+    server.failures['/network/status'] = [503, (500, {'code': 2, 'message': 'busy', 'retriable': True})]
+
+    async def main():
+        async with AsyncRosettaAPI(server.url, retry=RetryPolicy(backoff=0)) as api:
+            return await api.network_status('synthetic', 'testnet')
+
+    assert asyncio.run(main()).current_block_identifier.index == 10
+    assert server.calls['/network/status'] == 3
+
+def test_should_retry():
+    policy = RetryPolicy(max_attempts=3)
+    url = 'http://node:8080/block'
+    assert policy.should_retry(url, 1)
+    assert not policy.should_retry(url, 3)
+    assert policy.should_retry(url, 1, 503)
+    assert not policy.should_retry(url, 1, 404)
+    assert not policy.should_retry(url, 1, 503, retriable=False)
+    assert policy.should_retry(url, 1, 500, retriable=True)
+    assert not RetryPolicy(retry_connection_errors=False).should_retry(url, 1)
+    assert not policy.should_retry('http://node:8080/construction/submit', 1)
+
+def test_delay():
+    policy = RetryPolicy(backoff=1, max_backoff=5)
+    assert all(0 <= policy.delay(1) <= 1 for _ in range(100))
+    assert all(0 <= policy.delay(10) <= 5 for _ in range(100))
+    assert policy.delay(1, '2') == 2
+    assert policy.delay(1, '60') == 5
+    assert 0 <= policy.delay(1, 'Wed, 21 Oct 2015 07:28:00 GMT') <= 1
+
+def test_budgets_validated():
+    with pytest.raises(ValueError):
+        RetryPolicy(budgets={'block': 0})
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+from pyrosetta.models import NetworkIdentifier, SearchTransactionsResponse
+from pyrosetta.search import iter_transactions, planned_offsets
+from pyrosetta.testing import StandInServer, SyntheticChain
+
+NETWORK = NetworkIdentifier(blockchain='synthetic', network='testnet')
+
+class CappedServer(StandInServer):
+    """
+    Returns at most `max_limit` transactions per page, and records
+    the offsets of the pages requested.
+    """
+
+    def __init__(self, *args, max_limit=100, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_limit = max_limit
+        self.offsets = []
+
+    def handle(self, path, body):
+        if path == '/search/transactions':
+            req = json.loads(body)
+            self.offsets.append(req.get('offset'))
+            req['limit'] = min(req.get('limit') or self.max_limit, self.max_limit)
+            body = json.dumps(req).encode('utf-8')
+        return super().handle(path, body)
+
+def response(count, total_count, next_offset=None):
+    return SearchTransactionsResponse.parse_obj({
+        'transactions': [{'block_identifier': {'index': i, 'hash': str(i)}, 'transaction': {'transaction_identifier': {'hash': str(i)}, 'operations': []}}
+                         for i in range(count)],
+        'total_count': total_count,
+        'next_offset': next_offset
+    })
+
+@pytest.mark.parametrize('offset, resp, expected', [
+    (0, response(10, 45, 10), range(10, 45, 10)),
+    (20, response(10, 45, 30), range(30, 45, 10)),
+    # The total count is only an estimate, at least the next page is requested.
+    (0, response(10, 5, 10), range(10, 11, 10)),
+    (0, response(10, 45), None),
+    (0, response(0, 45, 10), None),
+    (0, response(10, 45, 12), None),
+])
+def test_planned_offsets(offset, resp, expected):
+    assert planned_offsets(offset, resp) == expected
+
+@pytest.fixture(scope='module')
+def chain():
+    return SyntheticChain(height=50, transactions=4, accounts=7)
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_every_match_read_once(chain, concurrency):
+    address = chain.address(3)
+    expected = chain.search(max_block=50, limit=10 ** 6, address=address)
+    with CappedServer(chain) as server:
+        found = list(iter_transactions(server.url, NETWORK, max_block=50, address=address, limit=10, concurrency=concurrency))
+    assert len(found) == expected['total_count'] > 10
+    assert [resp.transaction.transaction_identifier.hash_ for resp in found] == \
+           [resp['transaction']['transaction_identifier']['hash'] for resp in expected['transactions']]
+
+def test_pages_requested_ahead(chain):
+    with CappedServer(chain) as server:
+        found = list(iter_transactions(server.url, NETWORK, max_block=50, limit=50, concurrency=4))
+    assert len(found) == 51 * 4
+    assert sorted(server.offsets) == list(range(0, 51 * 4, 50))
+
+def test_pages_replanned_when_node_caps_limit(chain):
+    with CappedServer(chain, max_limit=30) as server:
+        found = list(iter_transactions(server.url, NETWORK, max_block=50, offset=5, limit=50, concurrency=4))
+    hashes = [resp.transaction.transaction_identifier.hash_ for resp in found]
+    assert len(hashes) == len(set(hashes)) == 51 * 4 - 5
+    assert sorted(server.offsets) == list(range(5, 51 * 4, 30))
@@ -0,0 +1,48 @@
+import json
+
+from pyrosetta.api import RosettaAPI
+from pyrosetta.models import BlockIdentifier, NetworkIdentifier, PartialBlockIdentifier
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.store import BlockStore
+
+NETWORK = NetworkIdentifier(blockchain='synthetic', network='testnet')
+
+def body(index, block_hash):
+    return json.dumps({'block': {'block_identifier': {'index': index, 'hash': block_hash}, 'transactions': []}}).encode('utf-8')
+
+def test_only_final_blocks_stored():
+    with BlockStore(':memory:', finality_depth=3) as store:
+        store.observe_tip(NETWORK, 10)
+        assert not store.put_block(NETWORK, BlockIdentifier(index=8, hash='b8'), body(8, 'b8'), canonical=True)
+        assert store.put_block(NETWORK, BlockIdentifier(index=7, hash='b7'), body(7, 'b7'), canonical=True)
+        assert len(store) == 1
+        assert store.get_block(NETWORK, PartialBlockIdentifier(index=7))['block']['block_identifier']['hash'] == 'b7'
+        assert store.get_block(NETWORK, PartialBlockIdentifier(hash='b7')) is not None
+        assert store.get_block(NETWORK, PartialBlockIdentifier(index=6, hash='b7')) is None
+        assert store.get_block(NETWORK, PartialBlockIdentifier(index=8)) is None
+
+def test_orphans_only_found_by_hash():
+    with BlockStore(':memory:', finality_depth=3, compress=False) as store:
+        store.observe_tip(NETWORK, 10)
+        store.put_block(NETWORK, BlockIdentifier(index=5, hash='orphan'), body(5, 'orphan'))
+        assert store.get_block(NETWORK, PartialBlockIdentifier(index=5)) is None
+        assert store.get_block(NETWORK, PartialBlockIdentifier(hash='orphan')) is not None
+        store.put_block(NETWORK, BlockIdentifier(index=5, hash='b5'), body(5, 'b5'), canonical=True)
+        store.put_block(NETWORK, BlockIdentifier(index=5, hash='orphan'), body(5, 'orphan'))
+        assert store.get_block(NETWORK, PartialBlockIdentifier(index=5))['block']['block_identifier']['hash'] == 'b5'
+
+def test_blocks_read_back_from_disk(tmp_path):
+    path = str(tmp_path / 'blocks.db')
+    with StandInServer(SyntheticChain(height=30)) as server:
+        with BlockStore(path, finality_depth=5) as store:
+            api = RosettaAPI(server.url, block_store=store)
+            api.select_network('synthetic', 'testnet')
+            blocks = [api.block_on_current_network(index).block for index in range(0, 30)]
+            assert len(store) == 26
+        requests = server.requests
+        with BlockStore(path, finality_depth=5) as store:
+            api = RosettaAPI(server.url, block_store=store)
+            api.select_network('synthetic', 'testnet')
+            assert [api.block_on_current_network(index).block for index in range(0, 26)] == blocks[:26]
+            assert api.block_on_current_network(block_hash=blocks[3].block_identifier.hash_).block == blocks[3]
+        assert server.requests == requests
@@ -0,0 +1,47 @@
+import json
+import random
+
+import pytest
+
+from pyrosetta.utils.streaming import JSONArrayScanner, iter_json_array
+
+def scan(chunks, path=('a',)):
+    scanner = JSONArrayScanner(path)
+    items = []
+    for chunk in chunks:
+        items.extend(scanner.feed(chunk))
+    items.extend(scanner.close())
+    return items
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'{"a":[1, 0.', b'62, 3]}'], [1, 0.62, 3]),
+    ([b'{"a":[2e', b'3]}'], [2e3]),
+    ([b'{"a":[12', b'34, -', b'5]}'], [1234, -5]),
+    ([b'{"a":[tr', b'ue, nu', b'll, "x', b'y"]}'], [True, None, 'xy']),
+    ([b'{"a":[1 ', b' , 2]}'], [1, 2]),
+])
+def test_scalars_split_across_chunks(chunks, expected):
+    assert scan(chunks) == expected
+
+def test_scalars_held_back_until_delimited():
+    scanner = JSONArrayScanner(('a',))
+    assert scanner.feed(b'{"a":[1, 0.') == [1]
+    assert scanner.feed(b'62') == []
+    assert scanner.feed(b', 3]}') == [0.62, 3]
+    assert scanner.done
+
+def test_random_chunk_splits():
+    rng = random.Random(0)
+    for _ in range(500):
+        items = [rng.choice([rng.randint(-10 ** 6, 10 ** 6), rng.uniform(-1e3, 1e3), rng.random() * 10 ** rng.randint(-30, 30),
+                             True, False, None, 'text', {'b': [1, 2.5]}, [3, 'x']])
+                 for _ in range(rng.randint(0, 20))]
+        doc = json.dumps({'z': [0.5], 'a': items, 'y': 1}, separators=(rng.choice([',', ', ']), ':')).encode('utf-8')
+        cuts = sorted(rng.sample(range(1, len(doc)), min(len(doc) - 1, rng.randint(1, 12))))
+        chunks = [doc[i:j] for i, j in zip([0] + cuts, cuts + [len(doc)])]
+        assert scan(chunks) == items
+        assert list(iter_json_array(chunks, ('a',))) == items
+
+def test_truncated_document():
+    with pytest.raises(ValueError):
+        scan([b'{"a":[1, 2'])
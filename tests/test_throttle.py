@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyrosetta.api import RosettaAPI
+from pyrosetta.async_api import AsyncRosettaAPI
+from pyrosetta.exceptions import DeadlineExceeded
+from pyrosetta.testing import StandInServer, SyntheticChain
+from pyrosetta.utils.deadline import deadline
+from pyrosetta.utils.throttle import AdaptiveConcurrency, Throttle, TokenBucket
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInServer(SyntheticChain(height=10)) as server:
+        yield server
+
+def test_rate_limit_wait_bounded_by_deadline(server):
+    api = RosettaAPI(server.url, throttle=Throttle(rate=1, burst=1))
+    start = time.monotonic()
+    with deadline(0.5):
+        api.network_status("synthetic", "testnet")
+        with pytest.raises(DeadlineExceeded):
+            api.network_status("synthetic", "testnet")
+    assert time.monotonic() - start < 0.5
+
+def test_rate_limit_wait_bounded_by_deadline_async(server):
+    async def main():
+        async with AsyncRosettaAPI(server.url, throttle=Throttle(rate=1, burst=1)) as api:
+            start = time.monotonic()
+            with deadline(0.3):
+                await api.network_status("synthetic", "testnet")
+                with pytest.raises(DeadlineExceeded):
+                    await api.network_status("synthetic", "testnet")
+            return time.monotonic() - start
+
+    assert asyncio.run(main()) < 0.3
+
+def test_token_not_taken_past_timeout():
+    bucket = TokenBucket(rate=1, burst=1)
+    assert bucket.reserve() == 0
+    assert bucket.reserve(timeout=0.5) is None
+    assert 0.9 < bucket.reserve() <= 1
+
+def test_slot_wait_bounded_by_deadline():
+    throttle = Throttle(concurrency=AdaptiveConcurrency(initial=1, max_limit=1))
+    token = throttle.acquire()
+    start = time.monotonic()
+    with deadline(0.2):
+        with pytest.raises(DeadlineExceeded):
+            throttle.acquire()
+    assert time.monotonic() - start < 0.5
+    throttle.cancel(token)
+    assert throttle.concurrency.in_flight == 0
+    throttle.cancel(throttle.acquire())
+
+def test_slot_wait_bounded_by_deadline_async():
+    async def main():
+        throttle = Throttle(concurrency=AdaptiveConcurrency(initial=1, max_limit=1))
+        token = await throttle.acquire_async()
+        with deadline(0.2):
+            with pytest.raises(DeadlineExceeded):
+                await throttle.acquire_async()
+        throttle.cancel(token)
+        assert throttle.concurrency.in_flight == 0
+        throttle.cancel(await throttle.acquire_async())
+
+    asyncio.run(main())
+
+def test_slot_handed_over_to_waiter():
+    concurrency = AdaptiveConcurrency(initial=1, max_limit=1)
+    token = concurrency.acquire()
+    acquired = []
+    waiter = threading.Thread(target=lambda: acquired.append(concurrency.acquire(timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    concurrency.release(token)
+    waiter.join()
+    assert acquired[0] is not None
+    assert concurrency.in_flight == 1
+
+def test_bucket_allows_bursts_then_paces():
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    waits = [bucket.reserve() for _ in range(3)]
+    assert waits == sorted(waits)
+    assert waits[0] == pytest.approx(0.1, abs=0.01)
+    assert waits[2] == pytest.approx(0.3, abs=0.01)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_rate_limited_requests(server):
+    api = RosettaAPI(server.url, throttle=Throttle(rate=20, burst=1))
+    start = time.monotonic()
+    for _ in range(5):
+        api.network_status("synthetic", "testnet")
+    assert time.monotonic() - start >= 0.19
+
+def test_limit_grows_while_used():
+    concurrency = AdaptiveConcurrency(initial=2, max_limit=4)
+    for _ in range(50):
+        tokens = [concurrency.acquire(), concurrency.acquire()]
+        for token in tokens:
+            concurrency.release(token, latency=0.01)
+    assert concurrency.limit == 4
+    assert concurrency.in_flight == 0
+
+def test_limit_not_grown_when_unused():
+    concurrency = AdaptiveConcurrency(initial=8)
+    for _ in range(100):
+        concurrency.release(concurrency.acquire(), latency=0.01)
+    assert concurrency.limit == 8
+
+def test_limit_halved_once_per_window():
+    concurrency = AdaptiveConcurrency(initial=16, min_limit=2)
+    tokens = [concurrency.acquire() for _ in range(8)]
+    for token in tokens:
+        concurrency.release(token, dropped=True)
+    assert concurrency.limit == 8
+    for _ in range(5):
+        concurrency.release(concurrency.acquire(), dropped=True)
+    assert concurrency.limit == 2
+
+def test_limit_lowered_when_latency_rises():
+    concurrency = AdaptiveConcurrency(initial=10, latency_backoff=0.5, tolerance=2.0)
+    for _ in range(10):
+        concurrency.release(concurrency.acquire(), latency=0.01)
+    assert concurrency.limit == 10
+    for _ in range(10):
+        concurrency.release(concurrency.acquire(), latency=0.2)
+    assert concurrency.limit < 10
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=0)
+    with pytest.raises(ValueError):
+        AdaptiveConcurrency(initial=8, max_limit=4)
+
+@pytest.mark.parametrize('status_code, retriable, limit', [
+    (None, None, 4),
+    (503, None, 4),
+    (429, None, 4),
+    (500, True, 4),
+    (500, False, 8),
+    (404, None, 8),
+])
+def test_release_drops(status_code, retriable, limit):
+    throttle = Throttle(concurrency=AdaptiveConcurrency(initial=8))
+    throttle.release(throttle.acquire(), status_code, retriable)
+    assert throttle.concurrency.limit == limit
+    assert throttle.concurrency.in_flight == 0